@@ -1,9 +1,37 @@
-from neuroseek import Vector, Index
+import argparse
+from neuroseek import Index
+from neuroseek.hnsw_index import HNSWIndex
+from neuroseek.persistence import load_index
+from neuroseek.hnsw_persistence import load_hnsw_index
+from neuroseek.server import make_server
 
 
-def main():
-    print("Hello, World!")
-    test_vec = Vector(5)
+def load(path, kind):
+    if kind == 'hnsw':
+        return load_hnsw_index(path, HNSWIndex)
+    return load_index(Index(), path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve a saved NeuroSeek index over a local socket.")
+    parser.add_argument('index', help="path to an index saved with save_index or save_hnsw_index")
+    parser.add_argument('--kind', choices=('flat', 'hnsw'), default='flat', help="type of the saved index")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=7878)
+    parser.add_argument('--unix', metavar='PATH', help="listen on a Unix socket instead of TCP")
+    parser.add_argument('--workers', type=int, default=None, help="requests executed concurrently across all connections (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    index = load(args.index, args.kind)
+    address = args.unix if args.unix else (args.host, args.port)
+    server = make_server(index, address, num_workers=args.workers)
+    print(f"Serving {len(index)} vectors from {args.index} on {address}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
 
 
 if __name__ == "__main__":
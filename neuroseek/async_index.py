@@ -0,0 +1,81 @@
+import asyncio
+from functools import partial
+
+
+class AsyncIndex:
+    # Wraps an Index or HNSWIndex for use from asyncio. Searches run on an
+    # executor; queries with the same parameters that arrive while a batch is
+    # running (or within `window` seconds) are coalesced into one
+    # search_batch call, so an idle index adds no latency and a busy one
+    # answers in batches of up to max_batch.
+    def __init__(self, index, window=0.0, max_batch=64, executor=None):
+        if window < 0:
+            raise ValueError(f"window must be >= 0, got {window}")
+        if not isinstance(max_batch, int):
+            raise TypeError(f"max_batch must be an int, not {type(max_batch).__name__}")
+        if max_batch < 1:
+            raise ValueError(f"max_batch must be >= 1, got {max_batch}")
+
+        self.index = index
+        self.window = window
+        self.max_batch = max_batch
+        self.executor = executor  # None uses the event loop's default executor
+        self._pending = {}  # search params -> [(query, future)]
+        self._draining = set()
+
+    def __len__(self):
+        return len(self.index)
+
+    def _search_batch(self, queries, top_k, kwargs):
+        try:
+            return self.index.search_batch(queries, top_k, **kwargs)
+        except Exception:
+            # Isolate the failing query instead of failing the whole batch.
+            results = []
+            for query in queries:
+                try:
+                    results.append(self.index.search(query, top_k, **kwargs))
+                except Exception as e:
+                    results.append(e)
+            return results
+
+    async def asearch(self, query, top_k=5, **kwargs):
+        loop = asyncio.get_running_loop()
+        key = (top_k, tuple(sorted(kwargs.items())))
+        try:
+            hash(key)
+        except TypeError:
+            # Unhashable parameters (e.g. a dict filter) cannot be grouped.
+            return await loop.run_in_executor(self.executor, partial(self.index.search, query, top_k, **kwargs))
+
+        future = loop.create_future()
+        self._pending.setdefault(key, []).append((query, future))
+        if key not in self._draining:
+            self._draining.add(key)
+            loop.create_task(self._drain(key, top_k, kwargs))
+        return await future
+
+    async def _drain(self, key, top_k, kwargs):
+        loop = asyncio.get_running_loop()
+        try:
+            if self.window:
+                await asyncio.sleep(self.window)
+            while self._pending.get(key):
+                batch = self._pending[key][:self.max_batch]
+                del self._pending[key][:self.max_batch]
+                queries = [query for query, _ in batch]
+                try:
+                    results = await loop.run_in_executor(self.executor, self._search_batch, queries, top_k, kwargs)
+                except Exception as e:
+                    results = [e] * len(batch)
+                for (_, future), result in zip(batch, results):
+                    if future.done():
+                        continue
+                    if isinstance(result, Exception):
+                        future.set_exception(result)
+                    else:
+                        future.set_result(result)
+        finally:
+            self._draining.discard(key)
+            if not self._pending.get(key):
+                self._pending.pop(key, None)
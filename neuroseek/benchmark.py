@@ -0,0 +1,200 @@
+import argparse
+import json
+import math
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from neuroseek.vector import Vector
+from neuroseek.index import Index
+from neuroseek.hnsw_index import HNSWIndex
+
+
+def synthetic_dataset(n, dim, seed=0, clusters=0):
+    # Gaussian vectors, optionally drawn around `clusters` random centres so
+    # that neighbourhoods look more like real embeddings.
+    rng = random.Random(seed)
+    centres = [[rng.gauss(0, 1) for _ in range(dim)] for _ in range(clusters)]
+    vectors = []
+    for _ in range(n):
+        vector = Vector(dim)
+        if centres:
+            centre = rng.choice(centres)
+            vector.data = [c + rng.gauss(0, 0.3) for c in centre]
+        else:
+            vector.data = [rng.gauss(0, 1) for _ in range(dim)]
+        vectors.append(vector)
+    return vectors
+
+
+def ground_truth(data, queries, k, metric='cosine'):
+    exact = Index(metric=metric)
+    for id, vector in enumerate(data):
+        exact.add_vector(vector, id)
+    return [[id for id, _ in results] for results in exact.search_batch(queries, k)]
+
+
+def recall_at_k(results, truth, k):
+    if not truth:
+        return 0.0
+    hits = 0
+    for found, expected in zip(results, truth):
+        hits += len(set(found[:k]) & set(expected[:k]))
+    return hits / (len(truth) * k)
+
+
+def percentile(values, fraction):
+    # Nearest-rank percentile.
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = max(0, min(len(ordered) - 1, math.ceil(fraction * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def _build(factory, data):
+    index = factory()
+    for id, vector in enumerate(data):
+        index.add_vector(vector, id)
+    return index
+
+
+def benchmark_index(name, factory, data, queries, k, truth, search_kwargs=None, measure_memory=True):
+    search_kwargs = search_kwargs or {}
+
+    start = time.perf_counter()
+    index = _build(factory, data)
+    build_seconds = time.perf_counter() - start
+
+    memory_bytes = None
+    if measure_memory:
+        # Rebuilt under tracemalloc so tracing overhead does not skew build time.
+        # The input vectors already exist, so this is the index's own overhead.
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        traced = _build(factory, data)
+        memory_bytes = tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+        del traced
+
+    latencies = []
+    results = []
+    for query in queries:
+        start = time.perf_counter()
+        found = index.search(query, k, **search_kwargs)
+        latencies.append(time.perf_counter() - start)
+        results.append([id for id, _ in found])
+
+    total = sum(latencies)
+    return {
+        'index': name,
+        'size': len(data),
+        'dim': len(data[0]) if data else 0,
+        'k': k,
+        'search_params': search_kwargs,
+        'build_seconds': build_seconds,
+        'memory_bytes': memory_bytes,
+        'qps': len(queries) / total if total else 0.0,
+        'latency_p50_ms': percentile(latencies, 0.50) * 1000,
+        'latency_p99_ms': percentile(latencies, 0.99) * 1000,
+        'recall_at_k': recall_at_k(results, truth, k),
+    }
+
+
+def run_suite(sizes=(1000, 5000), dim=32, num_queries=100, k=10, metric='cosine', ef=(10, 50),
+              M=16, efConstruction=100, seed=0, clusters=0, measure_memory=True):
+    runs = []
+    queries = synthetic_dataset(num_queries, dim, seed=seed + 1, clusters=clusters)
+    for size in sizes:
+        data = synthetic_dataset(size, dim, seed=seed, clusters=clusters)
+        truth = ground_truth(data, queries, k, metric)
+        runs.append(benchmark_index('flat', lambda: Index(metric=metric), data, queries, k, truth,
+                                    measure_memory=measure_memory))
+        for search_ef in ef:
+            runs.append(benchmark_index('hnsw', lambda: HNSWIndex(M=M, efConstruction=efConstruction, metric=metric),
+                                        data, queries, k, truth, {'ef': search_ef}, measure_memory=measure_memory))
+    return {
+        'environment': {
+            'python': sys.version.split()[0],
+            'implementation': platform.python_implementation(),
+            'machine': platform.machine(),
+        },
+        'config': {
+            'sizes': list(sizes), 'dim': dim, 'num_queries': num_queries, 'k': k, 'metric': metric,
+            'ef': list(ef), 'M': M, 'efConstruction': efConstruction, 'seed': seed, 'clusters': clusters,
+        },
+        'runs': runs,
+    }
+
+
+def _run_key(run):
+    return (run['index'], run['size'], run['dim'], run['k'], json.dumps(run['search_params'], sort_keys=True))
+
+
+def compare(baseline, current):
+    # Pairs up runs with the same index, size and parameters and reports the
+    # relative change (current / baseline) of every numeric metric.
+    baseline_runs = {_run_key(run): run for run in baseline['runs']}
+    rows = []
+    for run in current['runs']:
+        old = baseline_runs.get(_run_key(run))
+        if old is None:
+            continue
+        row = {'index': run['index'], 'size': run['size'], 'search_params': run['search_params']}
+        for metric in ('build_seconds', 'memory_bytes', 'qps', 'latency_p50_ms', 'latency_p99_ms', 'recall_at_k'):
+            if old.get(metric) and run.get(metric) is not None:
+                row[metric] = run[metric] / old[metric]
+        rows.append(row)
+    return rows
+
+
+def format_runs(runs):
+    lines = [f"{'index':<6} {'size':>8} {'params':<12} {'build s':>9} {'mem MB':>8} {'qps':>9} {'p50 ms':>8} {'p99 ms':>8} {'recall':>7}"]
+    for run in runs:
+        params = ','.join(f"{key}={value}" for key, value in sorted(run['search_params'].items()))
+        memory = f"{run['memory_bytes'] / 2 ** 20:8.2f}" if run['memory_bytes'] is not None else f"{'-':>8}"
+        lines.append(
+            f"{run['index']:<6} {run['size']:>8} {params:<12} {run['build_seconds']:>9.3f} {memory} "
+            f"{run['qps']:>9.1f} {run['latency_p50_ms']:>8.3f} {run['latency_p99_ms']:>8.3f} {run['recall_at_k']:>7.3f}"
+        )
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark Index and HNSWIndex build time, memory, QPS, latency and recall.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 5000])
+    parser.add_argument('--dim', type=int, default=32)
+    parser.add_argument('--queries', type=int, default=100)
+    parser.add_argument('-k', type=int, default=10)
+    parser.add_argument('--metric', choices=('cosine', 'ip', 'l2'), default='cosine')
+    parser.add_argument('--ef', type=int, nargs='+', default=[10, 50])
+    parser.add_argument('-M', type=int, default=16)
+    parser.add_argument('--ef-construction', type=int, default=100)
+    parser.add_argument('--clusters', type=int, default=0)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-memory', action='store_true', help="skip the tracemalloc rebuild")
+    parser.add_argument('--output', help="write results as JSON to this file")
+    parser.add_argument('--compare', metavar='BASELINE', help="compare against a previous JSON result file")
+    args = parser.parse_args(argv)
+
+    results = run_suite(sizes=args.sizes, dim=args.dim, num_queries=args.queries, k=args.k, metric=args.metric,
+                        ef=args.ef, M=args.M, efConstruction=args.ef_construction, seed=args.seed,
+                        clusters=args.clusters, measure_memory=not args.no_memory)
+    print(format_runs(results['runs']))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print()
+        print("ratio vs baseline (current / baseline):")
+        for row in compare(baseline, results):
+            print(json.dumps(row, sort_keys=True))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+from neuroseek.vector import Vector
+
+
+def _freeze(value):
+    # Hashable, order-independent form of search parameters. Callables are
+    # opaque (they may close over changing state), so they are not cached.
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(item) for item in value)
+    if callable(value):
+        raise TypeError("callable search parameters are not cacheable")
+    hash(value)
+    return value
+
+
+def _entry_size(key, results):
+    query = key[0]
+    return (sys.getsizeof(key) + sys.getsizeof(query) + sum(map(sys.getsizeof, query))
+            + sys.getsizeof(results) + sum(map(sys.getsizeof, results)))
+
+
+class QueryCache:
+    # Search results keyed on the query's components and the search
+    # parameters. Every entry carries the index version it was computed
+    # against; indexes bump their version on each mutation, so stale entries
+    # are dropped on lookup without tracking which results a change touches.
+    # One cache may be shared between threads but belongs to a single index.
+    def __init__(self, max_entries=1024, ttl=None, max_bytes=None):
+        if not isinstance(max_entries, int):
+            raise TypeError(f"max_entries must be an integer, not {type(max_entries).__name__}")
+        if max_entries < 1:
+            raise ValueError(f"max_entries must be >= 1, got {max_entries}")
+        if ttl is not None and ttl <= 0:
+            raise ValueError(f"ttl must be > 0, got {ttl}")
+        if max_bytes is not None and max_bytes < 1:
+            raise ValueError(f"max_bytes must be >= 1, got {max_bytes}")
+
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (version, expires, results, size)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.memory_bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def make_key(self, query, params):
+        # None means the request cannot be cached.
+        if not isinstance(query, Vector):
+            return None
+        try:
+            return (tuple(query.data), _freeze(params))
+        except TypeError:
+            return None
+
+    def get(self, key, version):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            entry_version, expires, results, size = entry
+            if entry_version != version or (expires is not None and time.monotonic() > expires):
+                self._discard(key, size)
+                self.invalidations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return list(results)
+
+    def put(self, key, version, results):
+        results = tuple(results)
+        size = _entry_size(key, results)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+
+        expires = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.memory_bytes -= old[3]
+            self._entries[key] = (version, expires, results, size)
+            self.memory_bytes += size
+
+            while len(self._entries) > self.max_entries or (
+                    self.max_bytes is not None and self.memory_bytes > self.max_bytes):
+                _, (_, _, _, evicted_size) = self._entries.popitem(last=False)
+                self.memory_bytes -= evicted_size
+                self.evictions += 1
+
+    def fetch(self, version, compute, query, *params):
+        key = self.make_key(query, params)
+        if key is None:
+            return compute()
+
+        results = self.get(key, version)
+        if results is None:
+            results = compute()
+            self.put(key, version, results)
+        return results
+
+    def _discard(self, key, size):
+        del self._entries[key]
+        self.memory_bytes -= size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.memory_bytes = 0
+
+    def to_prometheus(self, prefix='neuroseek_cache', labels=None):
+        label_text = ','.join(f'{key}="{value}"' for key, value in sorted((labels or {}).items()))
+        suffix = f"{{{label_text}}}" if label_text else ''
+        lines = []
+        with self._lock:
+            for name, kind, help_text, value in (
+                ('hits_total', 'counter', 'Searches answered from the cache.', self.hits),
+                ('misses_total', 'counter', 'Searches that had to be computed.', self.misses),
+                ('evictions_total', 'counter', 'Entries evicted by size limits.', self.evictions),
+                ('invalidations_total', 'counter', 'Entries dropped as stale or expired.', self.invalidations),
+                ('entries', 'gauge', 'Entries currently cached.', len(self._entries)),
+                ('memory_bytes', 'gauge', 'Approximate memory held by cached entries.', self.memory_bytes),
+                ('hit_rate', 'gauge', 'Fraction of lookups answered from the cache.', self.hit_rate),
+            ):
+                lines.append(f"# HELP {prefix}_{name} {help_text}")
+                lines.append(f"# TYPE {prefix}_{name} {kind}")
+                lines.append(f"{prefix}_{name}{suffix} {value}")
+        return '\n'.join(lines) + '\n'
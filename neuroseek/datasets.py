@@ -0,0 +1,215 @@
+import ast
+import mmap
+import os
+import struct
+import zipfile
+from neuroseek.vector import Vector
+
+
+# Readers yield chunks of at most chunk_size rows so that files larger than
+# memory can be streamed into an index.
+
+_NPY_TYPES = {
+    'f2': 'e', 'f4': 'f', 'f8': 'd',
+    'i1': 'b', 'i2': 'h', 'i4': 'i', 'i8': 'q',
+    'u1': 'B', 'u2': 'H', 'u4': 'I', 'u8': 'Q',
+}
+
+
+def _to_vector(row):
+    vector = Vector(len(row))
+    vector.data = row
+    return vector
+
+
+def _read_exact(f, size):
+    data = f.read(size)
+    if len(data) != size:
+        raise ValueError(f"Truncated file: expected {size} bytes, got {len(data)}")
+    return data
+
+
+def _read_xvecs(path, code, itemsize, chunk_size, limit):
+    # Each record is a little-endian int32 dimension followed by the components.
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be >= 1, got {chunk_size}")
+
+    with open(path, 'rb') as f:
+        header = f.read(4)
+        if not header:
+            return
+        dim, = struct.unpack('<i', header)
+        if dim <= 0:
+            raise ValueError(f"Invalid vector dimension {dim} in {path}")
+        f.seek(0)
+
+        record_size = 4 + dim * itemsize
+        row_format = struct.Struct(f'<i{dim}{code}')
+        remaining = limit
+        while remaining is None or remaining > 0:
+            rows_wanted = chunk_size if remaining is None else min(chunk_size, remaining)
+            data = f.read(rows_wanted * record_size)
+            if not data:
+                return
+            if len(data) % record_size:
+                raise ValueError(f"Truncated record in {path}")
+
+            rows = []
+            for values in row_format.iter_unpack(data):
+                if values[0] != dim:
+                    raise ValueError(f"Inconsistent dimension {values[0]} in {path}, expected {dim}")
+                rows.append(list(values[1:]))
+            if remaining is not None:
+                remaining -= len(rows)
+            yield rows
+
+
+def read_fvecs(path, chunk_size=1024, limit=None):
+    for rows in _read_xvecs(path, 'f', 4, chunk_size, limit):
+        yield [_to_vector(row) for row in rows]
+
+
+def read_bvecs(path, chunk_size=1024, limit=None):
+    for rows in _read_xvecs(path, 'B', 1, chunk_size, limit):
+        yield [_to_vector(row) for row in rows]
+
+
+def read_ivecs(path, chunk_size=1024, limit=None):
+    # Ground-truth files: each row is a list of neighbour ids.
+    yield from _read_xvecs(path, 'i', 4, chunk_size, limit)
+
+
+def _read_npy_header(f):
+    if f.read(6) != b'\x93NUMPY':
+        raise ValueError("Not a .npy file")
+    major, _ = struct.unpack('<BB', _read_exact(f, 2))
+    if major == 1:
+        header_length, = struct.unpack('<H', _read_exact(f, 2))
+    elif major in (2, 3):
+        header_length, = struct.unpack('<I', _read_exact(f, 4))
+    else:
+        raise ValueError(f"Unsupported .npy format version {major}")
+
+    header = ast.literal_eval(_read_exact(f, header_length).decode('latin1'))
+    descr = header['descr']
+    if not isinstance(descr, str) or descr[1:] not in _NPY_TYPES:
+        raise ValueError(f"Unsupported .npy dtype {descr!r}")
+    if header['fortran_order']:
+        raise ValueError("Fortran-ordered .npy arrays are not supported")
+    shape = header['shape']
+    if len(shape) != 2:
+        raise ValueError(f"Expected a 2-D array, got shape {shape}")
+
+    byte_order = '>' if descr[0] == '>' else '<' if descr[0] in '<|' else '='
+    return shape, byte_order + '{}' + _NPY_TYPES[descr[1:]], int(descr[2:])
+
+
+def _read_npy_stream(f, chunk_size, limit):
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be >= 1, got {chunk_size}")
+
+    (num_rows, dim), row_format, itemsize = _read_npy_header(f)
+    if limit is not None:
+        num_rows = min(num_rows, limit)
+
+    if dim == 0:
+        raise ValueError("Cannot read zero-dimensional vectors")
+
+    row_size = dim * itemsize
+    row_struct = struct.Struct(row_format.format(dim))
+    for start in range(0, num_rows, chunk_size):
+        count = min(chunk_size, num_rows - start)
+        data = _read_exact(f, count * row_size)
+        yield [_to_vector(list(values)) for values in row_struct.iter_unpack(data)]
+
+
+def read_npy(path, chunk_size=1024, limit=None):
+    with open(path, 'rb') as f:
+        yield from _read_npy_stream(f, chunk_size, limit)
+
+
+def read_npz(path, key=None, chunk_size=1024, limit=None):
+    # Streams one array out of an .npz archive; key defaults to the only
+    # (or first) array in it.
+    with zipfile.ZipFile(path) as archive:
+        names = [name for name in archive.namelist() if name.endswith('.npy')]
+        if key is None:
+            if not names:
+                raise ValueError(f"No arrays in {path}")
+            name = names[0]
+        else:
+            name = key if key.endswith('.npy') else key + '.npy'
+            if name not in names:
+                raise ValueError(f"Array {key!r} not found in {path}")
+        with archive.open(name) as f:
+            yield from _read_npy_stream(f, chunk_size, limit)
+
+
+def map_npy(path):
+    # Vectors that view rows of a memory-mapped .npy file instead of
+    # holding copies; pages are read in as rows are touched. The vectors
+    # are read-only and keep the mapping alive. Needs a float32 or float64
+    # array in native byte order.
+    with open(path, 'rb') as f:
+        (num_rows, dim), row_format, itemsize = _read_npy_header(f)
+        offset = f.tell()
+        if num_rows == 0:
+            return []
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    row_size = dim * itemsize
+    if len(mapped) < offset + num_rows * row_size:
+        raise ValueError(f"Truncated file: {path}")
+    view = memoryview(mapped)
+    format = row_format.replace('{}', '')
+    return [Vector.from_buffer(view[start:start + row_size], format)
+            for start in range(offset, offset + num_rows * row_size, row_size)]
+
+
+def read_vectors(path, chunk_size=1024, limit=None, **kwargs):
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.fvecs':
+        return read_fvecs(path, chunk_size, limit)
+    if extension == '.bvecs':
+        return read_bvecs(path, chunk_size, limit)
+    if extension == '.npy':
+        return read_npy(path, chunk_size, limit)
+    if extension == '.npz':
+        return read_npz(path, kwargs.get('key'), chunk_size, limit)
+    raise ValueError(f"Unsupported vector file extension {extension!r}")
+
+
+def load_groundtruth(path, limit=None):
+    rows = []
+    for chunk in read_ivecs(path, limit=limit):
+        rows.extend(chunk)
+    return rows
+
+
+def bulk_load(index, path, chunk_size=1024, limit=None, start_id=0, **kwargs):
+    # Rows are given ids start_id, start_id + 1, ... in file order, which is
+    # what the ground-truth files of the standard benchmarks refer to.
+    next_id = start_id
+    for chunk in read_vectors(path, chunk_size, limit, **kwargs):
+        index.add_vectors(chunk, ids=range(next_id, next_id + len(chunk)))
+        next_id += len(chunk)
+    return next_id - start_id
+
+
+def evaluate_recall(index, queries, groundtruth, k=10, **search_kwargs):
+    # Recall@k of index.search against published ground truth, where
+    # queries is a path or a list of Vectors and groundtruth a path or a
+    # list of id lists.
+    if isinstance(queries, str):
+        queries = [vector for chunk in read_vectors(queries) for vector in chunk]
+    if isinstance(groundtruth, str):
+        groundtruth = load_groundtruth(groundtruth, limit=len(queries))
+
+    if len(groundtruth) < len(queries):
+        raise ValueError(f"Ground truth has {len(groundtruth)} rows for {len(queries)} queries")
+
+    hits = 0
+    for query, expected in zip(queries, groundtruth):
+        found = {id for id, _ in index.search(query, k, **search_kwargs)}
+        hits += len(found & set(expected[:k]))
+    return hits / (len(queries) * k) if queries else 0.0
@@ -0,0 +1,213 @@
+import heapq
+import os
+import struct
+import threading
+from neuroseek.vector import Vector
+from neuroseek.distance import get_metric
+from neuroseek.precision import HALF_DTYPES, decode, encode
+
+
+# File layout, all little-endian:
+#   page 0             header (_HEADER), zero padded to page_size
+#   records            one per node: dim float32 components, uint32
+#                      degree, max_degree uint32 neighbour ordinals. Small
+#                      records are packed whole into pages (the page tail is
+#                      padding), large ones are padded to whole pages, so no
+#                      record straddles a page boundary; see _record_offset
+#   ids                num_nodes int64 external ids
+#   compressed         num_nodes * dim half-precision components, the copy
+#                      kept in memory to steer the search
+_MAGIC = b'NSDISK01'
+_HEADER = struct.Struct('<8sIIIIQQQQ16s16s')
+
+
+def _record_size(dim, max_degree, page_size):
+    raw = 4 * dim + 4 + 4 * max_degree
+    if raw <= page_size:
+        return raw
+    return -(-raw // page_size) * page_size
+
+
+def _record_offset(ordinal, record_size, page_size):
+    # Records start on page 1; small records fill pages without splitting.
+    if record_size > page_size:
+        return page_size + ordinal * record_size
+    per_page = page_size // record_size
+    return page_size * (1 + ordinal // per_page) + (ordinal % per_page) * record_size
+
+
+def write_disk_index(index, path, page_size=4096, compressed_dtype='float16'):
+    # Lays out the base layer of an HNSWIndex for DiskIndex. Neighbour
+    # lists are capped at the base layer's degree limit (2 * M).
+    if compressed_dtype not in HALF_DTYPES:
+        raise ValueError(f"compressed_dtype must be one of {HALF_DTYPES}, got {compressed_dtype!r}")
+    if index.entry_point is None:
+        raise ValueError("Cannot write an empty index")
+
+    nodes = list(index.id_to_node.values())
+    ordinals = {node.id: ordinal for ordinal, node in enumerate(nodes)}
+    dim = len(nodes[0].vector)
+    max_degree = index._max_connections(0)
+    record_size = _record_size(dim, max_degree, page_size)
+    end = _record_offset(len(nodes) - 1, record_size, page_size) + record_size
+    ids_offset = -(-end // page_size) * page_size
+    compressed_offset = ids_offset + 8 * len(nodes)
+
+    record = struct.Struct(f'<{dim}fI')
+    with open(path, 'wb') as f:
+        f.write(_HEADER.pack(_MAGIC, dim, max_degree, record_size, page_size, len(nodes),
+                             ordinals[index.entry_point.id], ids_offset, compressed_offset,
+                             index.metric.name.encode(), compressed_dtype.encode()).ljust(page_size, b'\0'))
+        for ordinal, node in enumerate(nodes):
+            neighbors = [ordinals[id] for id, _ in node.get_connections(0) if id in ordinals][:max_degree]
+            data = record.pack(*node.vector.data, len(neighbors)) + struct.pack(f'<{len(neighbors)}I', *neighbors)
+            f.seek(_record_offset(ordinal, record_size, page_size))
+            f.write(data.ljust(record_size, b'\0'))
+        f.seek(ids_offset)
+        f.write(struct.pack(f'<{len(nodes)}q', *(node.id for node in nodes)))
+        for node in nodes:
+            f.write(encode(node.vector.data, compressed_dtype))
+        f.flush()
+        os.fsync(f.fileno())
+
+
+class DiskIndex:
+    # Read-only, disk-resident graph search in the style of DiskANN. Only
+    # the ids and a half-precision copy of the vectors are held in memory;
+    # full vectors and neighbour lists are read from disk as the beam
+    # search expands nodes, beam_width records per round.
+    def __init__(self, path):
+        self.path = path
+        self._fd = os.open(path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+        self._lock = threading.Lock()  # only used where os.pread is unavailable
+        self.reads = 0  # records read from disk, across all searches
+
+        header = _HEADER.unpack(self._pread(_HEADER.size, 0))
+        (magic, self.dim, self.max_degree, self.record_size, self.page_size, self.num_nodes,
+         self.entry, ids_offset, compressed_offset, metric, compressed_dtype) = header
+        if magic != _MAGIC:
+            raise ValueError(f"{path} is not a disk index")
+        self.metric = get_metric(metric.rstrip(b'\0').decode())
+        self.compressed_dtype = compressed_dtype.rstrip(b'\0').decode()
+
+        self.ids = list(struct.unpack(f'<{self.num_nodes}q', self._pread(8 * self.num_nodes, ids_offset)))
+        self.id_to_ordinal = {id: ordinal for ordinal, id in enumerate(self.ids)}
+
+        # Kept packed; rows are decoded a neighbour list at a time.
+        self.compressed = self._pread(2 * self.dim * self.num_nodes, compressed_offset)
+        self.compressed_aux = []
+        for start in range(0, self.num_nodes, 4096):
+            rows = self._decode(range(start, min(start + 4096, self.num_nodes)))
+            self.compressed_aux.extend(map(self.metric.aux, rows))
+        self._record = struct.Struct(f'<{self.dim}fI')
+
+    def _decode(self, ordinals):
+        row_size = 2 * self.dim
+        compressed = self.compressed
+        flat = decode(b''.join(compressed[o * row_size:(o + 1) * row_size] for o in ordinals), self.compressed_dtype)
+        dim = self.dim
+        return [flat[start:start + dim] for start in range(0, len(flat), dim)]
+
+    def _pread(self, size, offset):
+        if hasattr(os, 'pread'):
+            return os.pread(self._fd, size, offset)
+        with self._lock:
+            os.lseek(self._fd, offset, os.SEEK_SET)
+            return os.read(self._fd, size)
+
+    def _read_records(self, ordinals):
+        # One read per run of adjacent records, so a frontier that lands on
+        # neighbouring pages costs a single I/O.
+        ordinals = sorted(ordinals)
+        self.reads += len(ordinals)
+        record_size = self.record_size
+        page_size = self.page_size
+        records = {}
+        run_start = 0
+        for i in range(1, len(ordinals) + 1):
+            if i < len(ordinals) and ordinals[i] == ordinals[i - 1] + 1:
+                continue
+            start = _record_offset(ordinals[run_start], record_size, page_size)
+            end = _record_offset(ordinals[i - 1], record_size, page_size) + record_size
+            data = self._pread(end - start, start)
+            for ordinal in ordinals[run_start:i]:
+                records[ordinal] = self._parse(data, _record_offset(ordinal, record_size, page_size) - start)
+            run_start = i
+        return records
+
+    def _parse(self, data, offset):
+        values = self._record.unpack_from(data, offset)
+        degree = values[-1]
+        neighbors = struct.unpack_from(f'<{degree}I', data, offset + self._record.size)
+        return list(values[:-1]), neighbors
+
+    def __len__(self):
+        return self.num_nodes
+
+    def get_vector(self, id):
+        if not isinstance(id, int):
+            raise TypeError(f"id must be an int, not {type(id).__name__}")
+        if id not in self.id_to_ordinal:
+            raise ValueError(f"ID {id} does not exist")
+        data, _ = self._read_records([self.id_to_ordinal[id]])[self.id_to_ordinal[id]]
+        vector = Vector(len(data))
+        vector.data = data
+        return vector
+
+    def search(self, query, top_k=5, search_list=64, beam_width=4):
+        # search_list bounds the candidate list (DiskANN's L); results are
+        # ranked by exact distances of the expanded nodes.
+        if not isinstance(query, Vector):
+            raise TypeError(f"query must be a Vector, not {type(query).__name__}")
+        if len(query) != self.dim:
+            raise ValueError(f"Query vector dimension {len(query)} does not match index dimension {self.dim}")
+        if not isinstance(top_k, int):
+            raise TypeError(f"top_k must be an int, not {type(top_k).__name__}")
+        if top_k < 1:
+            raise ValueError(f"top_k must be >= 1, got {top_k}")
+        if beam_width < 1:
+            raise ValueError(f"beam_width must be >= 1, got {beam_width}")
+        search_list = max(search_list, top_k)
+
+        distance = self.metric.distance
+        query_data = query.data
+        query_aux = self.metric.aux(query_data)
+        compressed_aux = self.compressed_aux
+
+        entry = self.entry
+        candidates = [(distance(query_data, query_aux, self._decode([entry])[0], compressed_aux[entry]), entry)]
+        visited = {entry}
+        expanded = {}  # ordinal -> exact distance
+
+        while True:
+            frontier = [ordinal for _, ordinal in candidates if ordinal not in expanded][:beam_width]
+            if not frontier:
+                break
+
+            for ordinal, (data, neighbors) in self._read_records(frontier).items():
+                expanded[ordinal] = distance(query_data, query_aux, data, self.metric.aux(data))
+                new = [neighbor for neighbor in neighbors if neighbor not in visited]
+                visited.update(new)
+                for neighbor, row in zip(new, self._decode(new)):
+                    candidates.append((distance(query_data, query_aux, row, compressed_aux[neighbor]), neighbor))
+
+            candidates.sort()
+            del candidates[search_list:]
+
+        to_similarity = self.metric.to_similarity
+        best = heapq.nsmallest(top_k, expanded.items(), key=lambda x: x[1])
+        return [(self.ids[ordinal], to_similarity(dist)) for ordinal, dist in best]
+
+    def search_batch(self, queries, top_k=5, search_list=64, beam_width=4):
+        return [self.search(query, top_k, search_list, beam_width) for query in queries]
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
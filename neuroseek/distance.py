@@ -0,0 +1,100 @@
+import math
+from operator import mul
+
+
+METRICS = ('cosine', 'ip', 'l2')
+
+
+# math.sumprod (3.12+) is a single C-level reduction; fall back to map/sum.
+if hasattr(math, 'sumprod'):
+    _dot = math.sumprod
+else:
+    def _dot(a, b):
+        return sum(map(mul, a, b))
+
+
+class Metric:
+    # Similarity is "higher is better" for every metric; distance is
+    # offset - similarity so that graph traversal can minimise it.
+    name = None
+    offset = 0
+
+    def aux(self, data):
+        return None
+
+    def similarity(self, query, query_aux, data, data_aux):
+        raise NotImplementedError
+
+    def similarities(self, query, query_aux, rows, auxes):
+        similarity = self.similarity
+        return [similarity(query, query_aux, data, data_aux) for data, data_aux in zip(rows, auxes)]
+
+    def distance(self, query, query_aux, data, data_aux):
+        return self.offset - self.similarity(query, query_aux, data, data_aux)
+
+    def to_similarity(self, distance):
+        return self.offset - distance
+
+    def __repr__(self):
+        return f"Metric({self.name!r})"
+
+
+class CosineMetric(Metric):
+    name = 'cosine'
+    offset = 1
+
+    def aux(self, data):
+        return math.sqrt(_dot(data, data))
+
+    def similarity(self, query, query_aux, data, data_aux):
+        denominator = query_aux * data_aux
+        if denominator == 0:
+            raise ValueError("Cosine similarity is not defined for zero-length vectors.")
+        return _dot(query, data) / denominator
+
+    def similarities(self, query, query_aux, rows, auxes):
+        if query_aux == 0 or 0 in auxes:
+            raise ValueError("Cosine similarity is not defined for zero-length vectors.")
+        return [_dot(query, data) / (query_aux * data_aux) for data, data_aux in zip(rows, auxes)]
+
+
+class InnerProductMetric(Metric):
+    name = 'ip'
+
+    def similarity(self, query, query_aux, data, data_aux):
+        return _dot(query, data)
+
+    def similarities(self, query, query_aux, rows, auxes):
+        return [_dot(query, data) for data in rows]
+
+
+class L2Metric(Metric):
+    # Similarity is the negated squared Euclidean distance; the cached
+    # squared norms reduce each candidate to a single dot product.
+    name = 'l2'
+
+    def aux(self, data):
+        return _dot(data, data)
+
+    def similarity(self, query, query_aux, data, data_aux):
+        return -max(query_aux + data_aux - 2 * _dot(query, data), 0)
+
+    def similarities(self, query, query_aux, rows, auxes):
+        return [-max(query_aux + data_aux - 2 * _dot(query, data), 0) for data, data_aux in zip(rows, auxes)]
+
+
+_METRICS = {
+    'cosine': CosineMetric(),
+    'ip': InnerProductMetric(),
+    'l2': L2Metric(),
+}
+
+
+def get_metric(metric):
+    if isinstance(metric, Metric):
+        return metric
+    if not isinstance(metric, str):
+        raise TypeError(f"metric must be a str, not {type(metric).__name__}")
+    if metric not in _METRICS:
+        raise ValueError(f"Unknown metric {metric!r}, expected one of {', '.join(METRICS)}")
+    return _METRICS[metric]
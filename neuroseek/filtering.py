@@ -0,0 +1,69 @@
+class AttributeStore:
+    def __init__(self):
+        self.attributes = {}  # id -> {key: value}
+        self._postings = {}  # (key, value) -> set of ids
+
+    def __len__(self):
+        return len(self.attributes)
+
+    def __contains__(self, id):
+        return id in self.attributes
+
+    def get(self, id):
+        return self.attributes.get(id, {})
+
+    def set(self, id, attributes):
+        if not isinstance(attributes, dict):
+            raise TypeError(f"attributes must be a dict, not {type(attributes).__name__}")
+        for key, value in attributes.items():
+            try:
+                hash(value)
+            except TypeError:
+                raise TypeError(f"attribute {key!r} must be hashable, not {type(value).__name__}") from None
+
+        self.remove(id)
+        if not attributes:
+            return
+        self.attributes[id] = dict(attributes)
+        for item in attributes.items():
+            self._postings.setdefault(item, set()).add(id)
+
+    def remove(self, id):
+        old = self.attributes.pop(id, None)
+        if not old:
+            return
+        for item in old.items():
+            ids = self._postings[item]
+            ids.discard(id)
+            if not ids:
+                del self._postings[item]
+
+    def compile(self, filter, ids=None):
+        # A dict filter matches ids whose attributes equal every given value;
+        # a list, tuple or set value matches any of its members. A callable
+        # filter is called with the attribute dict of every id in ids, the
+        # index's live ids ({} for ids without attributes); without ids, only
+        # ids that have attributes are considered.
+        if callable(filter):
+            # Snapshot so a concurrent insert or set() cannot resize a dict mid-iteration.
+            if ids is None:
+                return {id for id, attributes in list(self.attributes.items()) if filter(attributes)}
+            get = self.attributes.get
+            return {id for id in list(ids) if filter(get(id, {}))}
+
+        if not isinstance(filter, dict):
+            raise TypeError(f"filter must be a dict or callable, not {type(filter).__name__}")
+
+        allowed = None
+        for key, value in filter.items():
+            if isinstance(value, (list, tuple, set, frozenset)):
+                matches = set()
+                for option in value:
+                    matches |= self._postings.get((key, option), set())
+            else:
+                matches = self._postings.get((key, value), set())
+            allowed = set(matches) if allowed is None else allowed & matches
+            if not allowed:
+                return set()
+
+        return allowed  # None for an empty filter, i.e. no restriction
@@ -1,11 +1,45 @@
+import heapq
 import random
-import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from neuroseek.vector import Vector
 from neuroseek.hnsw_node import HNSWNode
+from neuroseek.distance import get_metric
+from neuroseek.filtering import AttributeStore
+from neuroseek.stats import SearchStats, IndexMetrics
+from neuroseek.tracing import span
+from neuroseek.precision import check_dtype
+from neuroseek.index import _default_num_threads
 
 
 class HNSWIndex:
-    def __init__(self, M=16, efConstruction=200, maxLayers=16):
+    # Concurrency model: any number of search() calls may run alongside one
+    # writer (add_vector, delete_vector, set_attributes) or alongside
+    # add_vectors, without a lock around the index. Readers take no locks:
+    #   - neighbour rows are replaced copy-on-write, never mutated, so a
+    #     traversal always iterates a consistent row;
+    #   - entry_point is read once per search and swapped in one assignment;
+    #   - ids that disappear mid-traversal are skipped, so a search racing a
+    #     delete may or may not return the deleted id, but never fails.
+    # Writers serialise map/entry-point updates on _global_lock and row
+    # rewrites on the striped node locks. Deletes must not overlap add_vectors.
+
+    # Filters matching at most this fraction of the index are answered by
+    # scanning the matching ids instead of walking the graph.
+    brute_force_ratio = 0.05
+
+    # Neighbour rows are guarded by a fixed pool of striped locks rather than
+    # one lock per node, which keeps nodes picklable and memory flat.
+    num_lock_stripes = 256
+
+    def __init__(self, M=16, efConstruction=200, maxLayers=16, metric='cosine', collect_stats=False, cache=None, dtype=None,
+                 dim=None, copy_vectors=True):
+        check_dtype(dtype)
+        if dim is not None and (not isinstance(dim, int) or dim < 0):
+            raise ValueError(f"dim must be a non-negative integer, got {dim!r}")
+
         self.M = M  # Number of connections per node
         self.efConstruction = efConstruction  # Search width during construction
         self.maxLayers = maxLayers
@@ -13,6 +47,29 @@ class HNSWIndex:
         self.id_to_node = {}  # node_id -> HNSWNode
         self.entry_point = None  # Top layer node
         self.num_vectors = 0
+        self.metric = get_metric(metric)
+        self.dim = dim  # fixed by the first insert when not given
+        self.dtype = dtype  # node storage, see neuroseek.precision; None keeps vectors as given
+        self.copy_vectors = copy_vectors  # store copies of dtype=None vectors, see Index
+        self.attributes = AttributeStore()
+        self.collect_stats = collect_stats  # record every search into self.metrics
+        self.metrics = IndexMetrics()
+        self.hooks = []  # profiling hooks, see neuroseek.tracing
+        self.cache = cache  # optional neuroseek.cache.QueryCache
+        self._version = 0  # bumped on every mutation; invalidates cached results
+        self._global_lock = threading.Lock()  # guards id_to_node, layers, entry_point
+        self._node_locks = [threading.Lock() for _ in range(self.num_lock_stripes)]
+
+    def add_hook(self, hook):
+        if not callable(hook):
+            raise TypeError(f"hook must be callable, not {type(hook).__name__}")
+        self.hooks.append(hook)
+
+    def remove_hook(self, hook):
+        self.hooks.remove(hook)
+
+    def _node_lock(self, id):
+        return self._node_locks[hash(id) % self.num_lock_stripes]
 
     def _get_random_layer(self):
         level = 0
@@ -20,54 +77,148 @@ class HNSWIndex:
             level += 1
         return level
 
-    def _distance(self, v1, v2):
-        return 1 - v1.cosine_similarity(v2)  # Convert similarity to distance
-
-    def _search_layer(self, query, ef, layer):
-        if not self.layers or layer >= len(self.layers) or not self.layers[layer]:
-            return []
-
+    def _nodes(self, ids):
+        # Live nodes for ids, skipping any deleted concurrently.
+        return [node for node in map(self.id_to_node.get, ids) if node is not None]
+
+    def _search_layer(self, query, query_aux, entry_nodes, ef, layer, allowed=None, stats=None,
+                      patience=None, deadline=None):
+        # With allowed set, every node is still traversed but only allowed
+        # ids enter the result heap. patience stops the walk after that many
+        # consecutive expansions admit nothing new; deadline is a
+        # time.perf_counter() value after which the best results so far are
+        # returned.
+        distance = self.metric.distance
+        id_to_node = self.id_to_node
         visited = set()
-        candidates = []  # [(node_id, distance)]
-        results = []  # [(node_id, distance)]
-
-        if self.entry_point:
-            entry_id = self.entry_point.id
-            entry_node = self.id_to_node[entry_id]
-            dist = self._distance(query, entry_node.vector)
-            candidates.append((entry_id, dist))
-            results.append((entry_id, dist))
+        candidates = []  # min-heap of (distance, node_id, node)
+        results = []  # max-heap of (-distance, node_id), holds the ef closest
+        # Counters are kept per expansion/acceptance, not per neighbour, and
+        # the rest of the statistics are derived from heap and set sizes.
+        expansions = pushed = admitted = missing = 0
+        stalled = 0
+        early_stopped = False
+
+        for entry_node in entry_nodes:
+            entry_id = entry_node.id
+            dist = distance(query, query_aux, entry_node.vector.data, entry_node.aux)
             visited.add(entry_id)
+            heapq.heappush(candidates, (dist, entry_id, entry_node))
+            if allowed is None or entry_id in allowed:
+                heapq.heappush(results, (-dist, entry_id))
+                admitted += 1
+                if len(results) > ef:
+                    heapq.heappop(results)
 
         while candidates:
-            candidates.sort(key=lambda x: x[1])
-            current_id, current_dist = candidates.pop(0)
+            current_dist, _, current_node = heapq.heappop(candidates)
 
-            if results and current_dist > results[-1][1]:
+            if results and current_dist > -results[0][0] and (allowed is None or len(results) >= ef):
                 break
-
-            current_node = self.id_to_node[current_id]
-            for neighbor_id, neighbor_dist in current_node.get_connections(layer):
-                if neighbor_id not in visited:
-                    visited.add(neighbor_id)
-                    neighbor_node = self.id_to_node[neighbor_id]
-                    dist = self._distance(query, neighbor_node.vector)
-
-                    if len(results) < ef or dist < results[-1][1]:
-                        candidates.append((neighbor_id, dist))
-                        results.append((neighbor_id, dist))
-                        results.sort(key=lambda x: x[1])
+            if deadline is not None and results and time.perf_counter() > deadline:
+                early_stopped = True
+                break
+            expansions += 1
+            admitted_before = admitted
+
+            for neighbor_id, _ in current_node.get_connections(layer):
+                if neighbor_id in visited:
+                    continue
+                visited.add(neighbor_id)
+                neighbor_node = id_to_node.get(neighbor_id)
+                if neighbor_node is None:
+                    missing += 1
+                    continue
+                dist = distance(query, query_aux, neighbor_node.vector.data, neighbor_node.aux)
+
+                if len(results) < ef or dist < -results[0][0]:
+                    heapq.heappush(candidates, (dist, neighbor_id, neighbor_node))
+                    pushed += 1
+                    if allowed is None or neighbor_id in allowed:
+                        heapq.heappush(results, (-dist, neighbor_id))
+                        admitted += 1
                         if len(results) > ef:
-                            results.pop()
-
-        return results[:ef]
-
-    def add_vector(self, vector, id=None):
+                            heapq.heappop(results)
+
+            if patience is not None:
+                if admitted == admitted_before:
+                    stalled += 1
+                    if stalled >= patience and len(results) >= ef:
+                        early_stopped = bool(candidates)
+                        break
+                else:
+                    stalled = 0
+
+        if stats is not None:
+            stats.early_stopped = stats.early_stopped or early_stopped
+            candidate_pushes = len(entry_nodes) + pushed
+            candidate_pops = candidate_pushes - len(candidates)
+            result_pops = admitted - len(results)
+            stats.add_layer(layer, len(visited) - missing, len(visited), expansions,
+                            candidate_pushes + candidate_pops + admitted + result_pops)
+
+        return sorted(((node_id, -neg_dist) for neg_dist, node_id in results), key=lambda x: x[1])
+
+    def _descend(self, query, query_aux, entry_point, target_layer, stats=None):
+        # Greedy search (ef=1) from entry_point down to target_layer.
+        entry_nodes = [entry_point]
+        for layer in range(entry_point.layer, target_layer, -1):
+            best_id = self._search_layer(query, query_aux, entry_nodes, 1, layer, stats=stats)[0][0]
+            entry_nodes = [self.id_to_node.get(best_id, entry_nodes[0])]
+        return entry_nodes
+
+    def _max_connections(self, layer):
+        return self.M * 2 if layer == 0 else self.M
+
+    def _brute_force(self, query, query_aux, ids, top_k):
+        distance = self.metric.distance
+        scored = []
+        for node in self._nodes(ids):
+            scored.append((node.id, distance(query, query_aux, node.vector.data, node.aux)))
+        return heapq.nsmallest(top_k, scored, key=lambda x: x[1])
+
+    def _link(self, node, neighbor_id, dist, layer):
+        # Rows are replaced, never mutated, so concurrent readers iterating
+        # the previous row are unaffected.
+        max_connections = self._max_connections(layer)
+        with self._node_lock(node.id):
+            connections = node.get_connections(layer) + [(neighbor_id, dist)]
+            if len(connections) > max_connections:
+                connections.sort(key=lambda x: x[1])
+                del connections[max_connections:]
+            node.connections[layer] = connections
+
+    def _check_data(self, vector, dim=None):
+        # Dimensions are checked here and in search(), once per call; the
+        # distance kernels in the traversal loops trust them.
         if not isinstance(vector, Vector):
             raise TypeError(f"vector must be a Vector, not {type(vector).__name__}")
 
-        if id is None:
-            id = self.num_vectors
+        dim = self.dim if dim is None else dim
+        if dim is not None and len(vector) != dim:
+            raise ValueError(f"Vector dimension {len(vector)} does not match index dimension {dim}")
+
+        aux = self.metric.aux(vector.data)
+        if self.metric.name == 'cosine' and aux == 0:
+            raise ValueError("Cosine similarity is not defined for zero-length vectors.")
+
+        # Returns (row, aux) as the node will store them. Conversion happens
+        # here, so out-of-range values and rows that underflow to zero are
+        # rejected before the graph changes.
+        if self.dtype is None:
+            return (vector.copy() if self.copy_vectors else vector), aux
+        row = vector.astype(self.dtype)
+        row_aux = self.metric.aux(row.data)
+        if self.metric.name == 'cosine' and row_aux == 0:
+            raise ValueError(f"Vector underflows to zero in {self.dtype}; "
+                             "cosine similarity is not defined for zero-length vectors.")
+        return row, row_aux
+
+    def _check_vector(self, vector, id, attributes, dim=None):
+        stored = self._check_data(vector, dim)
+
+        if attributes is not None and not isinstance(attributes, dict):
+            raise TypeError(f"attributes must be a dict, not {type(attributes).__name__}")
 
         if not isinstance(id, int):
             raise TypeError(f"id must be an int, not {type(id).__name__}")
@@ -75,32 +226,125 @@ class HNSWIndex:
         if id in self.id_to_node:
             raise ValueError(f"ID {id} already exists")
 
-        node = HNSWNode(id=id, vector=vector, layer=0)
-        self.id_to_node[id] = node
-        self.num_vectors += 1
+        return stored
+
+    def _insert(self, vector, id, attributes, stored):
+        with span(self.hooks, 'insert', id=id):
+            return self._insert_node(vector, id, attributes, stored)
+
+    def _insert_node(self, vector, id, attributes, stored):
+        # The neighbour search uses the full-precision input; only the
+        # stored copy (from _check_data) is reduced to self.dtype.
+        query = vector.data
+        row, aux = stored
+        query_aux = self.metric.aux(query) if self.dtype is not None else aux
+
+        node = HNSWNode(id=id, vector=row, layer=self._get_random_layer())
+        node.aux = aux
+
+        with self._global_lock:
+            if id in self.id_to_node:
+                raise ValueError(f"ID {id} already exists")
+            if self.dim is None:
+                self.dim = len(row)
+            elif len(row) != self.dim:
+                raise ValueError(f"Vector dimension {len(row)} does not match index dimension {self.dim}")
+
+            self.id_to_node[id] = node
+            self.num_vectors += 1
+            self._version += 1
+            if attributes:
+                self.attributes.set(id, attributes)
+
+            while len(self.layers) <= node.layer:
+                self.layers.append({})
+
+            for layer in range(node.layer + 1):
+                self.layers[layer][id] = node
+
+            entry_point = self.entry_point
+            if entry_point is None:
+                self.entry_point = node
+                return id
+
+        top_layer = entry_point.layer
+        with span(self.hooks, 'descent'):
+            entry_nodes = self._descend(query, query_aux, entry_point, node.layer)
+
+        with span(self.hooks, 'link', layers=min(node.layer, top_layer) + 1):
+            for layer in reversed(range(min(node.layer, top_layer) + 1)):
+                neighbors = self._search_layer(query, query_aux, entry_nodes, self.efConstruction, layer)
+                selected = [(neighbor_id, dist) for neighbor_id, dist in neighbors if neighbor_id != id][:self.M]
+                # A concurrent insert may already have linked itself into
+                # this row, so merge rather than overwrite.
+                with self._node_lock(id):
+                    chosen = {neighbor_id for neighbor_id, _ in selected}
+                    connections = selected + [c for c in node.get_connections(layer) if c[0] not in chosen]
+                    connections.sort(key=lambda x: x[1])
+                    del connections[self._max_connections(layer):]
+                    node.connections[layer] = connections
+                for neighbor_id, dist in selected:
+                    neighbor_node = self.id_to_node.get(neighbor_id)
+                    if neighbor_node is not None:
+                        self._link(neighbor_node, id, dist, layer)
+                entry_nodes = self._nodes(neighbor_id for neighbor_id, _ in neighbors) or entry_nodes
+
+        if node.layer > top_layer:
+            with self._global_lock:
+                if node.layer > self.entry_point.layer:
+                    self.entry_point = node
 
-        if not self.layers:
-            self.layers.append({})
-            self.entry_point = node
+        return id
 
-        while len(self.layers) <= node.layer:
-            self.layers.append({})
+    def add_vector(self, vector, id=None, attributes=None):
+        if id is None:
+            id = self.num_vectors
 
-        self.layers[node.layer][id] = node
+        stored = self._check_vector(vector, id, attributes)
+        return self._insert(vector, id, attributes, stored)
 
-        if node.layer > 0:
-            search_layers = list(range(node.layer, len(self.layers) - 1))
+    def add_vectors(self, vectors, ids=None, attributes=None, num_threads=None):
+        # Inserts run concurrently; only add_vectors calls may overlap, not
+        # deletes.
+        vectors = list(vectors)
+        if ids is None:
+            ids = list(range(self.num_vectors, self.num_vectors + len(vectors)))
         else:
-            search_layers = list(range(len(self.layers) - 1))
+            ids = list(ids)
+        if attributes is None:
+            attributes = [None] * len(vectors)
+        else:
+            attributes = list(attributes)
 
-        for layer in reversed(search_layers):
-            neighbors = self._search_layer(vector, self.efConstruction, layer)
-            for neighbor_id, _ in neighbors[:self.M]:
-                neighbor_node = self.id_to_node[neighbor_id]
-                node.add_connection(neighbor_id, self._distance(vector, neighbor_node.vector), node.layer)
-                neighbor_node.add_connection(id, self._distance(neighbor_node.vector, vector), node.layer)
+        if len(ids) != len(vectors) or len(attributes) != len(vectors):
+            raise ValueError("vectors, ids and attributes must have the same length")
 
-        return id
+        if len(set(ids)) != len(ids):
+            raise ValueError("ids must be unique")
+
+        dim = self.dim
+        if dim is None and vectors and isinstance(vectors[0], Vector):
+            dim = len(vectors[0])
+        # Every vector is checked and converted before the first insert.
+        stored = [self._check_vector(vector, id, attrs, dim) for vector, id, attrs in zip(vectors, ids, attributes)]
+        return self._insert_batch(vectors, ids, attributes, stored, num_threads)
+
+    def _insert_batch(self, vectors, ids, attributes, stored, num_threads):
+        if num_threads is None:
+            num_threads = _default_num_threads()
+
+        if num_threads <= 1 or len(vectors) <= 1:
+            for vector, id, attrs, row in zip(vectors, ids, attributes, stored):
+                self._insert(vector, id, attrs, row)
+            return ids
+
+        # Seed the graph serially so concurrent inserts start from a
+        # connected entry point.
+        self._insert(vectors[0], ids[0], attributes[0], stored[0])
+        with ThreadPoolExecutor(max_workers=num_threads) as executor:
+            list(executor.map(self._insert, vectors[1:], ids[1:], attributes[1:], stored[1:]))
+
+        return ids
 
     def get_vector(self, id):
         if not isinstance(id, int):
@@ -109,63 +353,366 @@ class HNSWIndex:
         if id not in self.id_to_node:
             raise ValueError(f"ID {id} does not exist")
 
-        return self.id_to_node[id].vector
+        # A copy, as in Index.get_vector.
+        vector = self.id_to_node[id].vector
+        if self.dtype is None and not self.copy_vectors:
+            return vector
+        return vector.copy()
 
-    def delete_vector(self, id):
+    def get_attributes(self, id):
         if not isinstance(id, int):
             raise TypeError(f"id must be an int, not {type(id).__name__}")
 
         if id not in self.id_to_node:
             raise ValueError(f"ID {id} does not exist")
 
-        node = self.id_to_node[id]
+        return dict(self.attributes.get(id))
 
-        for layer in range(node.layer + 1):
-            if layer < len(self.layers) and id in self.layers[layer]:
-                del self.layers[layer][id]
+    def set_attributes(self, id, attributes):
+        if not isinstance(id, int):
+            raise TypeError(f"id must be an int, not {type(id).__name__}")
 
-        for neighbor_id, neighbor_node in self.id_to_node.items():
-            for layer in neighbor_node.connections:
-                neighbor_node.connections[layer] = [
-                    (nid, dist) for nid, dist in neighbor_node.connections[layer]
-                    if nid != id
-                ]
+        if id not in self.id_to_node:
+            raise ValueError(f"ID {id} does not exist")
 
-        del self.id_to_node[id]
-        self.num_vectors -= 1
+        self.attributes.set(id, attributes)
+        self._version += 1
 
-        if self.entry_point and self.entry_point.id == id:
-            self.entry_point = None
+    def delete_vector(self, id):
+        if not isinstance(id, int):
+            raise TypeError(f"id must be an int, not {type(id).__name__}")
 
-        return node.vector
+        if id not in self.id_to_node:
+            raise ValueError(f"ID {id} does not exist")
+
+        with span(self.hooks, 'delete', id=id):
+            return self._delete([id])[0]
+
+    def delete_vectors(self, ids):
+        # Deletes a batch with a single pass over the neighbour rows, where
+        # delete_vector makes one pass per id.
+        ids = list(ids)
+        for id in ids:
+            if not isinstance(id, int):
+                raise TypeError(f"id must be an int, not {type(id).__name__}")
+            if id not in self.id_to_node:
+                raise ValueError(f"ID {id} does not exist")
+
+        if len(set(ids)) != len(ids):
+            raise ValueError("ids must be unique")
+
+        if not ids:
+            return []
+
+        with span(self.hooks, 'delete', ids=len(ids)):
+            return self._delete(ids)
+
+    def _delete(self, ids):
+        with self._global_lock:
+            deleted = {}  # id -> node
+            for id in ids:
+                node = deleted[id] = self.id_to_node.pop(id)
+                self.attributes.remove(id)
+                for layer in range(node.layer + 1):
+                    if layer < len(self.layers):
+                        self.layers[layer].pop(id, None)
+            self.num_vectors -= len(deleted)
+            self._version += 1
+
+            while self.layers and not self.layers[-1]:
+                self.layers.pop()
+
+            if self.entry_point is not None and self.entry_point.id in deleted:
+                self.entry_point = next(iter(self.layers[-1].values())) if self.layers else None
+
+        with span(self.hooks, 'unlink', ids=len(deleted)):
+            for node in list(self.id_to_node.values()):
+                with self._node_lock(node.id):
+                    for layer, connections in list(node.connections.items()):
+                        if any(nid in deleted for nid, _ in connections):
+                            node.connections[layer] = self._repair(node, layer, connections, deleted)
+
+        return [deleted[id].vector for id in ids]
+
+    def _repair(self, node, layer, connections, deleted):
+        # Links to deleted nodes are replaced by the closest surviving
+        # neighbours of those nodes, so removing a well-connected node (or
+        # a whole region of them) does not cut its neighbourhood off.
+        distance = self.metric.distance
+        kept = [(nid, dist) for nid, dist in connections if nid not in deleted]
+        seen = {node.id}
+        seen.update(nid for nid, _ in kept)
+        for nid, _ in connections:
+            if nid not in deleted:
+                continue
+            for candidate_id, _ in deleted[nid].get_connections(layer):
+                if candidate_id in seen:
+                    continue
+                seen.add(candidate_id)
+                candidate = self.id_to_node.get(candidate_id)
+                if candidate is not None and candidate.layer >= layer:
+                    kept.append((candidate_id, distance(node.vector.data, node.aux, candidate.vector.data,
+                                                        candidate.aux)))
+        kept.sort(key=lambda x: x[1])
+        return kept[:self._max_connections(layer)]
+
+    def _check_updates(self, ids, vectors):
+        if len(ids) != len(vectors):
+            raise ValueError("ids and vectors must have the same length")
+
+        for id, vector in zip(ids, vectors):
+            if not isinstance(id, int):
+                raise TypeError(f"id must be an int, not {type(id).__name__}")
+            if id not in self.id_to_node:
+                raise ValueError(f"ID {id} does not exist")
+
+        if len(set(ids)) != len(ids):
+            raise ValueError("ids must be unique")
+
+        return [self._check_data(vector) for vector in vectors]
+
+    def update_vectors(self, ids, vectors, num_threads=None):
+        # Replaces a batch of vectors, keeping their ids and attributes: one
+        # delete_vectors pass, then the new vectors are inserted as by
+        # add_vectors. Every vector is checked and converted before the
+        # delete, so a rejected batch leaves the graph unchanged.
+        ids = list(ids)
+        vectors = list(vectors)
+        stored = self._check_updates(ids, vectors)
+
+        attributes = [dict(self.attributes.get(id)) or None for id in ids]
+        old_vectors = self.delete_vectors(ids)
+        self._insert_batch(vectors, ids, attributes, stored, num_threads)
+        return old_vectors
+
+    def search(self, query, top_k=5, ef=10, filter=None, return_stats=False, patience=None, time_budget=None):
+        # patience and time_budget (seconds) trade recall for latency: ef
+        # becomes an upper bound and the base-layer walk may stop before it
+        # converges. Stats report early_stopped when that happened.
+        deadline = None
+        if time_budget is not None:
+            if not isinstance(time_budget, (int, float)):
+                raise TypeError(f"time_budget must be a number, not {type(time_budget).__name__}")
+            if time_budget <= 0:
+                raise ValueError(f"time_budget must be > 0, got {time_budget}")
+            deadline = time.perf_counter() + time_budget
+
+        if patience is not None:
+            if not isinstance(patience, int):
+                raise TypeError(f"patience must be an int, not {type(patience).__name__}")
+            if patience < 1:
+                raise ValueError(f"patience must be >= 1, got {patience}")
 
-    def search(self, query, top_k=5, ef=10):
         if not isinstance(query, Vector):
             raise TypeError(f"query must be a Vector, not {type(query).__name__}")
 
+        if self.dim is not None and len(query) != self.dim:
+            raise ValueError(f"Query vector dimension {len(query)} does not match index dimension {self.dim}")
+
         if not isinstance(top_k, int):
             raise TypeError(f"top_k must be an int, not {type(top_k).__name__}")
 
         if top_k < 1:
             raise ValueError(f"top_k must be >= 1, got {top_k}")
 
-        if not self.id_to_node:
-            return []
+        with span(self.hooks, 'search', top_k=top_k, ef=ef):
+            if self.cache is None or return_stats:
+                return self._search(query, top_k, ef, filter, return_stats, patience, deadline)
+            # time_budget is part of the key: a budget-limited answer is not
+            # served to callers that asked for a converged one.
+            return self.cache.fetch(self._version,
+                                    lambda: self._search(query, top_k, ef, filter, False, patience, deadline),
+                                    query, top_k, ef, filter, patience, time_budget)
+
+    def _search(self, query, top_k, ef, filter, return_stats, patience, deadline):
+        stats = SearchStats() if return_stats or self.collect_stats else None
+
+        entry_point = self.entry_point
+        if entry_point is None:
+            return ([], stats) if return_stats else []
 
         if ef < top_k:
             ef = top_k
 
-        results = []
-        for layer in reversed(range(len(self.layers))):
-            layer_results = self._search_layer(query, ef, layer)
-            if layer_results:
-                best_id = layer_results[0][0]
-                self.entry_point = self.id_to_node[best_id]
+        query_data = query.data
+        query_aux = self.metric.aux(query_data)
+
+        allowed = None
+        if filter is not None:
+            with span(self.hooks, 'filter'):
+                allowed = self.attributes.compile(filter, self.id_to_node)
 
-        final_results = self._search_layer(query, ef, 0)
-        final_results.sort(key=lambda x: x[1])
+        if allowed is not None and len(allowed) <= max(ef, self.brute_force_ratio * self.num_vectors):
+            with span(self.hooks, 'brute_force', candidates=len(allowed)):
+                final_results = self._brute_force(query_data, query_aux, allowed, top_k)
+            if stats is not None:
+                stats.brute_force = True
+                stats.distance_evaluations = stats.visited_nodes = len(allowed)
+        else:
+            with span(self.hooks, 'descent', layers=entry_point.layer):
+                entry_nodes = self._descend(query_data, query_aux, entry_point, 0, stats)
+            with span(self.hooks, 'base_layer'):
+                final_results = self._search_layer(query_data, query_aux, entry_nodes, ef, 0, allowed, stats,
+                                                   patience, deadline)
+
+        with span(self.hooks, 'select'):
+            to_similarity = self.metric.to_similarity
+            results = [(node_id, to_similarity(dist)) for node_id, dist in final_results[:top_k]]
+
+        if stats is not None and self.collect_stats:
+            self.metrics.record(stats)
+        return (results, stats) if return_stats else results
+
+    def range_search(self, query, threshold, ef=10, filter=None):
+        # Yields (id, similarity) for nodes scoring at least threshold, in no
+        # particular order: nodes are yielded as the walk reaches them, and a
+        # later one can be closer. An ef-wide search finds a way into the
+        # region, then the walk only expands nodes inside it. Like search(),
+        # this is approximate: a matching node reachable only through
+        # non-matching ones can be missed.
+        if not isinstance(query, Vector):
+            raise TypeError(f"query must be a Vector, not {type(query).__name__}")
 
-        return [(node_id, 1 - dist) for node_id, dist in final_results[:top_k]]
+        if self.dim is not None and len(query) != self.dim:
+            raise ValueError(f"Query vector dimension {len(query)} does not match index dimension {self.dim}")
+
+        if not isinstance(threshold, (int, float)):
+            raise TypeError(f"threshold must be a number, not {type(threshold).__name__}")
+
+        allowed = None
+        if filter is not None:
+            allowed = self.attributes.compile(filter, self.id_to_node)
+        return self._range_search(query.data, threshold, ef, allowed)
+
+    def _range_search(self, query, threshold, ef, allowed):
+        entry_point = self.entry_point
+        if entry_point is None:
+            return
+
+        query_aux = self.metric.aux(query)
+        distance = self.metric.distance
+        to_similarity = self.metric.to_similarity
+        radius = self.metric.offset - threshold
+
+        if allowed is not None and len(allowed) <= max(ef, self.brute_force_ratio * self.num_vectors):
+            for id, dist in self._brute_force(query, query_aux, allowed, len(allowed)):
+                if dist > radius:
+                    break
+                yield id, to_similarity(dist)
+            return
+
+        entry_nodes = self._descend(query, query_aux, entry_point, 0)
+        seeds = self._search_layer(query, query_aux, entry_nodes, ef, 0)
+        for node_id, dist in self._expand(query, query_aux, seeds, radius, set()):
+            if allowed is None or node_id in allowed:
+                yield node_id, to_similarity(dist)
+
+    def _expand(self, query, query_aux, seeds, radius, visited):
+        # Best-first walk over the base layer from seeds, (node_id, distance)
+        # pairs, yielding (node_id, distance) for nodes within radius as they
+        # are expanded, which is not sorted order. Only nodes within radius
+        # are expanded.
+        distance = self.metric.distance
+        candidates = []  # min-heap of (distance, node_id, node)
+        for node_id, dist in seeds:
+            node = self.id_to_node.get(node_id)
+            if node is not None and node_id not in visited:
+                visited.add(node_id)
+                heapq.heappush(candidates, (dist, node_id, node))
+
+        while candidates:
+            dist, node_id, node = heapq.heappop(candidates)
+            if dist > radius:
+                break
+            yield node_id, dist
+
+            for neighbor_id, _ in node.get_connections(0):
+                if neighbor_id in visited:
+                    continue
+                visited.add(neighbor_id)
+                neighbor_node = self.id_to_node.get(neighbor_id)
+                if neighbor_node is None:
+                    continue
+                neighbor_dist = distance(query, query_aux, neighbor_node.vector.data, neighbor_node.aux)
+                if neighbor_dist <= radius:
+                    heapq.heappush(candidates, (neighbor_dist, neighbor_id, neighbor_node))
+
+    def similarity_join(self, threshold, filter=None, num_threads=None):
+        # Yields (id_a, id_b, similarity) with id_a < id_b for pairs scoring
+        # at least threshold. Each node's walk starts from its own base-layer
+        # neighbours, whose distances are already stored, and expands only
+        # within the threshold, so no query descends from the entry point.
+        # Approximate in the same way as range_search.
+        if not isinstance(threshold, (int, float)):
+            raise TypeError(f"threshold must be a number, not {type(threshold).__name__}")
+
+        allowed = None
+        if filter is not None:
+            allowed = self.attributes.compile(filter, self.id_to_node)
+        radius = self.metric.offset - threshold
+        return self._per_node(self._join_nodes, (radius, allowed), allowed, num_threads)
+
+    def _join_nodes(self, nodes, radius, allowed):
+        to_similarity = self.metric.to_similarity
+        pairs = []
+        for node in nodes:
+            walk = self._expand(node.vector.data, node.aux, node.get_connections(0), radius, {node.id})
+            pairs.extend((node.id, other, to_similarity(dist)) for other, dist in walk
+                         if other > node.id and (allowed is None or other in allowed))
+        return pairs
+
+    def knn_graph(self, k, ef=10, num_threads=None):
+        # Yields (id, neighbor_id, similarity) for k neighbours of every
+        # node, most similar first. These are the node's own base-layer
+        # neighbour lists; only nodes with fewer than k neighbours run a
+        # search, started from the node itself.
+        if not isinstance(k, int):
+            raise TypeError(f"k must be an int, not {type(k).__name__}")
+
+        if k < 1:
+            raise ValueError(f"k must be >= 1, got {k}")
+
+        return self._per_node(self._knn_nodes, (k, max(ef, k + 1)), None, num_threads)
+
+    def _knn_nodes(self, nodes, k, ef):
+        to_similarity = self.metric.to_similarity
+        edges = []
+        for node in nodes:
+            neighbors = sorted((c for c in node.get_connections(0) if c[0] in self.id_to_node), key=lambda x: x[1])
+            if len(neighbors) < k:
+                found = self._search_layer(node.vector.data, node.aux, [node], ef, 0)
+                neighbors = [(nid, dist) for nid, dist in found if nid != node.id]
+            edges.extend((node.id, nid, to_similarity(dist)) for nid, dist in neighbors[:k])
+        return edges
+
+    def _per_node(self, task, args, allowed, num_threads, chunk_size=256):
+        # Runs task(nodes, *args) over chunks of a snapshot of the nodes on
+        # num_threads threads, keeping at most num_threads chunks pending,
+        # and yields their results in node order.
+        if num_threads is None:
+            num_threads = _default_num_threads()
+        nodes = list(self.id_to_node.values())
+        if allowed is not None:
+            nodes = [node for node in nodes if node.id in allowed]
+        chunks = [nodes[start:start + chunk_size] for start in range(0, len(nodes), chunk_size)]
+
+        if num_threads <= 1 or len(chunks) <= 1:
+            for chunk in chunks:
+                yield from task(chunk, *args)
+            return
+
+        with ThreadPoolExecutor(max_workers=num_threads) as executor:
+            pending = deque()
+            for chunk in chunks:
+                pending.append(executor.submit(task, chunk, *args))
+                if len(pending) >= num_threads:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+
+    def search_batch(self, queries, top_k=5, ef=10, filter=None, patience=None, time_budget=None):
+        # time_budget applies to each query separately.
+        return [self.search(query, top_k, ef, filter, patience=patience, time_budget=time_budget) for query in queries]
 
     def __len__(self):
         return self.num_vectors
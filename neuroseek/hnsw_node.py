@@ -6,6 +6,7 @@ class HNSWNode:
         self.id = id
         self.vector = vector
         self.layer = layer
+        self.aux = None  # metric-specific cached term of vector (e.g. its norm)
         self.connections = {}  # layer -> list of (node_id, distance)
 
     def add_connection(self, neighbor_id, distance, layer=None):
@@ -1,33 +1,65 @@
 import pickle
+from neuroseek.persistence import read_file, write_file
+from neuroseek.tracing import span
 
 
 def save_hnsw_index(index, filename):
-    data = {
-        'M': index.M,
-        'efConstruction': index.efConstruction,
-        'maxLayers': index.maxLayers,
-        'layers': index.layers,
-        'id_to_node': index.id_to_node,
-        'entry_point_id': index.entry_point.id if index.entry_point else None,
-        'num_vectors': index.num_vectors
-    }
-    with open(filename, 'wb') as f:
-        pickle.dump(data, f)
-
-
-def load_hnsw_index(filename, HNSWIndex):
-    with open(filename, 'rb') as f:
-        data = pickle.load(f)
+    hooks = index.hooks
+    with span(hooks, 'save', filename=filename):
+        with span(hooks, 'serialize'):
+            data = {
+                'M': index.M,
+                'efConstruction': index.efConstruction,
+                'maxLayers': index.maxLayers,
+                'layers': index.layers,
+                'id_to_node': index.id_to_node,
+                'entry_point_id': index.entry_point.id if index.entry_point else None,
+                'num_vectors': index.num_vectors,
+                'metric': index.metric.name,
+                'dtype': index.dtype,
+                'dim': index.dim,
+                'attributes': index.attributes.attributes
+            }
+            payload = pickle.dumps(data)
+        write_file(filename, payload, hooks)
 
+
+def load_hnsw_index(filename, HNSWIndex, hooks=None):
+    # hooks are installed on the loaded index and also see the load itself.
+    hooks = list(hooks or [])
+    with span(hooks, 'load', filename=filename):
+        payload = read_file(filename, hooks)
+        with span(hooks, 'deserialize'):
+            data = pickle.loads(payload)
+        with span(hooks, 'rebuild'):
+            index = _restore(data, HNSWIndex)
+    index.hooks = hooks
+    return index
+
+
+def _restore(data, HNSWIndex):
     index = HNSWIndex(
         M=data['M'],
         efConstruction=data['efConstruction'],
-        maxLayers=data['maxLayers']
+        maxLayers=data['maxLayers'],
+        metric=data.get('metric', 'cosine'),
+        dtype=data.get('dtype')
     )
+    dim = data.get('dim')
+    if dim is None and data['id_to_node']:
+        dim = len(next(iter(data['id_to_node'].values())).vector)
+    index.dim = dim
     index.layers = data['layers']
     index.id_to_node = data['id_to_node']
     index.num_vectors = data['num_vectors']
 
+    for node in index.id_to_node.values():
+        if getattr(node, 'aux', None) is None:
+            node.aux = index.metric.aux(node.vector.data)
+
+    for id, attributes in data.get('attributes', {}).items():
+        index.attributes.set(id, attributes)
+
     if data['entry_point_id'] is not None:
         index.entry_point = index.id_to_node[data['entry_point_id']]
 
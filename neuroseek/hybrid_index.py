@@ -0,0 +1,114 @@
+from neuroseek.vector import Vector
+from neuroseek.index import Index
+from neuroseek.hnsw_index import HNSWIndex
+
+
+class HybridIndex:
+    # Candidates come from an HNSW graph holding reduced-precision copies of
+    # the vectors (graph_dtype); the best top_k * rerank_factor of them are
+    # then rescored against the exact store. With copy_vectors=False,
+    # vectors handed in as buffer views (e.g. datasets.map_npy) stay on disk
+    # in the exact store and are only paged in for the candidates being
+    # reranked.
+    def __init__(self, M=16, efConstruction=200, metric='cosine', graph_dtype='float16', exact_dtype=None,
+                 rerank_factor=4, copy_vectors=True, **hnsw_kwargs):
+        if not isinstance(rerank_factor, int):
+            raise TypeError(f"rerank_factor must be an int, not {type(rerank_factor).__name__}")
+        if rerank_factor < 1:
+            raise ValueError(f"rerank_factor must be >= 1, got {rerank_factor}")
+
+        self.rerank_factor = rerank_factor
+        self.exact = Index(metric=metric, dtype=exact_dtype, num_threads=1, copy_vectors=copy_vectors)
+        self.graph = HNSWIndex(M=M, efConstruction=efConstruction, metric=metric, dtype=graph_dtype,
+                               copy_vectors=copy_vectors, **hnsw_kwargs)
+
+    @property
+    def metric(self):
+        return self.exact.metric
+
+    def __len__(self):
+        return len(self.exact)
+
+    def add_vector(self, vector, id=None, attributes=None):
+        # Attributes live in the graph only; filters are applied there.
+        id = self.exact.add_vector(vector, id)
+        try:
+            self.graph.add_vector(vector, id, attributes)
+        except Exception:
+            self.exact.delete_vector(id)
+            raise
+        return id
+
+    def add_vectors(self, vectors, ids=None, attributes=None, num_threads=None):
+        vectors = list(vectors)
+        ids = self.exact.add_vectors(vectors, ids)
+        try:
+            self.graph.add_vectors(vectors, ids, attributes, num_threads=num_threads)
+        except Exception:
+            self.exact.delete_vectors(ids)
+            self.graph.delete_vectors([id for id in ids if id in self.graph.id_to_node])
+            raise
+        return ids
+
+    def get_vector(self, id):
+        return self.exact.get_vector(id)
+
+    def get_attributes(self, id):
+        return self.graph.get_attributes(id)
+
+    def set_attributes(self, id, attributes):
+        self.graph.set_attributes(id, attributes)
+
+    def delete_vector(self, id):
+        vector = self.exact.get_vector(id)
+        self.graph.delete_vector(id)
+        self.exact.delete_vector(id)
+        return vector
+
+    def delete_vectors(self, ids):
+        ids = list(ids)
+        vectors = [vector for _, vector in self.exact.delete_vectors(ids)]
+        self.graph.delete_vectors(ids)
+        return vectors
+
+    def update_vector(self, id, vector):
+        # The graph's checks (dimension, zero vectors under cosine, and the
+        # graph_dtype conversion: range and underflow) run before either
+        # store changes; exact.update_vector checks the rest.
+        attributes = self.graph.get_attributes(id)
+        self.graph._check_data(vector)
+        old = self.exact.update_vector(id, vector)
+        self.graph.delete_vector(id)
+        self.graph.add_vector(vector, id, attributes or None)
+        return old
+
+    def update_vectors(self, ids, vectors, num_threads=None):
+        ids = list(ids)
+        vectors = list(vectors)
+        # The whole batch is checked against both stores before either changes.
+        self.exact._check_updates(ids, vectors)
+        self.graph._check_updates(ids, vectors)
+        old = self.exact.update_vectors(ids, vectors)
+        self.graph.update_vectors(ids, vectors, num_threads=num_threads)
+        return old
+
+    def search(self, query, top_k=5, ef=10, filter=None, rerank_factor=None, patience=None, time_budget=None):
+        if not isinstance(query, Vector):
+            raise TypeError(f"query must be a Vector, not {type(query).__name__}")
+        if not isinstance(top_k, int):
+            raise TypeError(f"top_k must be an int, not {type(top_k).__name__}")
+        if top_k < 1:
+            raise ValueError(f"top_k must be >= 1, got {top_k}")
+
+        if rerank_factor is None:
+            rerank_factor = self.rerank_factor
+        elif not isinstance(rerank_factor, int) or rerank_factor < 1:
+            raise ValueError(f"rerank_factor must be a positive int, got {rerank_factor!r}")
+
+        num_candidates = top_k * rerank_factor
+        candidates = self.graph.search(query, num_candidates, max(ef, num_candidates), filter,
+                                       patience=patience, time_budget=time_budget)
+        return self.exact.rerank(query, [id for id, _ in candidates], top_k)
+
+    def search_batch(self, queries, top_k=5, ef=10, filter=None, rerank_factor=None):
+        return [self.search(query, top_k, ef, filter, rerank_factor) for query in queries]
@@ -1,11 +1,71 @@
+import heapq
+import os
+import sys
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain, compress
 from neuroseek.vector import Vector
+from neuroseek.distance import get_metric
+from neuroseek.filtering import AttributeStore
+from neuroseek.tracing import span
+from neuroseek.precision import HALF_DTYPES, check_dtype, decode_rows
+
+
+def _default_num_threads():
+    # The scoring kernels hold the GIL, so extra threads only add handoff
+    # cost unless the interpreter is a free-threaded build.
+    if getattr(sys, '_is_gil_enabled', lambda: True)():
+        return 1
+    return os.cpu_count() or 1
 
 
 class Index:
-    def __init__(self):
+    # Scans smaller than this many rows per thread run on the calling thread.
+    min_block_size = 4096
+
+    # Half-precision rows are upcast this many at a time while scoring.
+    upcast_block_size = 1024
+
+    # similarity_join and knn_graph work through the rows this many at a time.
+    join_block_size = 256
+
+    def __init__(self, metric='cosine', num_threads=None, cache=None, dtype=None, dim=None, copy_vectors=True):
+        if num_threads is None:
+            num_threads = _default_num_threads()
+        if not isinstance(num_threads, int):
+            raise TypeError(f"num_threads must be an integer, not {type(num_threads).__name__}")
+        if num_threads < 1:
+            raise ValueError(f"num_threads must be >= 1, got {num_threads}")
+
+        check_dtype(dtype)
+        if dim is not None and (not isinstance(dim, int) or dim < 0):
+            raise ValueError(f"dim must be a non-negative integer, got {dim!r}")
+
+        self.metric = get_metric(metric)
+        self.dtype = dtype  # row storage, see neuroseek.precision; None keeps vectors as given
+        self.dim = dim  # fixed by the first insert when not given
+        # Rows are private copies, so callers mutating their Vectors cannot
+        # leave the cached norms stale; False keeps the caller's Vectors (and
+        # buffer views such as datasets.map_npy) by reference.
+        self.copy_vectors = copy_vectors
+        self.num_threads = num_threads
+        self._executor = None
         self.vectors = []
         self.id_to_index = {}
         self._next_id = 0
+        self._aux = []  # per-row metric term (norm, squared norm), parallel to self.vectors
+        self.attributes = AttributeStore()
+        self.hooks = []  # profiling hooks, see neuroseek.tracing
+        self.cache = cache  # optional neuroseek.cache.QueryCache
+        self._version = 0  # bumped on every mutation; invalidates cached results
+
+    def add_hook(self, hook):
+        if not callable(hook):
+            raise TypeError(f"hook must be callable, not {type(hook).__name__}")
+        self.hooks.append(hook)
+
+    def remove_hook(self, hook):
+        self.hooks.remove(hook)
 
     def __len__(self):
         return len(self.vectors)
@@ -17,30 +77,135 @@ class Index:
         if id not in self.id_to_index:
             raise ValueError(f"ID {id} does not exist in index")
 
-        index = self.id_to_index[id]
-        return self.vectors[index][1]
+        # A copy, so changes to it cannot leave the row's cached aux stale;
+        # with copy_vectors=False the caller's own Vector comes back.
+        vector = self.vectors[self.id_to_index[id]][1]
+        if self.dtype is None and not self.copy_vectors:
+            return vector
+        return vector.copy()
+
+    def get_attributes(self, id):
+        if not isinstance(id, int):
+            raise TypeError(f"unsupported operand type(s) for get_attributes: 'Index' and '{type(id).__name__}'")
+
+        if id not in self.id_to_index:
+            raise ValueError(f"ID {id} does not exist in index")
 
-    def add_vector(self, vector, id=None):
+        return dict(self.attributes.get(id))
+
+    def set_attributes(self, id, attributes):
+        if not isinstance(id, int):
+            raise TypeError(f"unsupported operand type(s) for set_attributes: 'Index' and '{type(id).__name__}'")
+
+        if id not in self.id_to_index:
+            raise ValueError(f"ID {id} does not exist in index")
+
+        self.attributes.set(id, attributes)
+        self._version += 1
+
+    def _stored(self, vector):
+        # Returns (row, aux) for vector as it will be stored. Conversion to
+        # dtype happens here, before the index changes, so values outside
+        # the dtype's range and rows that underflow to zero (undefined under
+        # cosine) are rejected up front.
+        if self.dtype is not None:
+            row = vector.astype(self.dtype)
+        elif self.copy_vectors:
+            row = vector.copy()
+        else:
+            row = vector
+        aux = self.metric.aux(row.data)
+        if self.metric.name == 'cosine' and aux == 0 and self.dtype is not None and any(vector.data):
+            raise ValueError(f"Vector underflows to zero in {self.dtype}; "
+                             "cosine similarity is not defined for zero-length vectors.")
+        return row, aux
+
+    def _check_dimension(self, vector, dim=None):
+        # Every row and query has the index's dimension, so the scoring
+        # kernels never need to check sizes themselves.
+        dim = self.dim if dim is None else dim
+        if dim is not None and len(vector) != dim:
+            raise ValueError(f"Vector dimension {len(vector)} does not match index dimension {dim}")
+
+    def add_vector(self, vector, id=None, attributes=None):
         if not isinstance(vector, Vector):
             raise TypeError(f"unsupported operand type(s) for add_vector: 'Index' and '{type(vector).__name__}'")
 
-        if id is None:
-            id = self._next_id
-            while id in self.id_to_index:
-                id = self._next_id
-                self._next_id += 1
+        if attributes is not None and not isinstance(attributes, dict):
+            raise TypeError(f"attributes must be a dict, not {type(attributes).__name__}")
 
-        if not isinstance(id, int):
+        self._check_dimension(vector)
+
+        if id is not None and not isinstance(id, int):
             raise TypeError(f"unsupported operand type(s) for id: 'Index' and '{type(id).__name__}'")
 
         if id in self.id_to_index:
             raise ValueError(f"ID {id} already exists. Use update_vector() to replace.")
 
-        index = len(self.vectors)
-        self.vectors.append((id, vector))
-        self.id_to_index[id] = index
+        row, aux = self._stored(vector)
+        return self._append(self._new_id() if id is None else id, row, aux, attributes)
+
+    def _new_id(self):
+        id = self._next_id
+        while id in self.id_to_index:
+            id = self._next_id
+            self._next_id += 1
+        return id
+
+    def _append(self, id, row, aux, attributes):
+        with span(self.hooks, 'insert', id=id):
+            self.vectors.append((id, row))
+            self._aux.append(aux)
+            self.id_to_index[id] = len(self.vectors) - 1
+            if attributes:
+                self.attributes.set(id, attributes)
+            if self.dim is None:
+                self.dim = len(row)
+            self._version += 1
         return id
     
+    def add_vectors(self, vectors, ids=None, attributes=None):
+        vectors = list(vectors)
+        ids = list(ids) if ids is not None else [None] * len(vectors)
+        attributes = list(attributes) if attributes is not None else [None] * len(vectors)
+
+        if len(ids) != len(vectors) or len(attributes) != len(vectors):
+            raise ValueError("vectors, ids and attributes must have the same length")
+
+        explicit_ids = [id for id in ids if id is not None]
+        if len(set(explicit_ids)) != len(explicit_ids):
+            raise ValueError("ids must be unique")
+
+        dim = self.dim
+        for vector, id, attrs in zip(vectors, ids, attributes):
+            if not isinstance(vector, Vector):
+                raise TypeError(f"unsupported operand type(s) for add_vectors: 'Index' and '{type(vector).__name__}'")
+            if dim is None:
+                dim = len(vector)
+            self._check_dimension(vector, dim)
+            if id is not None and not isinstance(id, int):
+                raise TypeError(f"unsupported operand type(s) for id: 'Index' and '{type(id).__name__}'")
+            if id in self.id_to_index:
+                raise ValueError(f"ID {id} already exists. Use update_vector() to replace.")
+            if attrs is not None and not isinstance(attrs, dict):
+                raise TypeError(f"attributes must be a dict, not {type(attrs).__name__}")
+
+        # Auto-assigned ids are resolved up front, skipping ids in the index
+        # and explicit ids anywhere in the batch, so they cannot collide.
+        taken = set(explicit_ids)
+        next_id = self._next_id
+        for i, id in enumerate(ids):
+            if id is None:
+                while next_id in self.id_to_index or next_id in taken:
+                    next_id += 1
+                ids[i] = next_id
+                taken.add(next_id)
+
+        # Every row is converted before the first one is inserted.
+        rows = [self._stored(vector) for vector in vectors]
+        self._next_id = next_id
+        return [self._append(id, row, aux, attrs) for (row, aux), id, attrs in zip(rows, ids, attributes)]
+
     def delete_vector(self, id=None):
         if id is None:
             raise ValueError("ID must be provided for deletion")
@@ -51,16 +216,52 @@ class Index:
         if id not in self.id_to_index:
             raise ValueError(f"ID {id} does not exist in index")
 
-        index = self.id_to_index[id]
-        deleted_vector = self.vectors[index]
-        del self.vectors[index]
-        del self.id_to_index[id]
+        with span(self.hooks, 'delete', id=id):
+            index = self.id_to_index[id]
+            deleted_vector = self.vectors[index]
+            del self.vectors[index]
+            del self._aux[index]
+            del self.id_to_index[id]
+            self.attributes.remove(id)
 
-        for i in range(index, len(self.vectors)):
-            self.id_to_index[self.vectors[i][0]] = i
+            for i in range(index, len(self.vectors)):
+                self.id_to_index[self.vectors[i][0]] = i
+            self._version += 1
 
         return deleted_vector
 
+    def delete_vectors(self, ids):
+        # Removes a batch of rows with one compaction and one reindex of the
+        # rows after the first deleted one, instead of one of each per id.
+        ids = list(ids)
+        for id in ids:
+            if not isinstance(id, int):
+                raise TypeError(f"unsupported operand type(s) for delete_vectors: 'Index' and '{type(id).__name__}'")
+            if id not in self.id_to_index:
+                raise ValueError(f"ID {id} does not exist in index")
+
+        if len(set(ids)) != len(ids):
+            raise ValueError("ids must be unique")
+
+        if not ids:
+            return []
+
+        with span(self.hooks, 'delete', ids=len(ids)):
+            deleted = [self.vectors[self.id_to_index[id]] for id in ids]
+            keep = bytearray(b'\x01') * len(self.vectors)
+            for id in ids:
+                keep[self.id_to_index.pop(id)] = 0
+                self.attributes.remove(id)
+
+            first = keep.index(0)
+            self.vectors[first:] = compress(self.vectors[first:], keep[first:])
+            self._aux[first:] = compress(self._aux[first:], keep[first:])
+            for i in range(first, len(self.vectors)):
+                self.id_to_index[self.vectors[i][0]] = i
+            self._version += 1
+
+        return deleted
+
     def update_vector(self, id, vector):
         if not isinstance(id, int):
             raise TypeError(f"unsupported operand type(s) for update_vector: 'Index' and '{type(id).__name__}'")
@@ -71,34 +272,392 @@ class Index:
         if id not in self.id_to_index:
             raise ValueError(f"ID {id} does not exist in index")
 
+        self._check_dimension(vector)
+        row, aux = self._stored(vector)
+
         index = self.id_to_index[id]
         old_vector = self.vectors[index][1]
-        self.vectors[index] = (id, vector)
+        self.vectors[index] = (id, row)
+        self._aux[index] = aux
+        self._version += 1
 
         return (id, old_vector)
-        
-    def search(self, query_vector, top_k=5):
+
+    def update_vectors(self, ids, vectors):
+        # Replaces a batch of rows in place; everything is validated before
+        # the first row changes, and cached results are invalidated once.
+        ids = list(ids)
+        vectors = list(vectors)
+        rows = self._check_updates(ids, vectors)
+
+        updated = []
+        with span(self.hooks, 'update', ids=len(ids)):
+            for id, (row, aux) in zip(ids, rows):
+                index = self.id_to_index[id]
+                updated.append((id, self.vectors[index][1]))
+                self.vectors[index] = (id, row)
+                self._aux[index] = aux
+            if updated:
+                self._version += 1
+
+        return updated
+
+    def _check_updates(self, ids, vectors):
+        if len(ids) != len(vectors):
+            raise ValueError("ids and vectors must have the same length")
+
+        for id, vector in zip(ids, vectors):
+            if not isinstance(id, int):
+                raise TypeError(f"unsupported operand type(s) for update_vectors: 'Index' and '{type(id).__name__}'")
+            if not isinstance(vector, Vector):
+                raise TypeError(f"unsupported operand type(s) for update_vectors: 'Index' and '{type(vector).__name__}'")
+            if id not in self.id_to_index:
+                raise ValueError(f"ID {id} does not exist in index")
+            self._check_dimension(vector)
+
+        if len(set(ids)) != len(ids):
+            raise ValueError("ids must be unique")
+
+        return [self._stored(vector) for vector in vectors]
+
+    def _check_query(self, query_vector):
         if not isinstance(query_vector, Vector):
             raise TypeError(f"unsupported operand type(s) for search: 'Index' and '{type(query_vector).__name__}'")
-        
+
+        if len(query_vector) == 0:
+            raise ValueError("Cannot search with empty query vector")
+
+        if len(query_vector) != self.dim:
+            raise ValueError(f"Query vector dimension {len(query_vector)} does not match index dimension {self.dim}")
+
+    def _check_top_k(self, top_k):
         if not isinstance(top_k, int):
             raise TypeError(f"top_k must be an integer, not {type(top_k).__name__}")
-        
+
         if top_k < 0:
             raise ValueError(f"top_k must be non-negative, got {top_k}")
-        
+
+    def _filter_rows(self, filter):
+        rows = self.vectors
+        auxes = self._aux
+        if filter is not None:
+            allowed = self.attributes.compile(filter, self.id_to_index)
+            if allowed is not None:
+                mask = bytearray(len(rows))
+                for id in allowed:
+                    mask[self.id_to_index[id]] = 1
+                rows = list(compress(rows, mask))
+                auxes = list(compress(auxes, mask))
+        return rows, auxes
+
+    def search(self, query_vector, top_k=5, filter=None):
+        with span(self.hooks, 'search', top_k=top_k):
+            if self.cache is None:
+                return self._search(query_vector, top_k, filter)
+            return self.cache.fetch(self._version, lambda: self._search(query_vector, top_k, filter),
+                                    query_vector, top_k, filter)
+
+    def _search(self, query_vector, top_k, filter):
+        if not isinstance(query_vector, Vector):
+            raise TypeError(f"unsupported operand type(s) for search: 'Index' and '{type(query_vector).__name__}'")
+
+        self._check_top_k(top_k)
+
         if not self.vectors:
             return []
-        
-        if len(query_vector) == 0:
-            raise ValueError("Cannot search with empty query vector")
 
-        similarities = []
-        for id, vector in self.vectors:
-            if len(query_vector) != len(vector):
-                raise ValueError(f"Query vector dimension {len(query_vector)} does not match stored vector dimension {len(vector)}")
-            similarity = query_vector.cosine_similarity(vector)
-            similarities.append((id, similarity))
+        self._check_query(query_vector)
+        with span(self.hooks, 'filter'):
+            rows, auxes = self._filter_rows(filter)
+
+        if top_k == 0:
+            return []
+
+        query = query_vector.data
+        with span(self.hooks, 'scan', rows=len(rows)):
+            return self._scan([query], [self.metric.aux(query)], rows, auxes, top_k)[0]
+
+    def search_batch(self, query_vectors, top_k=5, filter=None):
+        # Scores many queries in one pass over the rows; each row's data is
+        # fetched once per block rather than once per query.
+        query_vectors = list(query_vectors)
+        with span(self.hooks, 'search_batch', top_k=top_k, queries=len(query_vectors)):
+            if self.cache is None:
+                return self._search_batch(query_vectors, top_k, filter)
+            return self._cached_search_batch(query_vectors, top_k, filter)
+
+    def _cached_search_batch(self, query_vectors, top_k, filter):
+        # Only the queries that miss are scored, still in a single batch.
+        version = self._version
+        keys = [self.cache.make_key(query_vector, (top_k, filter)) for query_vector in query_vectors]
+        results = [self.cache.get(key, version) if key is not None else None for key in keys]
+        missing = [i for i, found in enumerate(results) if found is None]
+        if missing:
+            computed = self._search_batch([query_vectors[i] for i in missing], top_k, filter)
+            for i, found in zip(missing, computed):
+                results[i] = found
+                if keys[i] is not None:
+                    self.cache.put(keys[i], version, found)
+        return results
+
+    def _search_batch(self, query_vectors, top_k, filter):
+        for query_vector in query_vectors:
+            if not isinstance(query_vector, Vector):
+                raise TypeError(f"unsupported operand type(s) for search_batch: 'Index' and '{type(query_vector).__name__}'")
+
+        self._check_top_k(top_k)
+
+        if not self.vectors or not query_vectors:
+            return [[] for _ in query_vectors]
+
+        for query_vector in query_vectors:
+            self._check_query(query_vector)
+        with span(self.hooks, 'filter'):
+            rows, auxes = self._filter_rows(filter)
+
+        if top_k == 0:
+            return [[] for _ in query_vectors]
+
+        queries = [query_vector.data for query_vector in query_vectors]
+        with span(self.hooks, 'scan', rows=len(rows)):
+            return self._scan(queries, [self.metric.aux(query) for query in queries], rows, auxes, top_k)
+
+    def range_search(self, query_vector, threshold, filter=None):
+        # Yields (id, similarity) for every row scoring at least threshold,
+        # in row order, one block of min_block_size rows at a time. The
+        # threshold is on the same scale search() reports: cosine
+        # similarity, inner product, or negated squared L2 distance.
+        if not isinstance(query_vector, Vector):
+            raise TypeError(f"unsupported operand type(s) for range_search: 'Index' and '{type(query_vector).__name__}'")
+
+        if not isinstance(threshold, (int, float)):
+            raise TypeError(f"threshold must be a number, not {type(threshold).__name__}")
+
+        if not self.vectors:
+            return iter(())
+
+        self._check_query(query_vector)
+        rows, auxes = self._filter_rows(filter)
+        if rows is self.vectors:
+            # Snapshot, so that mutations between yields cannot shift rows.
+            rows, auxes = list(rows), list(auxes)
+        query = query_vector.data
+        return self._range_scan(query, self.metric.aux(query), rows, auxes, threshold)
+
+    def _block_scores(self, query, query_aux, rows, auxes):
+        # Yields (start, similarities) for consecutive min_block_size blocks.
+        similarities = self.metric.similarities
+        block_size = self.min_block_size
+        for start in range(0, len(rows), block_size):
+            datas = [vector.data for _, vector in rows[start:start + block_size]]
+            if self.dtype in HALF_DTYPES:
+                datas = decode_rows(datas, self.dtype, self.dim)
+            yield start, similarities(query, query_aux, datas, auxes[start:start + block_size])
+
+    def _range_scan(self, query, query_aux, rows, auxes, threshold):
+        for start, scores in self._block_scores(query, query_aux, rows, auxes):
+            ids = (id for id, _ in rows[start:start + len(scores)])
+            yield from compress(zip(ids, scores), [score >= threshold for score in scores])
+
+    def search_iter(self, query_vector, filter=None, page_size=64):
+        # Yields (id, similarity) in the same order search() would return
+        # them, without materialising the full ranking. Each page is a
+        # partial selection over a fresh scan for results ranked after the
+        # last one yielded; pages double up to max(page_size,
+        # min_block_size), so memory stays bounded however far the caller
+        # reads and callers stopping early pay for one or two scans.
+        if not isinstance(query_vector, Vector):
+            raise TypeError(f"unsupported operand type(s) for search_iter: 'Index' and '{type(query_vector).__name__}'")
+
+        if not isinstance(page_size, int):
+            raise TypeError(f"page_size must be an integer, not {type(page_size).__name__}")
+
+        if page_size < 1:
+            raise ValueError(f"page_size must be >= 1, got {page_size}")
+
+        if not self.vectors:
+            return iter(())
+
+        self._check_query(query_vector)
+        rows, auxes = self._filter_rows(filter)
+        if rows is self.vectors:
+            rows, auxes = list(rows), list(auxes)
+        query = query_vector.data
+        return self._iter_pages(query, self.metric.aux(query), rows, auxes, page_size)
+
+    def _iter_pages(self, query, query_aux, rows, auxes, page_size):
+        # Ranking key is (similarity, -row): ties keep row order, as in
+        # search(), and every key is unique, so the cursor is exact.
+        max_page_size = max(page_size, self.min_block_size)
+        cursor = None
+        while True:
+            candidates = (
+                (score, -row, id)
+                for start, scores in self._block_scores(query, query_aux, rows, auxes)
+                for row, (score, (id, _)) in enumerate(zip(scores, rows[start:start + len(scores)]), start)
+                if cursor is None or (score, -row) < cursor
+            )
+            page = heapq.nlargest(page_size, candidates)
+            for score, _, id in page:
+                yield id, score
+            if len(page) < page_size:
+                return
+            cursor = page[-1][:2]
+            page_size = min(page_size * 2, max_page_size)
+
+    def _decoded(self, datas):
+        if self.dtype in HALF_DTYPES:
+            return decode_rows(datas, self.dtype, self.dim)
+        return datas
+
+    def similarity_join(self, threshold, filter=None):
+        # Yields (id_a, id_b, similarity) once for every pair of rows scoring
+        # at least threshold, id_a being the earlier row. Rows are compared
+        # tile by tile, join_block_size query rows against min_block_size
+        # candidate rows; up to num_threads tiles are in flight, so memory is
+        # bounded by the matches of those tiles.
+        if not isinstance(threshold, (int, float)):
+            raise TypeError(f"threshold must be a number, not {type(threshold).__name__}")
+
+        rows, auxes = self._filter_rows(filter)
+        if rows is self.vectors:
+            rows, auxes = list(rows), list(auxes)
+        ids = [id for id, _ in rows]
+        datas = [vector.data for _, vector in rows]
+        starts = range(0, len(rows), self.join_block_size)
+        return self._in_order(self._join_block, [(ids, datas, auxes, start, threshold) for start in starts])
+
+    def _join_block(self, ids, datas, auxes, start, threshold):
+        similarities = self.metric.similarities
+        stop = min(start + self.join_block_size, len(ids))
+        queries = self._decoded(datas[start:stop])
+        pairs = []
+        for block_start in range(start, len(ids), self.min_block_size):
+            block_stop = min(block_start + self.min_block_size, len(ids))
+            block = self._decoded(datas[block_start:block_stop])
+            for row in range(start, min(stop, block_stop - 1)):
+                first = max(row + 1, block_start)
+                scores = similarities(queries[row - start], auxes[row], block[first - block_start:],
+                                      auxes[first:block_stop])
+                matches = compress(zip(ids[first:block_stop], scores), [score >= threshold for score in scores])
+                pairs.extend((ids[row], id, score) for id, score in matches)
+        return pairs
+
+    def knn_graph(self, k, filter=None):
+        # Yields (id, neighbor_id, similarity) for the k most similar other
+        # rows of every row, row by row and most similar first. Each tile of
+        # join_block_size rows is scored as one search_batch.
+        if not isinstance(k, int):
+            raise TypeError(f"k must be an integer, not {type(k).__name__}")
+
+        if k < 1:
+            raise ValueError(f"k must be >= 1, got {k}")
+
+        rows, auxes = self._filter_rows(filter)
+        if rows is self.vectors:
+            rows, auxes = list(rows), list(auxes)
+        return self._knn_tiles(rows, auxes, k)
+
+    def _knn_tiles(self, rows, auxes, k):
+        for start in range(0, len(rows), self.join_block_size):
+            stop = start + self.join_block_size
+            queries = self._decoded([vector.data for _, vector in rows[start:stop]])
+            # One extra result makes room for the row itself.
+            results = self._scan(queries, auxes[start:stop], rows, auxes, k + 1)
+            for (id, _), neighbors in zip(rows[start:stop], results):
+                neighbors = [(other, score) for other, score in neighbors if other != id]
+                for other, score in neighbors[:k]:
+                    yield id, other, score
+
+    def _in_order(self, task, args):
+        # Runs task(*a) for each a on the executor, keeping at most
+        # num_threads results pending, and yields their items in order.
+        if self.num_threads <= 1 or len(args) <= 1:
+            for a in args:
+                yield from task(*a)
+            return
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.num_threads)
+
+        pending = deque()
+        for a in args:
+            pending.append(self._executor.submit(task, *a))
+            if len(pending) >= self.num_threads:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+    def rerank(self, query_vector, ids, top_k=None):
+        # Exact scores for a candidate list, e.g. from an approximate index.
+        # Ids that are not (or no longer) in the index are skipped.
+        if not isinstance(query_vector, Vector):
+            raise TypeError(f"unsupported operand type(s) for rerank: 'Index' and '{type(query_vector).__name__}'")
+
+        if not self.vectors:
+            return []
+
+        self._check_query(query_vector)
+        query = query_vector.data
+        query_aux = self.metric.aux(query)
+        similarity = self.metric.similarity
+        scored = []
+        for id in ids:
+            index = self.id_to_index.get(id)
+            if index is not None:
+                scored.append((id, similarity(query, query_aux, self.vectors[index][1].data, self._aux[index])))
+
+        if top_k is None:
+            top_k = len(scored)
+        return heapq.nlargest(top_k, scored, key=lambda x: x[1])
+
+    def _score_block(self, queries, query_auxes, rows, auxes, top_k):
+        similarities = self.metric.similarities
+        ids = [id for id, _ in rows]
+        datas = [vector.data for _, vector in rows]
+        if self.dtype in HALF_DTYPES:
+            return self._score_half_block(queries, query_auxes, ids, datas, auxes, top_k)
+        return [
+            heapq.nlargest(top_k, zip(ids, similarities(query, query_aux, datas, auxes)), key=lambda x: x[1])
+            for query, query_aux in zip(queries, query_auxes)
+        ]
+
+    def _score_half_block(self, queries, query_auxes, ids, datas, auxes, top_k):
+        # Decoding a whole block with one unpack is much cheaper than letting
+        # every kernel call decode its row, and bounds the upcast copies to
+        # upcast_block_size rows.
+        similarities = self.metric.similarities
+        dim = len(datas[0]) if datas else 0
+        scores = [[] for _ in queries]
+        for start in range(0, len(datas), self.upcast_block_size):
+            stop = start + self.upcast_block_size
+            block = decode_rows(datas[start:stop], self.dtype, dim)
+            for query, query_aux, query_scores in zip(queries, query_auxes, scores):
+                query_scores.extend(similarities(query, query_aux, block, auxes[start:stop]))
+        return [heapq.nlargest(top_k, zip(ids, query_scores), key=lambda x: x[1]) for query_scores in scores]
+
+    def _scan(self, queries, query_auxes, rows, auxes, top_k):
+        # Score contiguous blocks of rows in parallel, keep each block's top_k
+        # per query and merge; blocks are merged in row order so ties stay stable.
+        num_blocks = min(self.num_threads, -(-len(rows) // self.min_block_size))
+        if num_blocks <= 1:
+            return self._score_block(queries, query_auxes, rows, auxes, top_k)
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.num_threads)
+
+        block_size = -(-len(rows) // num_blocks)
+        futures = [
+            self._executor.submit(self._score_block, queries, query_auxes,
+                                  rows[start:start + block_size], auxes[start:start + block_size], top_k)
+            for start in range(0, len(rows), block_size)
+        ]
+        blocks = [future.result() for future in futures]
+        with span(self.hooks, 'select', blocks=len(blocks)):
+            return [
+                heapq.nlargest(top_k, chain.from_iterable(block[i] for block in blocks), key=lambda x: x[1])
+                for i in range(len(queries))
+            ]
 
-        similarities.sort(key=lambda x: x[1], reverse=True)
-        return similarities[:top_k]
+    def _rebuild_aux(self):
+        self._aux = [self.metric.aux(vector.data) for _, vector in self.vectors]
@@ -1,21 +1,62 @@
+import os
 import pickle
 from neuroseek.vector import Vector
+from neuroseek.distance import get_metric
+from neuroseek.filtering import AttributeStore
+from neuroseek.tracing import span
+
+
+def write_file(filename, payload, hooks=None):
+    # Shared by both index formats: the write is flushed and fsynced so a
+    # saved index survives a crash right after save returns.
+    with span(hooks, 'write', bytes=len(payload)):
+        with open(filename, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            with span(hooks, 'fsync'):
+                os.fsync(f.fileno())
+
+
+def read_file(filename, hooks=None):
+    with span(hooks, 'read'):
+        with open(filename, 'rb') as f:
+            return f.read()
+
+
+def _storable(data):
+    # Compact row types (array('f'), HalfArray) pickle as their raw bytes;
+    # memoryviews cannot be pickled at all.
+    return data.tolist() if isinstance(data, memoryview) else data
 
 
 def save_index(index, filename):
-    data = {
-        'vectors': [(id, vector.data) for id, vector in index.vectors],
-        'id_to_index': index.id_to_index,
-        '_next_id': index._next_id
-    }
-    with open(filename, 'wb') as f:
-        pickle.dump(data, f)
+    hooks = index.hooks
+    with span(hooks, 'save', filename=filename):
+        with span(hooks, 'serialize'):
+            data = {
+                'vectors': [(id, _storable(vector.data)) for id, vector in index.vectors],
+                'id_to_index': index.id_to_index,
+                '_next_id': index._next_id,
+                'metric': index.metric.name,
+                'dtype': index.dtype,
+                'dim': index.dim,
+                'attributes': index.attributes.attributes
+            }
+            payload = pickle.dumps(data)
+        write_file(filename, payload, hooks)
 
 
 def load_index(index, filename):
-    with open(filename, 'rb') as f:
-        data = pickle.load(f)
+    hooks = index.hooks
+    with span(hooks, 'load', filename=filename):
+        payload = read_file(filename, hooks)
+        with span(hooks, 'deserialize'):
+            data = pickle.loads(payload)
+        with span(hooks, 'rebuild'):
+            return _restore(index, data)
 
+
+def _restore(index, data):
     vectors = []
     for id, vector_data in data['vectors']:
         vector = Vector(len(vector_data))
@@ -25,5 +66,14 @@ def load_index(index, filename):
     index.vectors = vectors
     index.id_to_index = data['id_to_index']
     index._next_id = data['_next_id']
+    index.metric = get_metric(data.get('metric', 'cosine'))
+    index.dtype = data.get('dtype')
+    index.dim = data.get('dim', len(vectors[0][1]) if vectors else None)
+    index._rebuild_aux()
+    index._version += 1
+
+    index.attributes = AttributeStore()
+    for id, attributes in data.get('attributes', {}).items():
+        index.attributes.set(id, attributes)
 
     return index
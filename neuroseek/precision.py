@@ -0,0 +1,117 @@
+import struct
+
+
+# Storage types for index rows. float64 keeps plain Python floats, float32 an
+# array('f'); the half-precision types are packed two bytes per component and
+# decoded (upcast) to Python floats whenever a kernel reads them. Encoded
+# bytes are little-endian so snapshots are portable.
+DTYPES = ('float64', 'float32', 'float16', 'bfloat16')
+HALF_DTYPES = ('float16', 'bfloat16')
+
+# Largest finite magnitude of each half-precision type.
+_MAX = {'float16': 65504.0, 'bfloat16': 3.3895313892515355e38}
+
+
+def check_dtype(dtype):
+    if dtype is not None and dtype not in DTYPES:
+        raise ValueError(f"Unknown dtype {dtype!r}, expected one of {DTYPES}")
+
+
+def _out_of_range(values, dtype):
+    value = max(values, key=abs)
+    return ValueError(f"{value!r} is out of range for {dtype}, whose largest finite magnitude is {_MAX[dtype]:g}")
+
+
+def encode(values, dtype):
+    values = list(values)
+    n = len(values)
+    try:
+        if dtype == 'float16':
+            return struct.pack(f'<{n}e', *values)
+        if dtype == 'bfloat16':
+            # bfloat16 is the upper half of a float32; round to nearest even.
+            words = struct.unpack(f'<{n}I', struct.pack(f'<{n}f', *values))
+            halves = [(word + 0x7FFF + ((word >> 16) & 1)) >> 16 for word in words]
+            # Finite float32 values just below the float32 maximum round up
+            # to infinity.
+            for word, half in zip(words, halves):
+                if half & 0x7FFF == 0x7F80 and word & 0x7FFFFFFF != 0x7F800000:
+                    raise _out_of_range(values, dtype)
+            return struct.pack(f'<{n}H', *halves)
+    except OverflowError:
+        raise _out_of_range(values, dtype) from None
+    raise ValueError(f"{dtype!r} is not a half-precision dtype")
+
+
+def decode(data, dtype):
+    n = len(data) // 2
+    if dtype == 'float16':
+        return struct.unpack(f'<{n}e', data)
+    if dtype == 'bfloat16':
+        widened = bytearray(4 * n)
+        widened[2::4] = data[0::2]
+        widened[3::4] = data[1::2]
+        return struct.unpack(f'<{n}f', widened)
+    raise ValueError(f"{dtype!r} is not a half-precision dtype")
+
+
+def decode_rows(arrays, dtype, dim):
+    # Upcasts a block of HalfArrays with a single unpack.
+    flat = decode(b''.join(array.buffer for array in arrays), dtype)
+    return [flat[start:start + dim] for start in range(0, len(flat), dim)]
+
+
+class HalfArray:
+    # Fixed-length sequence of float16 or bfloat16 values. Slots keep the
+    # per-row overhead to the bytearray itself.
+    __slots__ = ('dtype', 'buffer')
+
+    def __init__(self, values=(), dtype='float16'):
+        if dtype not in HALF_DTYPES:
+            raise ValueError(f"{dtype!r} is not a half-precision dtype")
+        self.dtype = dtype
+        self.buffer = bytearray(encode(values, dtype))
+
+    @classmethod
+    def frombytes(cls, data, dtype='float16'):
+        if len(data) % 2:
+            raise ValueError(f"Half-precision data must have an even length, got {len(data)}")
+        array = cls((), dtype)
+        array.buffer = bytearray(data)
+        return array
+
+    def tobytes(self):
+        return bytes(self.buffer)
+
+    def tolist(self):
+        return list(decode(self.buffer, self.dtype))
+
+    def __len__(self):
+        return len(self.buffer) // 2
+
+    def __iter__(self):
+        return iter(decode(self.buffer, self.dtype))
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.tolist()[index]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(f"index {index} out of range")
+        return decode(self.buffer[2 * index:2 * index + 2], self.dtype)[0]
+
+    def __setitem__(self, index, value):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(f"index {index} out of range")
+        self.buffer[2 * index:2 * index + 2] = encode([value], self.dtype)
+
+    def __eq__(self, other):
+        if isinstance(other, HalfArray):
+            return self.dtype == other.dtype and self.buffer == other.buffer
+        return NotImplemented
+
+    def __repr__(self):
+        return f"HalfArray({self.tolist()}, dtype={self.dtype!r})"
@@ -0,0 +1,250 @@
+import os
+import socket
+import socketserver
+import struct
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from neuroseek.vector import Vector
+from neuroseek.hnsw_index import HNSWIndex
+
+
+# Wire format: every frame is a (payload length, code) header followed by the
+# payload. Requests carry an opcode, responses a status. Integers and floats
+# are big-endian; vectors are a uint16 dimension followed by float64 values.
+OP_SEARCH = 1  # uint32 top_k, vector
+OP_SEARCH_BATCH = 2  # uint32 top_k, uint32 count, count vectors
+OP_ADD = 3  # uint8 has_id, int64 id, vector
+OP_DELETE = 4  # int64 id
+
+STATUS_OK = 0
+STATUS_VALUE_ERROR = 1
+STATUS_TYPE_ERROR = 2
+STATUS_ERROR = 3
+
+# Largest request payload a server reads. The length comes from the client,
+# so it is checked before anything is allocated.
+MAX_FRAME_SIZE = 64 * 1024 * 1024
+
+_HEADER = struct.Struct('!IB')
+_UINT32 = struct.Struct('!I')
+_INT64 = struct.Struct('!q')
+_DIM = struct.Struct('!H')
+_RESULT = struct.Struct('!qd')
+_ADD = struct.Struct('!Bq')
+
+
+def _pack_vector(vector):
+    return _DIM.pack(len(vector.data)) + struct.pack(f'!{len(vector.data)}d', *vector.data)
+
+
+def _unpack_vector(payload, offset):
+    dim, = _DIM.unpack_from(payload, offset)
+    offset += _DIM.size
+    vector = Vector(dim)
+    vector.data = list(struct.unpack_from(f'!{dim}d', payload, offset))
+    return vector, offset + 8 * dim
+
+
+def _pack_results(results):
+    return _UINT32.pack(len(results)) + b''.join(_RESULT.pack(id, score) for id, score in results)
+
+
+def _unpack_results(payload, offset):
+    count, = _UINT32.unpack_from(payload, offset)
+    offset += _UINT32.size
+    results = [_RESULT.unpack_from(payload, offset + i * _RESULT.size) for i in range(count)]
+    return results, offset + count * _RESULT.size
+
+
+def _recv_exact(stream, size):
+    data = stream.read(size)
+    if len(data) < size:
+        raise EOFError("connection closed")
+    return data
+
+
+def _read_frame(stream, max_length=None):
+    length, code = _HEADER.unpack(_recv_exact(stream, _HEADER.size))
+    if max_length is not None and length > max_length:
+        raise ValueError(f"Frame of {length} bytes exceeds the maximum of {max_length} bytes")
+    return code, _recv_exact(stream, length)
+
+
+def _write_frame(stream, code, payload):
+    stream.write(_HEADER.pack(len(payload), code) + payload)
+    stream.flush()
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    # One handler thread per connection; it serves frames until the client
+    # hangs up, handing each request to the server's worker pool.
+    def handle(self):
+        while True:
+            try:
+                op, payload = _read_frame(self.rfile, self.server.max_frame_size)
+            except (EOFError, ConnectionError):
+                return
+            except ValueError as e:
+                # The payload is left unread, so the stream cannot be
+                # resynchronised: report the error and hang up.
+                try:
+                    _write_frame(self.wfile, STATUS_VALUE_ERROR, str(e).encode())
+                except ConnectionError:
+                    pass
+                return
+
+            try:
+                status, response = STATUS_OK, self.server.execute(op, payload)
+            except ValueError as e:
+                status, response = STATUS_VALUE_ERROR, str(e).encode()
+            except TypeError as e:
+                status, response = STATUS_TYPE_ERROR, str(e).encode()
+            except Exception as e:
+                status, response = STATUS_ERROR, f"{type(e).__name__}: {e}".encode()
+
+            try:
+                _write_frame(self.wfile, status, response)
+            except ConnectionError:
+                return
+
+
+class _IndexServerMixin:
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def _setup(self, index, num_workers, max_frame_size):
+        if num_workers is None:
+            num_workers = os.cpu_count() or 1
+        self.index = index
+        self.num_workers = num_workers
+        self.max_frame_size = max_frame_size
+        # Connections get a thread each (ThreadingMixIn), so idle keep-alive
+        # clients cost nothing; num_workers bounds the requests executing at
+        # once, across all connections.
+        self._pool = ThreadPoolExecutor(max_workers=num_workers)
+        # Writes are serialised. HNSWIndex allows searches alongside a writer;
+        # the flat Index shifts rows on delete, so its searches take the lock too.
+        self._write_lock = threading.Lock()
+        self._lock_reads = not isinstance(index, HNSWIndex)
+
+    def execute(self, op, payload):
+        return self._pool.submit(self.dispatch, op, payload).result()
+
+    def server_close(self):
+        super().server_close()
+        self._pool.shutdown(wait=False)
+
+    def _read(self, function, *args):
+        if self._lock_reads:
+            with self._write_lock:
+                return function(*args)
+        return function(*args)
+
+    def dispatch(self, op, payload):
+        if op == OP_SEARCH:
+            top_k, = _UINT32.unpack_from(payload, 0)
+            query, _ = _unpack_vector(payload, _UINT32.size)
+            return _pack_results(self._read(self.index.search, query, top_k))
+
+        if op == OP_SEARCH_BATCH:
+            top_k, count = struct.unpack_from('!II', payload, 0)
+            offset = 8
+            queries = []
+            for _ in range(count):
+                query, offset = _unpack_vector(payload, offset)
+                queries.append(query)
+            batch = self._read(self.index.search_batch, queries, top_k)
+            return _UINT32.pack(len(batch)) + b''.join(_pack_results(results) for results in batch)
+
+        if op == OP_ADD:
+            has_id, id = _ADD.unpack_from(payload, 0)
+            vector, _ = _unpack_vector(payload, _ADD.size)
+            with self._write_lock:
+                id = self.index.add_vector(vector, id if has_id else None)
+            return _INT64.pack(id)
+
+        if op == OP_DELETE:
+            id, = _INT64.unpack_from(payload, 0)
+            with self._write_lock:
+                self.index.delete_vector(id)
+            return b''
+
+        raise ValueError(f"Unknown opcode {op}")
+
+
+class IndexServer(_IndexServerMixin, socketserver.ThreadingMixIn, socketserver.TCPServer):
+    def __init__(self, index, address, num_workers=None, max_frame_size=MAX_FRAME_SIZE):
+        self._setup(index, num_workers, max_frame_size)
+        super().__init__(address, _RequestHandler)
+
+
+class UnixIndexServer(_IndexServerMixin, socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    def __init__(self, index, path, num_workers=None, max_frame_size=MAX_FRAME_SIZE):
+        self._setup(index, num_workers, max_frame_size)
+        super().__init__(path, _RequestHandler)
+
+
+def make_server(index, address, num_workers=None, max_frame_size=MAX_FRAME_SIZE):
+    # A str address is a Unix socket path, a (host, port) tuple is TCP.
+    if isinstance(address, str):
+        return UnixIndexServer(index, address, num_workers, max_frame_size)
+    return IndexServer(index, address, num_workers, max_frame_size)
+
+
+class Client:
+    def __init__(self, address):
+        if isinstance(address, str):
+            self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        else:
+            self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self._socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._socket.connect(address)
+        self._rfile = self._socket.makefile('rb')
+        self._wfile = self._socket.makefile('wb')
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        self._rfile.close()
+        self._wfile.close()
+        self._socket.close()
+
+    def _request(self, op, payload):
+        with self._lock:
+            _write_frame(self._wfile, op, payload)
+            status, response = _read_frame(self._rfile)
+        if status == STATUS_VALUE_ERROR:
+            raise ValueError(response.decode())
+        if status == STATUS_TYPE_ERROR:
+            raise TypeError(response.decode())
+        if status != STATUS_OK:
+            raise RuntimeError(response.decode())
+        return response
+
+    def search(self, query, top_k=5):
+        response = self._request(OP_SEARCH, _UINT32.pack(top_k) + _pack_vector(query))
+        return _unpack_results(response, 0)[0]
+
+    def search_batch(self, queries, top_k=5):
+        queries = list(queries)
+        payload = struct.pack('!II', top_k, len(queries)) + b''.join(_pack_vector(query) for query in queries)
+        response = self._request(OP_SEARCH_BATCH, payload)
+        count, = _UINT32.unpack_from(response, 0)
+        offset = _UINT32.size
+        batch = []
+        for _ in range(count):
+            results, offset = _unpack_results(response, offset)
+            batch.append(results)
+        return batch
+
+    def add_vector(self, vector, id=None):
+        payload = _ADD.pack(id is not None, id if id is not None else 0) + _pack_vector(vector)
+        return _INT64.unpack(self._request(OP_ADD, payload))[0]
+
+    def delete_vector(self, id):
+        self._request(OP_DELETE, _INT64.pack(id))
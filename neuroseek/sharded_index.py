@@ -0,0 +1,216 @@
+import heapq
+import multiprocessing
+import threading
+from bisect import bisect_right
+from itertools import chain
+from neuroseek.vector import Vector
+from neuroseek.index import Index
+from neuroseek.hnsw_index import HNSWIndex
+
+
+_INDEX_KINDS = {
+    'flat': Index,
+    'hnsw': HNSWIndex,
+}
+
+
+def _serve_shard(conn, kind, index_kwargs):
+    # Worker process loop: one index per process, one request per message.
+    index = _INDEX_KINDS[kind](**index_kwargs)
+    while True:
+        try:
+            request = conn.recv()
+        except EOFError:
+            break
+        if request is None:
+            break
+
+        method, args, kwargs = request
+        try:
+            if method == '__len__':
+                result = len(index)
+            else:
+                result = getattr(index, method)(*args, **kwargs)
+            conn.send((True, result))
+        except Exception as e:
+            conn.send((False, e))
+
+    conn.close()
+
+
+class ShardedIndex:
+    def __init__(self, num_shards=None, kind='flat', partition='hash', boundaries=None, **index_kwargs):
+        if num_shards is None:
+            num_shards = multiprocessing.cpu_count()
+        if not isinstance(num_shards, int):
+            raise TypeError(f"num_shards must be an int, not {type(num_shards).__name__}")
+        if num_shards < 1:
+            raise ValueError(f"num_shards must be >= 1, got {num_shards}")
+
+        if kind not in _INDEX_KINDS:
+            raise ValueError(f"Unknown index kind {kind!r}, expected one of {', '.join(_INDEX_KINDS)}")
+
+        if partition == 'hash':
+            if boundaries is not None:
+                raise ValueError("boundaries are only used with partition='range'")
+        elif partition == 'range':
+            # boundaries[i] is the first id of shard i + 1.
+            if boundaries is None or len(boundaries) != num_shards - 1:
+                raise ValueError(f"partition='range' needs {num_shards - 1} boundaries")
+            if list(boundaries) != sorted(boundaries):
+                raise ValueError("boundaries must be sorted")
+        else:
+            raise ValueError(f"Unknown partition {partition!r}, expected 'hash' or 'range'")
+
+        self.num_shards = num_shards
+        self.kind = kind
+        self.partition = partition
+        self.boundaries = list(boundaries) if boundaries is not None else None
+        self._next_id = 0
+
+        self._conns = []
+        self._locks = []
+        self._processes = []
+        for _ in range(num_shards):
+            parent_conn, child_conn = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=_serve_shard, args=(child_conn, kind, index_kwargs), daemon=True)
+            process.start()
+            child_conn.close()
+            self._conns.append(parent_conn)
+            self._locks.append(threading.Lock())
+            self._processes.append(process)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        for conn, lock in zip(self._conns, self._locks):
+            with lock:
+                try:
+                    conn.send(None)
+                except (BrokenPipeError, OSError):
+                    pass
+                conn.close()
+        for process in self._processes:
+            process.join()
+        self._conns = []
+        self._processes = []
+
+    def _shard_for(self, id):
+        if self.partition == 'range':
+            return bisect_right(self.boundaries, id)
+        return hash(id) % self.num_shards
+
+    def _receive(self, shard):
+        ok, result = self._conns[shard].recv()
+        if not ok:
+            raise result
+        return result
+
+    def _call(self, shard, method, *args, **kwargs):
+        if not self._conns:
+            raise ValueError("ShardedIndex is closed")
+        with self._locks[shard]:
+            self._conns[shard].send((method, args, kwargs))
+            return self._receive(shard)
+
+    def _call_each(self, shards, method, args_for, kwargs):
+        # Send to every shard before receiving from any, so the shards work
+        # in parallel. Locks are taken in shard order to avoid deadlock.
+        if not self._conns:
+            raise ValueError("ShardedIndex is closed")
+        shards = sorted(shards)
+        for shard in shards:
+            self._locks[shard].acquire()
+        try:
+            for shard in shards:
+                self._conns[shard].send((method, args_for(shard), kwargs))
+            return {shard: self._conns[shard].recv() for shard in shards}
+        finally:
+            for shard in shards:
+                self._locks[shard].release()
+
+    def _call_all(self, shards, method, args_for, kwargs):
+        outcomes = self._call_each(shards, method, args_for, kwargs)
+        for shard in sorted(outcomes):
+            ok, result = outcomes[shard]
+            if not ok:
+                raise result
+        return {shard: result for shard, (ok, result) in outcomes.items()}
+
+    def __len__(self):
+        return sum(self._call_all(range(self.num_shards), '__len__', lambda shard: (), {}).values())
+
+    def add_vector(self, vector, id=None):
+        if not isinstance(vector, Vector):
+            raise TypeError(f"vector must be a Vector, not {type(vector).__name__}")
+
+        auto_id = id is None
+        if auto_id:
+            id = self._next_id
+
+        if not isinstance(id, int):
+            raise TypeError(f"id must be an int, not {type(id).__name__}")
+
+        result = self._call(self._shard_for(id), 'add_vector', vector, id)
+        if auto_id:
+            self._next_id += 1
+        return result
+
+    def add_vectors(self, vectors, ids=None):
+        vectors = list(vectors)
+        auto_ids = ids is None
+        if auto_ids:
+            ids = list(range(self._next_id, self._next_id + len(vectors)))
+        else:
+            ids = list(ids)
+
+        if len(ids) != len(vectors):
+            raise ValueError("vectors and ids must have the same length")
+
+        batches = {}
+        for vector, id in zip(vectors, ids):
+            if not isinstance(vector, Vector):
+                raise TypeError(f"vector must be a Vector, not {type(vector).__name__}")
+            if not isinstance(id, int):
+                raise TypeError(f"id must be an int, not {type(id).__name__}")
+            batches.setdefault(self._shard_for(id), []).append((vector, id))
+
+        if len(set(ids)) != len(ids):
+            raise ValueError("ids must be unique")
+
+        # Each shard adds its part atomically; if any shard rejects its part,
+        # remove the parts the other shards already accepted.
+        outcomes = self._call_each(batches, 'add_vectors', lambda shard: ([v for v, _ in batches[shard]], [id for _, id in batches[shard]]), {})
+        errors = [result for shard, (ok, result) in sorted(outcomes.items()) if not ok]
+        if errors:
+            accepted = [shard for shard, (ok, _) in outcomes.items() if ok]
+            self._call_all(accepted, 'delete_vectors', lambda shard: ([id for _, id in batches[shard]],), {})
+            raise errors[0]
+
+        if auto_ids:
+            self._next_id += len(vectors)
+        return ids
+
+    def get_vector(self, id):
+        if not isinstance(id, int):
+            raise TypeError(f"id must be an int, not {type(id).__name__}")
+        return self._call(self._shard_for(id), 'get_vector', id)
+
+    def delete_vector(self, id):
+        if not isinstance(id, int):
+            raise TypeError(f"id must be an int, not {type(id).__name__}")
+        return self._call(self._shard_for(id), 'delete_vector', id)
+
+    def search(self, query, top_k=5, **kwargs):
+        if not isinstance(query, Vector):
+            raise TypeError(f"query must be a Vector, not {type(query).__name__}")
+
+        if not isinstance(top_k, int):
+            raise TypeError(f"top_k must be an int, not {type(top_k).__name__}")
+
+        results = self._call_all(range(self.num_shards), 'search', lambda shard: (query, top_k), kwargs)
+        return heapq.nlargest(top_k, chain.from_iterable(results[shard] for shard in sorted(results)), key=lambda x: x[1])
@@ -0,0 +1,80 @@
+import threading
+
+
+class SearchStats:
+    # Work done by a single search. hops maps layer -> nodes expanded there.
+    def __init__(self):
+        self.distance_evaluations = 0
+        self.visited_nodes = 0
+        self.heap_operations = 0
+        self.hops = {}
+        self.brute_force = False
+        self.early_stopped = False  # stopped by patience or time_budget
+
+    def add_layer(self, layer, distance_evaluations, visited_nodes, expansions, heap_operations):
+        self.distance_evaluations += distance_evaluations
+        self.visited_nodes += visited_nodes
+        self.heap_operations += heap_operations
+        self.hops[layer] = self.hops.get(layer, 0) + expansions
+
+    def __repr__(self):
+        return (f"SearchStats(distance_evaluations={self.distance_evaluations}, "
+                f"visited_nodes={self.visited_nodes}, heap_operations={self.heap_operations}, "
+                f"hops={self.hops}, brute_force={self.brute_force}, early_stopped={self.early_stopped})")
+
+
+class IndexMetrics:
+    # Cumulative counters over every recorded search; safe to update from
+    # concurrent searches.
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.searches = 0
+            self.brute_force_searches = 0
+            self.early_stopped_searches = 0
+            self.distance_evaluations = 0
+            self.visited_nodes = 0
+            self.heap_operations = 0
+            self.hops = {}
+
+    def record(self, stats):
+        with self._lock:
+            self.searches += 1
+            self.brute_force_searches += stats.brute_force
+            self.early_stopped_searches += stats.early_stopped
+            self.distance_evaluations += stats.distance_evaluations
+            self.visited_nodes += stats.visited_nodes
+            self.heap_operations += stats.heap_operations
+            for layer, hops in stats.hops.items():
+                self.hops[layer] = self.hops.get(layer, 0) + hops
+
+    def to_prometheus(self, prefix='neuroseek', labels=None):
+        # Prometheus text exposition format (version 0.0.4).
+        label_text = ','.join(f'{key}="{value}"' for key, value in sorted((labels or {}).items()))
+
+        def sample(name, value, extra=''):
+            inner = ','.join(part for part in (label_text, extra) if part)
+            return f"{prefix}_{name}{{{inner}}} {value}" if inner else f"{prefix}_{name} {value}"
+
+        with self._lock:
+            lines = []
+            for name, help_text, value in (
+                ('searches_total', 'Searches recorded.', self.searches),
+                ('brute_force_searches_total', 'Searches answered by scanning filtered ids.', self.brute_force_searches),
+                ('early_stopped_searches_total', 'Searches cut short by patience or time_budget.', self.early_stopped_searches),
+                ('distance_evaluations_total', 'Distance function evaluations.', self.distance_evaluations),
+                ('visited_nodes_total', 'Graph nodes visited.', self.visited_nodes),
+                ('heap_operations_total', 'Candidate and result heap pushes and pops.', self.heap_operations),
+            ):
+                lines.append(f"# HELP {prefix}_{name} {help_text}")
+                lines.append(f"# TYPE {prefix}_{name} counter")
+                lines.append(sample(name, value))
+
+            lines.append(f"# HELP {prefix}_hops_total Nodes expanded, by graph layer.")
+            lines.append(f"# TYPE {prefix}_hops_total counter")
+            for layer in sorted(self.hops):
+                lines.append(sample('hops_total', self.hops[layer], f'layer="{layer}"'))
+        return '\n'.join(lines) + '\n'
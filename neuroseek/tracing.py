@@ -0,0 +1,87 @@
+import threading
+import time
+
+
+# A hook is any callable taking a finished Span. Indexes keep their hooks in
+# a plain list; span() hands back a shared no-op context manager when that
+# list is empty, so untraced calls pay for one truth test and a bare `with`.
+
+_local = threading.local()
+
+
+class Span:
+    def __init__(self, hooks, name, attributes):
+        self.hooks = hooks
+        self.name = name
+        self.attributes = attributes
+        self.parent = None
+        self.start = None
+        self.end = None
+
+    @property
+    def duration(self):
+        return self.end - self.start
+
+    def __enter__(self):
+        stack = getattr(_local, 'stack', None)
+        if stack is None:
+            stack = _local.stack = []
+        self.parent = stack[-1] if stack else None
+        stack.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.end = time.perf_counter()
+        _local.stack.pop()
+        if exc_type is not None:
+            self.attributes['error'] = exc_type.__name__
+        for hook in list(self.hooks):
+            hook(self)
+        return False
+
+    def __repr__(self):
+        duration = f"{self.duration * 1000:.3f}ms" if self.end is not None else "open"
+        return f"Span({self.name!r}, {duration}, {self.attributes})"
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(hooks, name, **attributes):
+    if not hooks:
+        return _NULL_SPAN
+    return Span(hooks, name, attributes)
+
+
+class SpanRecorder:
+    # Ready-made hook that keeps finished spans, e.g. for tests or ad hoc
+    # profiling: index.add_hook(recorder); ...; recorder.totals()
+    def __init__(self):
+        self.spans = []
+        self._lock = threading.Lock()
+
+    def __call__(self, span):
+        with self._lock:
+            self.spans.append(span)
+
+    def names(self):
+        return [span.name for span in self.spans]
+
+    def totals(self):
+        totals = {}
+        for span in self.spans:
+            totals[span.name] = totals.get(span.name, 0.0) + span.duration
+        return totals
+
+    def clear(self):
+        with self._lock:
+            self.spans = []
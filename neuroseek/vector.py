@@ -1,8 +1,143 @@
+import math
+import struct
+import sys
+from array import array
+import operator
+from neuroseek.distance import _dot
+from neuroseek.precision import HalfArray, check_dtype
+
+
+# Buffer formats a Vector can wrap: float32, float64 and float16.
+_FLOAT_FORMATS = ('f', 'd', 'e')
+
+
+def _native_format(format):
+    if format[:1] in ('@', '='):
+        return format[1:]
+    if format[:1] in ('<', '>'):
+        if format[0] != ('<' if sys.byteorder == 'little' else '>'):
+            raise ValueError(f"buffer format {format!r} is not in native byte order")
+        return format[1:]
+    return format
+
+
+def _indexable(view):
+    try:
+        view[:1].tolist()
+    except NotImplementedError:
+        return False
+    return True
+
+
 class Vector:
     def __init__(self, size):
         self.size = size
         self.data = [0] * size
 
+    @classmethod
+    def from_buffer(cls, buffer, format=None):
+        # Wraps any buffer-protocol object (array.array, bytearray, mmap,
+        # NumPy array, memoryview) without copying: reads and writes go
+        # through to the buffer, which must outlive the Vector. format
+        # reinterprets the raw bytes, e.g. 'f' for float32 embeddings
+        # received as bytes.
+        view = memoryview(buffer)
+        if view.ndim != 1:
+            raise ValueError(f"buffer must be one-dimensional, got {view.ndim} dimensions")
+
+        format = _native_format(format or view.format)
+        if format not in _FLOAT_FORMATS:
+            raise ValueError(f"unsupported buffer format {format!r}, expected one of {_FLOAT_FORMATS}")
+
+        if view.format != format:
+            if not view.c_contiguous:
+                raise ValueError(f"buffer must be contiguous to be read as {format!r}")
+            view = view.cast('B')
+            itemsize = struct.calcsize(format)
+            if len(view) % itemsize:
+                raise ValueError(f"buffer size {len(view)} is not a multiple of {itemsize}")
+            try:
+                view = view.cast(format)
+            except ValueError:
+                # memoryview cannot view float16 before Python 3.12, so
+                # those buffers are decoded into a list instead.
+                view = list(struct.unpack(f'{len(view) // itemsize}{format}', view))
+        elif format == 'e' and not _indexable(view):
+            # Same for buffers that export float16 themselves (NumPy).
+            view = list(struct.unpack(f'{len(view)}e', view.tobytes()))
+
+        vector = cls.__new__(cls)
+        vector.size = len(view)
+        vector.data = view
+        return vector
+
+    @classmethod
+    def from_bytes(cls, data, format='f'):
+        # bytes are immutable, so the resulting Vector is read-only; pass a
+        # bytearray for a writable one.
+        if not isinstance(data, (bytes, bytearray, memoryview)):
+            raise TypeError(f"from_bytes() expects bytes, not {type(data).__name__}")
+        return cls.from_buffer(data, format)
+
+    @classmethod
+    def from_numpy(cls, array):
+        # Shares memory with a 1-D floating-point array; strided arrays of
+        # a native float dtype are viewed as-is. NumPy itself is not needed.
+        if not hasattr(array, '__array_interface__'):
+            raise TypeError(f"from_numpy() expects a NumPy array, not {type(array).__name__}")
+        if array.ndim != 1:
+            raise ValueError(f"array must be one-dimensional, got {array.ndim} dimensions")
+        if array.dtype.kind != 'f':
+            raise TypeError(f"array must have a floating-point dtype, not {array.dtype}")
+        return cls.from_buffer(array)
+
+    def to_numpy(self):
+        # A view of the underlying buffer for Vectors built with from_buffer
+        # and friends; list-backed Vectors are copied into a float64 array.
+        try:
+            import numpy
+        except ImportError:
+            raise ImportError("to_numpy() requires NumPy to be installed") from None
+        if isinstance(self.data, memoryview):
+            return numpy.asarray(self.data)
+        return numpy.array(self.data, dtype=numpy.float64)
+
+    def astype(self, dtype):
+        # Copy with compact storage: float32 is an array('f'), float16 and
+        # bfloat16 pack two bytes per component (see neuroseek.precision).
+        check_dtype(dtype)
+        if dtype == 'float64':
+            data = [float(value) for value in self.data]
+        elif dtype == 'float32':
+            data = array('f', self.data)
+        else:
+            data = HalfArray(self.data, dtype)
+        vector = Vector(0)
+        vector.size = len(data)
+        vector.data = data
+        return vector
+
+    def copy(self):
+        # Independent copy in the same storage; buffer views become lists.
+        data = self.data
+        if isinstance(data, array):
+            data = array(data.typecode, data)
+        elif isinstance(data, HalfArray):
+            data = HalfArray.frombytes(data.buffer, data.dtype)
+        else:
+            data = list(data)
+        vector = Vector(0)
+        vector.size = len(data)
+        vector.data = data
+        return vector
+
+    def __getstate__(self):
+        # memoryviews cannot be pickled; buffer-backed Vectors pickle as lists.
+        state = self.__dict__.copy()
+        if isinstance(self.data, memoryview):
+            state['data'] = self.data.tolist()
+        return state
+
     def __getitem__(self, index):
         if not isinstance(index, int):
             raise TypeError(f"indices must be integers, not {type(index).__name__}")
@@ -21,62 +156,98 @@ class Vector:
         return self.size
 
     def __repr__(self):
-        return f"{self.data}"
+        return f"{list(self.data)}"
 
-    def __add__(self, other):
+    def _result(self, values, out):
+        # Writes into out's existing storage when given, else a new Vector.
+        if out is None:
+            result = Vector(0)
+            result.size = len(self)
+            result.data = list(values)
+            return result
+        if not isinstance(out, Vector):
+            raise TypeError(f"out must be a Vector, not {type(out).__name__}")
+        if len(out) != len(self):
+            raise ValueError(f"out has size {len(out)}, expected {len(self)}")
+        if isinstance(out.data, list):
+            out.data[:] = values
+        else:
+            for i, value in enumerate(values):
+                out.data[i] = value
+        return out
+
+    def add(self, other, out=None):
         if not isinstance(other, Vector):
             raise TypeError(f"unsupported operand type(s) for +: 'Vector' and '{type(other).__name__}'")
         if len(self) != len(other):
             raise ValueError("Vectors must be of the same size to be added.")
-        result = Vector(len(self))
-        for i in range(len(self)):
-            result.data[i] = self.data[i] + other.data[i]
-        return result
+        return self._result(map(operator.add, self.data, other.data), out)
 
-    def __sub__(self, other):
+    def sub(self, other, out=None):
         if not isinstance(other, Vector):
             raise TypeError(f"unsupported operand type(s) for -: 'Vector' and '{type(other).__name__}'")
         if len(self) != len(other):
             raise ValueError("Vectors must be of the same size to be subtracted.")
-        result = Vector(len(self))
-        for i in range(len(self)):
-            result.data[i] = self.data[i] - other.data[i]
-        return result
+        return self._result(map(operator.sub, self.data, other.data), out)
 
-    def __mul__(self, other):
+    def mul(self, other, out=None):
         if isinstance(other, (int, float)):
-            result = Vector(len(self))
-            for i in range(len(self)):
-                result.data[i] = self.data[i] * other
-            return result
+            return self._result([value * other for value in self.data], out)
         elif isinstance(other, Vector):
             if len(self) != len(other):
                 raise ValueError("Vectors must be of the same size to be multiplied.")
-            result = Vector(len(self))
-            for i in range(len(self)):
-                result.data[i] = self.data[i] * other.data[i]
-            return result
+            return self._result(map(operator.mul, self.data, other.data), out)
         else:
             raise TypeError(f"unsupported operand type(s) for *: 'Vector' and '{type(other).__name__}'")
 
+    def neg(self, out=None):
+        return self._result([-value for value in self.data], out)
+
+    def axpy(self, alpha, other):
+        # self += alpha * other, in place and without a temporary Vector.
+        if not isinstance(alpha, (int, float)):
+            raise TypeError(f"alpha must be a number, not {type(alpha).__name__}")
+        if not isinstance(other, Vector):
+            raise TypeError(f"unsupported operand type(s) for axpy: 'Vector' and '{type(other).__name__}'")
+        if len(self) != len(other):
+            raise ValueError("Vectors must be of the same size for axpy.")
+        return self._result([value + alpha * x for value, x in zip(self.data, other.data)], self)
+
+    def __add__(self, other):
+        return self.add(other)
+
+    def __sub__(self, other):
+        return self.sub(other)
+
+    def __mul__(self, other):
+        return self.mul(other)
+
+    def __neg__(self):
+        return self.neg()
+
+    # The in-place operators update self.data where it lives, so views
+    # (VectorBatch rows, buffers from from_buffer) see the change.
+    def __iadd__(self, other):
+        return self.add(other, out=self)
+
+    def __isub__(self, other):
+        return self.sub(other, out=self)
+
+    def __imul__(self, other):
+        return self.mul(other, out=self)
+
     def dot(self, other):
         if not isinstance(other, Vector):
             raise TypeError(f"unsupported operand type(s) for dot product: 'Vector' and '{type(other).__name__}'")
         if len(self) != len(other):
             raise ValueError("Vectors must be the same size to apply dot product on them.")
-        result = 0
-        for i in range(len(self)):
-            result += self.data[i] * other.data[i]
-        return result
+        return _dot(self.data, other.data)
 
     def __matmul__(self, other):
         return self.dot(other)
 
     def norm(self):
-        result = 0
-        for i in range(len(self)):
-            result += self.data[i] ** 2
-        return result ** 0.5
+        return _dot(self.data, self.data) ** 0.5
 
     def __eq__(self, other):
         if not isinstance(other, Vector):
@@ -88,12 +259,6 @@ class Vector:
                 return False
         return True
 
-    def __neg__(self):
-        result = Vector(len(self))
-        for i in range(len(self)):
-            result.data[i] = -self.data[i]
-        return result
-
     def __iter__(self):
         return iter(self.data)
 
@@ -107,9 +272,187 @@ class Vector:
             raise TypeError(f"unsupported operand type(s) for cosine_similarity: 'Vector' and '{type(other).__name__}'")
         if len(self) != len(other):
             raise ValueError("Vectors must be the same size to apply cosine similarity on them.")
-        dot_product = self.dot(other)
+        # Types and sizes were checked above; go straight to the kernel.
+        dot_product = _dot(self.data, other.data)
         norm_self = self.norm()
         norm_other = other.norm()
         if norm_self == 0 or norm_other == 0:
             raise ValueError("Cosine similarity is not defined for zero-length vectors.")
         return dot_product / (norm_self * norm_other)
+
+
+class VectorBatch:
+    # An (n, d) matrix stored as a list of row lists. Operations work a
+    # whole row at a time through map() instead of per-element indexing, and
+    # the in-place operators rewrite rows without allocating Vectors.
+    def __init__(self, rows, dim=None):
+        self.rows = []
+        for row in rows:
+            if isinstance(row, Vector):
+                row = row.data
+            self.rows.append(list(row))
+
+        if dim is None:
+            if not self.rows:
+                raise ValueError("dim must be given for an empty VectorBatch")
+            dim = len(self.rows[0])
+        for row in self.rows:
+            if len(row) != dim:
+                raise ValueError(f"All rows must have dimension {dim}, got {len(row)}")
+        self.dim = dim
+
+    @classmethod
+    def zeros(cls, n, dim):
+        return cls(([0.0] * dim for _ in range(n)), dim)
+
+    @property
+    def shape(self):
+        return (len(self.rows), self.dim)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __getitem__(self, index):
+        # The returned Vector shares the row, so writes show up in the batch.
+        if not isinstance(index, int):
+            raise TypeError(f"indices must be integers, not {type(index).__name__}")
+        row = self.rows[index]
+        vector = Vector(0)
+        vector.size = len(row)
+        vector.data = row
+        return vector
+
+    def __iter__(self):
+        for i in range(len(self.rows)):
+            yield self[i]
+
+    def __repr__(self):
+        return f"VectorBatch({self.rows})"
+
+    def __eq__(self, other):
+        if not isinstance(other, VectorBatch):
+            raise TypeError(f"unsupported operand type(s) for ==: 'VectorBatch' and '{type(other).__name__}'")
+        return self.rows == other.rows
+
+    def to_vectors(self):
+        return [vector for vector in self]
+
+    def copy(self):
+        return VectorBatch(self.rows, self.dim)
+
+    def _operands(self, other, symbol):
+        # Right-hand rows for an elementwise op: numbers and Vectors are
+        # broadcast to every row, batches are matched row by row.
+        if isinstance(other, (int, float)):
+            return None, other
+        if isinstance(other, Vector):
+            if len(other) != self.dim:
+                raise ValueError(f"Vector of size {len(other)} cannot be broadcast over rows of size {self.dim}")
+            return [other.data] * len(self.rows), None
+        if isinstance(other, VectorBatch):
+            if other.shape != self.shape:
+                raise ValueError(f"Batches must have the same shape, got {self.shape} and {other.shape}")
+            return other.rows, None
+        raise TypeError(f"unsupported operand type(s) for {symbol}: 'VectorBatch' and '{type(other).__name__}'")
+
+    def _apply(self, op, other, symbol):
+        rows, scalar = self._operands(other, symbol)
+        if rows is None:
+            return [[op(value, scalar) for value in row] for row in self.rows]
+        return [list(map(op, row, other_row)) for row, other_row in zip(self.rows, rows)]
+
+    def _apply_inplace(self, op, other, symbol):
+        rows, scalar = self._operands(other, symbol)
+        if rows is None:
+            for row in self.rows:
+                row[:] = [op(value, scalar) for value in row]
+        else:
+            for row, other_row in zip(self.rows, rows):
+                row[:] = map(op, row, other_row)
+        return self
+
+    def __add__(self, other):
+        return VectorBatch(self._apply(operator.add, other, '+'), self.dim)
+
+    def __sub__(self, other):
+        return VectorBatch(self._apply(operator.sub, other, '-'), self.dim)
+
+    def __mul__(self, other):
+        return VectorBatch(self._apply(operator.mul, other, '*'), self.dim)
+
+    def __truediv__(self, other):
+        return VectorBatch(self._apply(operator.truediv, other, '/'), self.dim)
+
+    def __iadd__(self, other):
+        return self._apply_inplace(operator.add, other, '+=')
+
+    def __isub__(self, other):
+        return self._apply_inplace(operator.sub, other, '-=')
+
+    def __imul__(self, other):
+        return self._apply_inplace(operator.mul, other, '*=')
+
+    def __itruediv__(self, other):
+        return self._apply_inplace(operator.truediv, other, '/=')
+
+    def __neg__(self):
+        return VectorBatch(([-value for value in row] for row in self.rows), self.dim)
+
+    def norms(self):
+        return [math.sqrt(_dot(row, row)) for row in self.rows]
+
+    def _check_other(self, other, name):
+        if not isinstance(other, VectorBatch):
+            raise TypeError(f"unsupported operand type(s) for {name}: 'VectorBatch' and '{type(other).__name__}'")
+        if other.dim != self.dim:
+            raise ValueError(f"Batches must have the same dimension, got {self.dim} and {other.dim}")
+
+    def dot(self, other):
+        # Pairwise: result[i][j] is the dot product of row i of self and
+        # row j of other.
+        self._check_other(other, 'dot')
+        other_rows = other.rows
+        return [[_dot(row, other_row) for other_row in other_rows] for row in self.rows]
+
+    def __matmul__(self, other):
+        return self.dot(other)
+
+    def cosine(self, other):
+        self._check_other(other, 'cosine')
+        norms = self.norms()
+        other_norms = other.norms()
+        if 0 in norms or 0 in other_norms:
+            raise ValueError("Cosine similarity is not defined for zero-length vectors.")
+        return [
+            [value / (norm * other_norm) for value, other_norm in zip(products, other_norms)]
+            for products, norm in zip(self.dot(other), norms)
+        ]
+
+    def sum(self):
+        result = Vector(self.dim)
+        if self.rows:
+            result.data = [sum(column) for column in zip(*self.rows)]
+        return result
+
+    def mean(self):
+        if not self.rows:
+            raise ValueError("Cannot take the mean of an empty VectorBatch")
+        n = len(self.rows)
+        result = self.sum()
+        result.data = [value / n for value in result.data]
+        return result
+
+    centroid = mean
+
+    def center(self):
+        # Mean-centres the rows in place.
+        if self.rows:
+            self -= self.mean()
+        return self
+
+    def normalize(self):
+        # Scales every row to unit length in place; zero rows are left alone.
+        for row, norm in zip(self.rows, self.norms()):
+            if norm:
+                row[:] = [value / norm for value in row]
+        return self
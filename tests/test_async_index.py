@@ -0,0 +1,130 @@
+import unittest
+import asyncio
+import random
+from neuroseek import Vector, Index
+from neuroseek.hnsw_index import HNSWIndex
+from neuroseek.async_index import AsyncIndex
+
+
+class CountingIndex(Index):
+    def __init__(self):
+        super().__init__()
+        self.batch_sizes = []
+
+    def search_batch(self, query_vectors, top_k=5, filter=None):
+        self.batch_sizes.append(len(query_vectors))
+        return super().search_batch(query_vectors, top_k, filter)
+
+
+class TestAsyncIndex(unittest.TestCase):
+    def _fill(self, idx, n=20):
+        random.seed(31)
+        for i in range(n):
+            v = Vector(3)
+            v.data = [random.gauss(0, 1) for _ in range(3)]
+            idx.add_vector(v, i, attributes={'even': i % 2 == 0})
+        return idx
+
+    def _queries(self, n):
+        queries = []
+        for _ in range(n):
+            q = Vector(3)
+            q.data = [random.gauss(0, 1) for _ in range(3)]
+            queries.append(q)
+        return queries
+
+    def test_constructor_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            AsyncIndex(Index(), window=-1)
+        with self.assertRaises(ValueError):
+            AsyncIndex(Index(), max_batch=0)
+        with self.assertRaises(TypeError):
+            AsyncIndex(Index(), max_batch=1.5)
+
+    def test_asearch_matches_search(self):
+        idx = self._fill(Index())
+        async_idx = AsyncIndex(idx)
+        query = self._queries(1)[0]
+        result = asyncio.run(async_idx.asearch(query, 3))
+        self.assertEqual(result, idx.search(query, 3))
+        self.assertEqual(len(async_idx), 20)
+
+    def test_concurrent_queries_are_coalesced(self):
+        idx = self._fill(CountingIndex())
+        async_idx = AsyncIndex(idx, window=0.01)
+        queries = self._queries(10)
+
+        async def run():
+            return await asyncio.gather(*(async_idx.asearch(q, 4) for q in queries))
+
+        results = asyncio.run(run())
+        self.assertEqual(results, [idx.search(q, 4) for q in queries])
+        self.assertEqual(idx.batch_sizes, [10])
+
+    def test_max_batch_splits_batches(self):
+        idx = self._fill(CountingIndex())
+        async_idx = AsyncIndex(idx, window=0.01, max_batch=4)
+        queries = self._queries(10)
+
+        async def run():
+            return await asyncio.gather(*(async_idx.asearch(q, 2) for q in queries))
+
+        asyncio.run(run())
+        self.assertEqual(idx.batch_sizes, [4, 4, 2])
+
+    def test_different_parameters_not_mixed(self):
+        idx = self._fill(CountingIndex())
+        async_idx = AsyncIndex(idx, window=0.01)
+        queries = self._queries(4)
+
+        async def run():
+            return await asyncio.gather(
+                async_idx.asearch(queries[0], 2),
+                async_idx.asearch(queries[1], 3),
+                async_idx.asearch(queries[2], 2),
+                async_idx.asearch(queries[3], 3),
+            )
+
+        results = asyncio.run(run())
+        self.assertEqual([len(r) for r in results], [2, 3, 2, 3])
+        self.assertEqual(sorted(idx.batch_sizes), [2, 2])
+
+    def test_unhashable_parameters_run_directly(self):
+        idx = self._fill(Index())
+        async_idx = AsyncIndex(idx)
+        query = self._queries(1)[0]
+        result = asyncio.run(async_idx.asearch(query, 20, filter={'even': True}))
+        self.assertEqual(len(result), 10)
+
+    def test_failing_query_does_not_fail_batch(self):
+        idx = self._fill(Index())
+        async_idx = AsyncIndex(idx, window=0.01)
+        good = self._queries(1)[0]
+        bad = Vector(2)
+        bad.data = [1, 0]
+
+        async def run():
+            return await asyncio.gather(async_idx.asearch(good, 3), async_idx.asearch(bad, 3), return_exceptions=True)
+
+        good_result, bad_result = asyncio.run(run())
+        self.assertEqual(good_result, idx.search(good, 3))
+        self.assertIsInstance(bad_result, ValueError)
+
+    def test_hnsw_index(self):
+        random.seed(37)
+        idx = HNSWIndex(M=8, efConstruction=32)
+        for i in range(30):
+            v = Vector(3)
+            v.data = [random.gauss(0, 1) for _ in range(3)]
+            idx.add_vector(v, id=i)
+        async_idx = AsyncIndex(idx)
+        queries = self._queries(3)
+
+        async def run():
+            return await asyncio.gather(*(async_idx.asearch(q, 3, ef=20) for q in queries))
+
+        self.assertEqual(asyncio.run(run()), [idx.search(q, 3, ef=20) for q in queries])
+
+
+if __name__ == "__main__":
+    unittest.main()
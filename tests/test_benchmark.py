@@ -0,0 +1,76 @@
+import unittest
+import json
+import os
+import tempfile
+from neuroseek.benchmark import (
+    synthetic_dataset, ground_truth, recall_at_k, percentile, run_suite, compare, format_runs, main,
+)
+
+
+class TestBenchmark(unittest.TestCase):
+    def test_synthetic_dataset_is_deterministic(self):
+        a = synthetic_dataset(5, 3, seed=1)
+        b = synthetic_dataset(5, 3, seed=1)
+        self.assertEqual([v.data for v in a], [v.data for v in b])
+        self.assertEqual(len(a), 5)
+        self.assertEqual(len(a[0]), 3)
+
+    def test_synthetic_dataset_clusters(self):
+        vectors = synthetic_dataset(10, 4, seed=2, clusters=2)
+        self.assertEqual(len(vectors), 10)
+
+    def test_ground_truth_finds_itself(self):
+        data = synthetic_dataset(20, 4, seed=3)
+        truth = ground_truth(data, data[:3], 1)
+        self.assertEqual(truth, [[0], [1], [2]])
+
+    def test_recall_at_k(self):
+        self.assertEqual(recall_at_k([[1, 2], [3, 4]], [[1, 2], [3, 5]], 2), 0.75)
+        self.assertEqual(recall_at_k([], [], 2), 0.0)
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 0.5), 50)
+        self.assertEqual(percentile(values, 0.99), 99)
+        self.assertEqual(percentile([7], 0.99), 7)
+        self.assertEqual(percentile([], 0.5), 0.0)
+
+    def test_run_suite(self):
+        results = run_suite(sizes=[50], dim=4, num_queries=5, k=3, ef=[20], M=4, efConstruction=16)
+        self.assertEqual([run['index'] for run in results['runs']], ['flat', 'hnsw'])
+        flat = results['runs'][0]
+        self.assertEqual(flat['recall_at_k'], 1.0)
+        self.assertGreater(flat['qps'], 0)
+        self.assertGreater(flat['memory_bytes'], 0)
+        self.assertLessEqual(flat['latency_p50_ms'], flat['latency_p99_ms'])
+        self.assertEqual(results['runs'][1]['search_params'], {'ef': 20})
+        self.assertIn('python', results['environment'])
+        json.dumps(results)
+        self.assertIn('flat', format_runs(results['runs']))
+
+    def test_compare(self):
+        baseline = {'runs': [{'index': 'flat', 'size': 10, 'dim': 2, 'k': 1, 'search_params': {},
+                              'build_seconds': 2.0, 'memory_bytes': 100, 'qps': 10.0,
+                              'latency_p50_ms': 1.0, 'latency_p99_ms': 2.0, 'recall_at_k': 1.0}]}
+        current = {'runs': [dict(baseline['runs'][0], qps=20.0, build_seconds=1.0),
+                            dict(baseline['runs'][0], size=20)]}
+        rows = compare(baseline, current)
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['qps'], 2.0)
+        self.assertEqual(rows[0]['build_seconds'], 0.5)
+
+    def test_main_writes_json(self):
+        path = os.path.join(tempfile.mkdtemp(), 'bench.json')
+        main(['--sizes', '30', '--dim', '3', '--queries', '3', '-k', '2', '--ef', '10', '-M', '4',
+              '--ef-construction', '8', '--no-memory', '--output', path])
+        with open(path) as f:
+            results = json.load(f)
+        self.assertEqual(len(results['runs']), 2)
+        self.assertIsNone(results['runs'][0]['memory_bytes'])
+        main(['--sizes', '30', '--dim', '3', '--queries', '3', '-k', '2', '--ef', '10', '-M', '4',
+              '--ef-construction', '8', '--no-memory', '--compare', path])
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,164 @@
+import random
+import time
+import unittest
+from neuroseek.vector import Vector
+from neuroseek.index import Index
+from neuroseek.hnsw_index import HNSWIndex
+from neuroseek.cache import QueryCache
+
+
+def _vector(*values):
+    vector = Vector(len(values))
+    vector.data = list(values)
+    return vector
+
+
+class TestQueryCache(unittest.TestCase):
+    def _index(self, cache):
+        index = Index(cache=cache)
+        index.add_vector(_vector(1, 0), 0, {'color': 'red'})
+        index.add_vector(_vector(0, 1), 1, {'color': 'blue'})
+        index.add_vector(_vector(1, 1), 2, {'color': 'red'})
+        return index
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            QueryCache(max_entries=0)
+        with self.assertRaises(TypeError):
+            QueryCache(max_entries=1.5)
+        with self.assertRaises(ValueError):
+            QueryCache(ttl=0)
+        with self.assertRaises(ValueError):
+            QueryCache(max_bytes=0)
+
+    def test_repeated_search_hits(self):
+        cache = QueryCache()
+        index = self._index(cache)
+        query = _vector(1, 0.1)
+        first = index.search(query, top_k=2)
+        self.assertEqual(index.search(query, top_k=2), first)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertEqual(cache.hit_rate, 0.5)
+        self.assertGreater(cache.memory_bytes, 0)
+
+        # A different top_k or filter is a different entry.
+        index.search(query, top_k=1)
+        index.search(query, top_k=2, filter={'color': ['red']})
+        self.assertEqual(cache.misses, 3)
+        index.search(query, top_k=2, filter={'color': ['red']})
+        self.assertEqual(cache.hits, 2)
+
+    def test_returned_results_are_copies(self):
+        index = self._index(QueryCache())
+        query = _vector(1, 0.1)
+        index.search(query, top_k=2).clear()
+        self.assertEqual(len(index.search(query, top_k=2)), 2)
+
+    def test_mutations_invalidate(self):
+        cache = QueryCache()
+        index = self._index(cache)
+        query = _vector(1, 0.1)
+        index.search(query, top_k=1)
+
+        index.add_vector(_vector(1, 0.1), 3)
+        self.assertEqual(index.search(query, top_k=1)[0][0], 3)
+        index.update_vector(3, _vector(-1, 0))
+        self.assertEqual(index.search(query, top_k=1)[0][0], 0)
+        index.delete_vector(0)
+        self.assertEqual(index.search(query, top_k=1)[0][0], 2)
+        index.set_attributes(2, {'color': 'blue'})
+        self.assertEqual(index.search(query, top_k=1, filter={'color': 'red'}), [])
+        self.assertEqual(cache.hits, 0)
+        self.assertEqual(cache.invalidations, 3)
+
+    def test_lru_eviction(self):
+        cache = QueryCache(max_entries=2)
+        index = self._index(cache)
+        a, b, c = _vector(1, 0), _vector(0, 1), _vector(1, 1)
+        index.search(a)
+        index.search(b)
+        index.search(a)
+        index.search(c)  # evicts b, the least recently used
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.evictions, 1)
+        hits = cache.hits
+        index.search(a)
+        self.assertEqual(cache.hits, hits + 1)
+        index.search(b)
+        self.assertEqual(cache.hits, hits + 1)
+
+    def test_max_bytes(self):
+        cache = QueryCache(max_bytes=1)
+        index = self._index(cache)
+        index.search(_vector(1, 0))
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.memory_bytes, 0)
+
+    def test_ttl_expiry(self):
+        cache = QueryCache(ttl=0.01)
+        index = self._index(cache)
+        query = _vector(1, 0)
+        index.search(query)
+        time.sleep(0.02)
+        index.search(query)
+        self.assertEqual(cache.hits, 0)
+        self.assertEqual(cache.invalidations, 1)
+
+    def test_callable_filters_bypass_cache(self):
+        cache = QueryCache()
+        index = self._index(cache)
+        query = _vector(1, 0)
+        index.search(query, filter=lambda attrs: True)
+        index.search(query, filter=lambda attrs: True)
+        self.assertEqual((cache.hits, cache.misses, len(cache)), (0, 0, 0))
+
+    def test_errors_are_not_cached(self):
+        cache = QueryCache()
+        index = self._index(cache)
+        with self.assertRaises(ValueError):
+            index.search(_vector(1, 0, 0))
+        with self.assertRaises(TypeError):
+            index.search([1, 0])
+        self.assertEqual(len(cache), 0)
+
+    def test_search_batch_uses_cache(self):
+        cache = QueryCache()
+        index = self._index(cache)
+        queries = [_vector(1, 0), _vector(0, 1)]
+        expected = self._index(None).search_batch(queries, top_k=2)
+        index.search(queries[0], top_k=2)
+        self.assertEqual(index.search_batch(queries, top_k=2), expected)
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(index.search_batch(queries, top_k=2), expected)
+        self.assertEqual(cache.hits, 3)
+
+    def test_hnsw_cache(self):
+        random.seed(3)
+        cache = QueryCache()
+        index = HNSWIndex(M=4, efConstruction=20, cache=cache)
+        for i in range(30):
+            index.add_vector(_vector(random.uniform(-1, 1), random.uniform(-1, 1)), i)
+        query = _vector(0.5, 0.5)
+        first = index.search(query, top_k=3)
+        self.assertEqual(index.search(query, top_k=3), first)
+        self.assertEqual(cache.hits, 1)
+
+        index.search(query, top_k=3, return_stats=True)
+        self.assertEqual(cache.hits, 1)
+
+        index.delete_vector(first[0][0])
+        self.assertNotIn(first[0][0], [id for id, _ in index.search(query, top_k=3)])
+
+    def test_to_prometheus(self):
+        cache = QueryCache()
+        index = self._index(cache)
+        index.search(_vector(1, 0))
+        index.search(_vector(1, 0))
+        text = cache.to_prometheus(labels={'shard': '0'})
+        self.assertIn('neuroseek_cache_hits_total{shard="0"} 1', text)
+        self.assertIn('neuroseek_cache_hit_rate{shard="0"} 0.5', text)
+        self.assertIn('# TYPE neuroseek_cache_memory_bytes gauge', text)
+
+
+if __name__ == "__main__":
+    unittest.main()
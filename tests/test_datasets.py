@@ -0,0 +1,161 @@
+import unittest
+import os
+import struct
+import tempfile
+import zipfile
+import random
+from neuroseek import Vector, Index
+from neuroseek.hnsw_index import HNSWIndex
+from neuroseek.datasets import (
+    read_fvecs, read_ivecs, read_bvecs, read_npy, read_npz, read_vectors,
+    load_groundtruth, bulk_load, evaluate_recall, map_npy,
+)
+
+
+def _xvecs(rows, code):
+    return b''.join(struct.pack(f'<i{len(row)}{code}', len(row), *row) for row in rows)
+
+
+def _npy(rows, descr='<f4', version=1):
+    code = {'<f4': '<f', '<f8': '<d', '>f8': '>d', '<i2': '<h', '|u1': 'B', '<f2': '<e'}[descr]
+    shape = (len(rows), len(rows[0]))
+    header = repr({'descr': descr, 'fortran_order': False, 'shape': shape}).encode('latin1')
+    header += b' ' * (63 - (len(header) + 10) % 64) + b'\n'
+    prefix = b'\x93NUMPY' + bytes([version, 0])
+    prefix += struct.pack('<H', len(header)) if version == 1 else struct.pack('<I', len(header))
+    body = b''.join(struct.pack(f'{code[0] if len(code) > 1 else ""}{len(row)}{code[-1]}', *row) for row in rows)
+    return prefix + header + body
+
+
+class TestDatasets(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def _write(self, name, data):
+        path = os.path.join(self.dir, name)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return path
+
+    def test_read_fvecs_chunks(self):
+        rows = [[float(i), i + 0.5, -i] for i in range(5)]
+        path = self._write('base.fvecs', _xvecs(rows, 'f'))
+        chunks = list(read_fvecs(path, chunk_size=2))
+        self.assertEqual([len(chunk) for chunk in chunks], [2, 2, 1])
+        self.assertIsInstance(chunks[0][0], Vector)
+        self.assertEqual([v.data for chunk in chunks for v in chunk], rows)
+
+    def test_read_fvecs_limit(self):
+        path = self._write('base.fvecs', _xvecs([[1.0, 2.0]] * 5, 'f'))
+        self.assertEqual(sum(len(chunk) for chunk in read_fvecs(path, chunk_size=2, limit=3)), 3)
+
+    def test_read_fvecs_empty_file(self):
+        path = self._write('empty.fvecs', b'')
+        self.assertEqual(list(read_fvecs(path)), [])
+
+    def test_read_fvecs_truncated_raises(self):
+        path = self._write('bad.fvecs', _xvecs([[1.0, 2.0]], 'f')[:-2])
+        with self.assertRaises(ValueError):
+            list(read_fvecs(path))
+
+    def test_read_fvecs_inconsistent_dimension_raises(self):
+        path = self._write('bad.fvecs', _xvecs([[1.0, 2.0], [1.0, 2.0, 3.0, 4.0]], 'f')[:-4])
+        with self.assertRaises(ValueError):
+            list(read_fvecs(path))
+
+    def test_read_bvecs(self):
+        path = self._write('base.bvecs', _xvecs([[0, 128, 255]], 'B'))
+        self.assertEqual([v.data for chunk in read_bvecs(path) for v in chunk], [[0, 128, 255]])
+
+    def test_read_ivecs_and_groundtruth(self):
+        path = self._write('gt.ivecs', _xvecs([[3, 1, 2], [0, 4, 5]], 'i'))
+        self.assertEqual(list(read_ivecs(path)), [[[3, 1, 2], [0, 4, 5]]])
+        self.assertEqual(load_groundtruth(path, limit=1), [[3, 1, 2]])
+
+    def test_read_npy(self):
+        rows = [[1.0, 2.0], [3.0, 4.0], [5.0, 6.0]]
+        for descr in ('<f4', '<f8', '>f8', '<f2'):
+            path = self._write('base.npy', _npy(rows, descr))
+            chunks = list(read_npy(path, chunk_size=2))
+            self.assertEqual([v.data for chunk in chunks for v in chunk], rows, descr)
+
+    def test_read_npy_integer_and_version_2(self):
+        path = self._write('base.npy', _npy([[1, -2], [3, 4]], '<i2', version=2))
+        self.assertEqual([v.data for chunk in read_npy(path) for v in chunk], [[1, -2], [3, 4]])
+
+    def test_read_npy_invalid_raises(self):
+        path = self._write('bad.npy', b'not numpy')
+        with self.assertRaises(ValueError):
+            list(read_npy(path))
+        header = repr({'descr': '<c16', 'fortran_order': False, 'shape': (1, 1)}).encode()
+        path = self._write('bad.npy', b'\x93NUMPY\x01\x00' + struct.pack('<H', len(header)) + header)
+        with self.assertRaises(ValueError):
+            list(read_npy(path))
+
+    def test_read_npz(self):
+        path = os.path.join(self.dir, 'data.npz')
+        with zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr('base.npy', _npy([[1.0, 0.0]]))
+            archive.writestr('query.npy', _npy([[0.0, 1.0], [1.0, 1.0]]))
+        self.assertEqual([v.data for chunk in read_npz(path) for v in chunk], [[1.0, 0.0]])
+        self.assertEqual(sum(len(chunk) for chunk in read_npz(path, key='query')), 2)
+        with self.assertRaises(ValueError):
+            list(read_npz(path, key='missing'))
+
+    def test_read_vectors_dispatch(self):
+        path = self._write('base.fvecs', _xvecs([[1.0]], 'f'))
+        self.assertEqual(len(list(read_vectors(path))), 1)
+        with self.assertRaises(ValueError):
+            read_vectors(os.path.join(self.dir, 'base.csv'))
+
+    def test_bulk_load_and_evaluate_recall(self):
+        random.seed(43)
+        base = [[random.gauss(0, 1) for _ in range(4)] for _ in range(50)]
+        queries = [[random.gauss(0, 1) for _ in range(4)] for _ in range(5)]
+        base_path = self._write('base.fvecs', _xvecs(base, 'f'))
+        query_path = self._write('query.fvecs', _xvecs(queries, 'f'))
+
+        exact = Index()
+        self.assertEqual(bulk_load(exact, base_path, chunk_size=16), 50)
+        query_vectors = [v for chunk in read_fvecs(query_path) for v in chunk]
+        truth = [[id for id, _ in exact.search(q, 3)] for q in query_vectors]
+        gt_path = self._write('gt.ivecs', _xvecs(truth, 'i'))
+
+        self.assertEqual(evaluate_recall(exact, query_path, gt_path, k=3), 1.0)
+
+        idx = HNSWIndex(M=8, efConstruction=32)
+        self.assertEqual(bulk_load(idx, base_path, chunk_size=16), 50)
+        self.assertGreaterEqual(evaluate_recall(idx, query_vectors, truth, k=3, ef=30), 0.8)
+
+    def test_evaluate_recall_short_groundtruth_raises(self):
+        idx = Index()
+        q = Vector(2)
+        q.data = [1, 0]
+        with self.assertRaises(ValueError):
+            evaluate_recall(idx, [q, q], [[0]], k=1)
+
+    def test_map_npy_views_file(self):
+        rows = [[1.0, 2.0], [3.0, 4.0], [5.0, 6.0]]
+        for descr in ('<f4', '<f8'):
+            path = self._write('mapped.npy', _npy(rows, descr))
+            vectors = map_npy(path)
+            self.assertEqual([list(v) for v in vectors], rows)
+            self.assertIsInstance(vectors[0].data, memoryview)
+            with self.assertRaises(TypeError):
+                vectors[0][0] = 9.0
+
+        index = Index()
+        index.add_vectors(vectors)
+        query = Vector(2)
+        query.data = [5, 6]
+        self.assertEqual(index.search(query, top_k=1)[0][0], 2)
+
+    def test_map_npy_unsupported(self):
+        with self.assertRaises(ValueError):
+            map_npy(self._write('ints.npy', _npy([[1, 2]], '<i2')))
+        with self.assertRaises(ValueError):
+            map_npy(self._write('big.npy', _npy([[1.0, 2.0]], '>f8')))
+
+
+if __name__ == "__main__":
+    unittest.main()
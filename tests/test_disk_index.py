@@ -0,0 +1,103 @@
+import os
+import random
+import tempfile
+import unittest
+from neuroseek import Vector, Index
+from neuroseek.hnsw_index import HNSWIndex
+from neuroseek.disk_index import write_disk_index, DiskIndex, _record_size, _record_offset
+from neuroseek.benchmark import synthetic_dataset
+
+
+class TestDiskIndex(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, 'graph.disk')
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def _build(self, metric='cosine', n=400, compressed_dtype='float16'):
+        random.seed(17)
+        self.data = synthetic_dataset(n, 16)
+        self.exact = Index(metric=metric)
+        hnsw = HNSWIndex(M=8, efConstruction=64, metric=metric)
+        for i, vector in enumerate(self.data):
+            self.exact.add_vector(vector, 1000 + i)
+            hnsw.add_vector(vector, 1000 + i)
+        write_disk_index(hnsw, self.path, compressed_dtype=compressed_dtype)
+        return DiskIndex(self.path)
+
+    def test_record_size_is_page_aligned(self):
+        for dim, degree in ((16, 16), (128, 32), (1000, 64)):
+            size = _record_size(dim, degree, 4096)
+            self.assertGreaterEqual(size, 4 * dim + 4 + 4 * degree)
+            for ordinal in range(100):
+                offset = _record_offset(ordinal, size, 4096)
+                self.assertGreaterEqual(offset, 4096)
+                if size <= 4096:
+                    self.assertEqual(offset // 4096, (offset + size - 1) // 4096)
+                else:
+                    self.assertEqual(offset % 4096, 0)
+
+    def test_layout(self):
+        with self._build() as index:
+            self.assertEqual(len(index), 400)
+            self.assertEqual(index.dim, 16)
+            self.assertEqual(index.max_degree, 16)
+            self.assertEqual(index.metric.name, 'cosine')
+            self.assertEqual(len(index.compressed), 2 * 16 * 400)
+            for got, expected in zip(index.get_vector(1005).data, self.data[5].data):
+                self.assertAlmostEqual(got, expected, places=5)
+            with self.assertRaises(ValueError):
+                index.get_vector(5)
+
+    def test_search_recall_and_io(self):
+        for metric, dtype in (('cosine', 'float16'), ('l2', 'bfloat16')):
+            with self._build(metric, compressed_dtype=dtype) as index:
+                queries = synthetic_dataset(20, 16, seed=3)
+                hits = 0
+                for query in queries:
+                    truth = {id for id, _ in self.exact.search(query, top_k=10)}
+                    results = index.search(query, top_k=10, search_list=48)
+                    self.assertEqual(len(results), 10)
+                    hits += len(truth & {id for id, _ in results})
+                self.assertGreaterEqual(hits / 200, 0.9, metric)
+                # Only a fraction of the records are touched per query.
+                self.assertLess(index.reads / len(queries), len(index) / 2)
+
+    def test_scores_use_full_precision(self):
+        with self._build('ip') as index:
+            query = self.data[7]
+            id, score = index.search(query, top_k=1)[0]
+            self.assertEqual(id, 1007)
+            self.assertAlmostEqual(score, query.dot(self.data[7]), places=4)
+
+    def test_search_batch_and_beam_width(self):
+        with self._build() as index:
+            queries = synthetic_dataset(3, 16, seed=4)
+            narrow = [index.search(q, top_k=5, beam_width=1) for q in queries]
+            self.assertEqual(len(index.search_batch(queries, top_k=5)), 3)
+            self.assertTrue(all(len(results) == 5 for results in narrow))
+
+    def test_invalid_arguments(self):
+        with self._build(n=50) as index:
+            with self.assertRaises(ValueError):
+                index.search(Vector(3))
+            with self.assertRaises(TypeError):
+                index.search([0] * 16)
+            with self.assertRaises(ValueError):
+                index.search(self.data[0], top_k=0)
+            with self.assertRaises(ValueError):
+                index.search(self.data[0], beam_width=0)
+        with self.assertRaises(ValueError):
+            write_disk_index(HNSWIndex(), self.path)
+        with self.assertRaises(ValueError):
+            write_disk_index(HNSWIndex(), self.path, compressed_dtype='float32')
+        with open(self.path, 'wb') as f:
+            f.write(b'\0' * 4096)
+        with self.assertRaises(ValueError):
+            DiskIndex(self.path).close()
+
+
+if __name__ == "__main__":
+    unittest.main()
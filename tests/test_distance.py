@@ -0,0 +1,76 @@
+import unittest
+from neuroseek.distance import get_metric, Metric, METRICS
+
+
+class TestDistance(unittest.TestCase):
+    def test_get_metric_names(self):
+        for name in METRICS:
+            self.assertEqual(get_metric(name).name, name)
+
+    def test_get_metric_passes_through_instance(self):
+        metric = get_metric('ip')
+        self.assertIs(get_metric(metric), metric)
+
+    def test_get_metric_unknown_raises(self):
+        with self.assertRaises(ValueError):
+            get_metric('manhattan')
+
+    def test_get_metric_invalid_type_raises(self):
+        with self.assertRaises(TypeError):
+            get_metric(1)
+
+    def test_cosine_similarity(self):
+        metric = get_metric('cosine')
+        a = [1, 2, 3]
+        b = [2, 4, 6]
+        self.assertAlmostEqual(metric.similarity(a, metric.aux(a), b, metric.aux(b)), 1.0)
+
+    def test_cosine_zero_vector_raises(self):
+        metric = get_metric('cosine')
+        a = [1, 2, 3]
+        b = [0, 0, 0]
+        with self.assertRaises(ValueError):
+            metric.similarity(a, metric.aux(a), b, metric.aux(b))
+        with self.assertRaises(ValueError):
+            metric.similarities(a, metric.aux(a), [b], [metric.aux(b)])
+
+    def test_ip_similarity(self):
+        metric = get_metric('ip')
+        self.assertEqual(metric.similarity([1, 2, 3], None, [4, 5, 6], None), 32)
+
+    def test_l2_similarity_is_negated_squared_distance(self):
+        metric = get_metric('l2')
+        a = [1, 2, 3]
+        b = [4, 6, 3]
+        self.assertEqual(metric.similarity(a, metric.aux(a), b, metric.aux(b)), -25)
+
+    def test_l2_identical_vectors(self):
+        metric = get_metric('l2')
+        a = [0.1, 0.2, 0.3]
+        self.assertEqual(metric.similarity(a, metric.aux(a), a, metric.aux(a)), 0)
+
+    def test_similarities_matches_similarity(self):
+        rows = [[1, 0, 2], [3, 1, 0], [0.5, 0.5, 0.5]]
+        query = [1, 2, 3]
+        for name in METRICS:
+            metric = get_metric(name)
+            auxes = [metric.aux(row) for row in rows]
+            expected = [metric.similarity(query, metric.aux(query), row, aux) for row, aux in zip(rows, auxes)]
+            self.assertEqual(metric.similarities(query, metric.aux(query), rows, auxes), expected)
+
+    def test_distance_round_trip(self):
+        for name in METRICS:
+            metric = get_metric(name)
+            a = [1, 2, 3]
+            b = [3, 2, 1]
+            similarity = metric.similarity(a, metric.aux(a), b, metric.aux(b))
+            distance = metric.distance(a, metric.aux(a), b, metric.aux(b))
+            self.assertAlmostEqual(metric.to_similarity(distance), similarity)
+
+    def test_repr(self):
+        self.assertEqual(repr(get_metric('l2')), "Metric('l2')")
+        self.assertIsInstance(get_metric('l2'), Metric)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+from neuroseek.filtering import AttributeStore
+
+
+class TestAttributeStore(unittest.TestCase):
+    def _store(self):
+        store = AttributeStore()
+        store.set(1, {'lang': 'en', 'year': 2020})
+        store.set(2, {'lang': 'de', 'year': 2020})
+        store.set(3, {'lang': 'en', 'year': 2021})
+        return store
+
+    def test_set_and_get(self):
+        store = self._store()
+        self.assertEqual(store.get(1), {'lang': 'en', 'year': 2020})
+        self.assertEqual(store.get(99), {})
+        self.assertEqual(len(store), 3)
+        self.assertIn(2, store)
+
+    def test_set_replaces_previous_attributes(self):
+        store = self._store()
+        store.set(1, {'lang': 'fr'})
+        self.assertEqual(store.compile({'lang': 'en'}), {3})
+        self.assertEqual(store.compile({'year': 2020}), {2})
+
+    def test_set_empty_removes(self):
+        store = self._store()
+        store.set(1, {})
+        self.assertNotIn(1, store)
+
+    def test_set_invalid_type_raises(self):
+        store = AttributeStore()
+        with self.assertRaises(TypeError):
+            store.set(1, [('lang', 'en')])
+
+    def test_set_unhashable_value_raises(self):
+        store = AttributeStore()
+        with self.assertRaises(TypeError):
+            store.set(1, {'tags': ['a', 'b']})
+
+    def test_remove(self):
+        store = self._store()
+        store.remove(1)
+        store.remove(99)
+        self.assertEqual(store.compile({'lang': 'en'}), {3})
+
+    def test_compile_equality(self):
+        store = self._store()
+        self.assertEqual(store.compile({'lang': 'en'}), {1, 3})
+
+    def test_compile_conjunction(self):
+        store = self._store()
+        self.assertEqual(store.compile({'lang': 'en', 'year': 2020}), {1})
+
+    def test_compile_any_of(self):
+        store = self._store()
+        self.assertEqual(store.compile({'lang': ['de', 'fr'], 'year': (2020, 2021)}), {2})
+
+    def test_compile_no_match(self):
+        store = self._store()
+        self.assertEqual(store.compile({'lang': 'fr'}), set())
+
+    def test_compile_empty_filter_is_unrestricted(self):
+        store = self._store()
+        self.assertIsNone(store.compile({}))
+
+    def test_compile_callable(self):
+        store = self._store()
+        self.assertEqual(store.compile(lambda attributes: attributes['year'] > 2020), {3})
+
+    def test_compile_callable_over_given_ids(self):
+        store = self._store()
+        self.assertEqual(store.compile(lambda attributes: attributes.get('lang') != 'en', [1, 2, 3, 4]), {2, 4})
+        self.assertEqual(store.compile(lambda attributes: True, [4, 5]), {4, 5})
+
+    def test_compile_invalid_filter_raises(self):
+        store = self._store()
+        with self.assertRaises(TypeError):
+            store.compile('lang=en')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,6 @@
 import unittest
 import random
-from neuroseek import Vector
+from neuroseek import Vector, Index
 from neuroseek.hnsw_index import HNSWIndex
 
 
@@ -195,5 +195,547 @@ class TestHNSWIndex(unittest.TestCase):
         self.assertGreaterEqual(len(results), 1)
 
 
+    def test_constructor_metric(self):
+        idx = HNSWIndex(metric='l2')
+        self.assertEqual(idx.metric.name, 'l2')
+        with self.assertRaises(ValueError):
+            HNSWIndex(metric='hamming')
+
+    def test_add_zero_vector_cosine_raises(self):
+        idx = HNSWIndex()
+        with self.assertRaises(ValueError):
+            idx.add_vector(Vector(3), id=1)
+
+    def test_search_does_not_move_entry_point(self):
+        random.seed(42)
+        idx = HNSWIndex()
+        for i in range(20):
+            v = Vector(2)
+            v.data = [i + 1, 20 - i]
+            idx.add_vector(v, id=i)
+        entry_point = idx.entry_point
+        query = Vector(2)
+        query.data = [1, 0]
+        idx.search(query, top_k=3)
+        self.assertIs(idx.entry_point, entry_point)
+
+    def test_delete_entry_point_keeps_index_searchable(self):
+        random.seed(42)
+        idx = HNSWIndex()
+        for i in range(10):
+            v = Vector(2)
+            v.data = [i + 1, 1]
+            idx.add_vector(v, id=i)
+        idx.delete_vector(idx.entry_point.id)
+        query = Vector(2)
+        query.data = [1, 1]
+        self.assertEqual(len(idx.search(query, top_k=3)), 3)
+
+    def _random_indexes(self, metric, n=200, dim=8):
+        random.seed(7)
+        exact = Index(metric=metric)
+        idx = HNSWIndex(M=8, efConstruction=64, metric=metric)
+        for i in range(n):
+            v = Vector(dim)
+            v.data = [random.gauss(0, 1) for _ in range(dim)]
+            exact.add_vector(v, i)
+            idx.add_vector(v, id=i)
+        return exact, idx
+
+    def test_search_recall_against_exact(self):
+        for metric in ('cosine', 'ip', 'l2'):
+            exact, idx = self._random_indexes(metric)
+            hits = 0
+            for _ in range(10):
+                query = Vector(8)
+                query.data = [random.gauss(0, 1) for _ in range(8)]
+                expected = {id for id, _ in exact.search(query, 5)}
+                found = {id for id, _ in idx.search(query, top_k=5, ef=50)}
+                hits += len(expected & found)
+            self.assertGreaterEqual(hits / 50, 0.9, metric)
+
+    def test_search_scores_match_exact(self):
+        exact, idx = self._random_indexes('l2')
+        query = Vector(8)
+        query.data = [0.5] * 8
+        expected = dict(exact.search(query, 200))
+        for id, score in idx.search(query, top_k=5, ef=50):
+            self.assertAlmostEqual(score, expected[id])
+
+
+    def test_add_vector_with_attributes(self):
+        idx = HNSWIndex()
+        v = Vector(2)
+        v.data = [1, 0]
+        idx.add_vector(v, id=1, attributes={'lang': 'en'})
+        self.assertEqual(idx.get_attributes(1), {'lang': 'en'})
+        idx.set_attributes(1, {'lang': 'de'})
+        self.assertEqual(idx.get_attributes(1), {'lang': 'de'})
+        idx.delete_vector(1)
+        self.assertEqual(len(idx.attributes), 0)
+
+    def _filtered_index(self, n=200):
+        random.seed(3)
+        exact = Index()
+        idx = HNSWIndex(M=8, efConstruction=64)
+        for i in range(n):
+            v = Vector(8)
+            v.data = [random.gauss(0, 1) for _ in range(8)]
+            attributes = {'bucket': i % 4, 'rare': i % 50 == 0}
+            exact.add_vector(v, i, attributes=attributes)
+            idx.add_vector(v, id=i, attributes=attributes)
+        return exact, idx
+
+    def test_search_with_filter_graph(self):
+        exact, idx = self._filtered_index()
+        query = Vector(8)
+        query.data = [random.gauss(0, 1) for _ in range(8)]
+        results = idx.search(query, top_k=5, ef=50, filter={'bucket': 2})
+        self.assertEqual(len(results), 5)
+        for id, _ in results:
+            self.assertEqual(id % 4, 2)
+        expected = {id for id, _ in exact.search(query, 5, filter={'bucket': 2})}
+        self.assertGreaterEqual(len(expected & {id for id, _ in results}), 4)
+
+    def test_search_with_selective_filter_is_exact(self):
+        exact, idx = self._filtered_index()
+        query = Vector(8)
+        query.data = [random.gauss(0, 1) for _ in range(8)]
+        results = idx.search(query, top_k=3, filter={'rare': True})
+        expected = exact.search(query, 3, filter={'rare': True})
+        self.assertEqual([id for id, _ in results], [id for id, _ in expected])
+        for (_, score), (_, expected_score) in zip(results, expected):
+            self.assertAlmostEqual(score, expected_score)
+
+    def test_search_with_filter_no_match(self):
+        exact, idx = self._filtered_index()
+        query = Vector(8)
+        query.data = [1] * 8
+        self.assertEqual(idx.search(query, top_k=3, filter={'bucket': 9}), [])
+
+
+    def _random_vectors(self, n, dim=8):
+        vectors = []
+        for _ in range(n):
+            v = Vector(dim)
+            v.data = [random.gauss(0, 1) for _ in range(dim)]
+            vectors.append(v)
+        return vectors
+
+    def test_add_vectors_serial(self):
+        random.seed(11)
+        idx = HNSWIndex(M=8, efConstruction=32)
+        ids = idx.add_vectors(self._random_vectors(20), num_threads=1)
+        self.assertEqual(ids, list(range(20)))
+        self.assertEqual(len(idx), 20)
+
+    def test_add_vectors_with_ids_and_attributes(self):
+        random.seed(11)
+        idx = HNSWIndex(M=8, efConstruction=32)
+        ids = idx.add_vectors(self._random_vectors(3), ids=[10, 20, 30],
+                              attributes=[{'a': 1}, None, {'a': 2}], num_threads=2)
+        self.assertEqual(ids, [10, 20, 30])
+        self.assertEqual(idx.get_attributes(30), {'a': 2})
+        self.assertEqual(idx.get_attributes(20), {})
+
+    def test_add_vectors_length_mismatch_raises(self):
+        idx = HNSWIndex()
+        with self.assertRaises(ValueError):
+            idx.add_vectors(self._random_vectors(2), ids=[1])
+
+    def test_add_vectors_duplicate_ids_raises(self):
+        idx = HNSWIndex()
+        with self.assertRaises(ValueError):
+            idx.add_vectors(self._random_vectors(2), ids=[1, 1])
+        self.assertEqual(len(idx), 0)
+
+    def test_add_vectors_existing_id_raises_before_inserting(self):
+        random.seed(11)
+        idx = HNSWIndex()
+        idx.add_vector(self._random_vectors(1)[0], id=1)
+        with self.assertRaises(ValueError):
+            idx.add_vectors(self._random_vectors(2), ids=[2, 1])
+        self.assertEqual(len(idx), 1)
+
+    def test_add_vectors_invalid_vector_raises(self):
+        idx = HNSWIndex()
+        with self.assertRaises(TypeError):
+            idx.add_vectors([[1, 2, 3]])
+
+    def test_add_vectors_parallel_builds_consistent_graph(self):
+        random.seed(13)
+        vectors = self._random_vectors(300)
+        idx = HNSWIndex(M=8, efConstruction=64)
+        idx.add_vectors(vectors, num_threads=8)
+        self.assertEqual(len(idx), 300)
+        self.assertEqual(len(idx.layers[0]), 300)
+        self.assertEqual(idx.entry_point.layer, len(idx.layers) - 1)
+        for node in idx.id_to_node.values():
+            for layer, connections in node.connections.items():
+                self.assertLessEqual(len(connections), idx._max_connections(layer))
+                for neighbor_id, _ in connections:
+                    self.assertIn(neighbor_id, idx.layers[layer])
+
+        exact = Index()
+        for i, v in enumerate(vectors):
+            exact.add_vector(v, i)
+        hits = 0
+        for query in self._random_vectors(10):
+            expected = {id for id, _ in exact.search(query, 5)}
+            found = {id for id, _ in idx.search(query, top_k=5, ef=50)}
+            hits += len(expected & found)
+        self.assertGreaterEqual(hits / 50, 0.9)
+
+    def test_insert_keeps_links_made_during_neighbor_search(self):
+        random.seed(19)
+        idx = HNSWIndex(M=4, efConstruction=16)
+        idx.add_vectors(self._random_vectors(20), num_threads=1)
+        vector = self._random_vectors(1)[0]
+        # Node 98 points away from the new vector, so the neighbour search
+        # never selects it; only the concurrent link puts it in the row.
+        opposite = Vector(8)
+        opposite.data = [-x for x in vector.data]
+        idx.add_vector(opposite, id=98)
+        search_layer = idx._search_layer
+
+        def search_with_concurrent_link(query, query_aux, entry_nodes, ef, layer, **kwargs):
+            # Stand-in for another thread linking itself into the new node.
+            if layer == 0 and 99 in idx.id_to_node:
+                idx._link(idx.id_to_node[99], 98, 0.0, 0)
+            return search_layer(query, query_aux, entry_nodes, ef, layer, **kwargs)
+
+        idx._search_layer = search_with_concurrent_link
+        idx.add_vector(vector, id=99)
+        connections = idx.id_to_node[99].get_connections(0)
+        self.assertIn((98, 0.0), connections)
+        self.assertLessEqual(len(connections), idx._max_connections(0))
+        self.assertEqual(len({id for id, _ in connections}), len(connections))
+
+    def test_delete_vector_removes_back_references(self):
+        random.seed(17)
+        idx = HNSWIndex(M=4, efConstruction=16)
+        idx.add_vectors(self._random_vectors(30), num_threads=1)
+        idx.delete_vector(5)
+        for node in idx.id_to_node.values():
+            for connections in node.connections.values():
+                self.assertNotIn(5, [nid for nid, _ in connections])
+
+    def test_callable_filter_sees_nodes_without_attributes(self):
+        random.seed(37)
+        idx = HNSWIndex(M=4, efConstruction=16)
+        for i, v in enumerate(self._random_vectors(40)):
+            idx.add_vector(v, id=i, attributes={'lang': 'en'} if i % 2 else None)
+        query = self._random_vectors(1)[0]
+        found = idx.search(query, top_k=5, ef=40, filter=lambda a: a.get('lang') != 'en')
+        self.assertEqual(len(found), 5)
+        self.assertTrue(all(id % 2 == 0 for id, _ in found))
+        self.assertEqual(len(list(idx.range_search(query, -1.0, filter=lambda a: True))), 40)
+
+    def test_stored_vectors_are_copies(self):
+        idx = HNSWIndex(M=4, efConstruction=8)
+        a = Vector(2)
+        a.data = [1, 0]
+        idx.add_vector(a, 0)
+        a *= 10
+        query = Vector(2)
+        query.data = [1, 0]
+        self.assertEqual(idx.search(query, top_k=1), [(0, 1.0)])
+        self.assertIsNot(idx.get_vector(0), a)
+        got = idx.get_vector(0)
+        got[0] = 5
+        self.assertEqual(idx.search(query, top_k=1), [(0, 1.0)])
+
+        shared = HNSWIndex(copy_vectors=False)
+        shared.add_vector(a, 0)
+        self.assertIs(shared.get_vector(0), a)
+
+    def test_delete_vectors_batch(self):
+        random.seed(29)
+        data = self._random_vectors(400)
+        idx = HNSWIndex(M=6, efConstruction=32)
+        idx.add_vectors(data, num_threads=1)
+        exact = Index()
+        exact.add_vectors(data)
+        doomed = random.sample(range(400), 80) + [idx.entry_point.id]
+        doomed = list(dict.fromkeys(doomed))
+        deleted = idx.delete_vectors(doomed)
+        exact.delete_vectors(doomed)
+        self.assertEqual([v.data for v in deleted], [data[id].data for id in doomed])
+        self.assertEqual(len(idx), 400 - len(doomed))
+        self.assertNotIn(idx.entry_point.id, doomed)
+        for node in idx.id_to_node.values():
+            for connections in node.connections.values():
+                self.assertFalse({nid for nid, _ in connections} & set(doomed))
+                self.assertLessEqual(len(connections), 12)
+
+        hits = 0
+        for query in self._random_vectors(20):
+            expected = {id for id, _ in exact.search(query, top_k=5)}
+            hits += len(expected & {id for id, _ in idx.search(query, top_k=5, ef=40)})
+        self.assertGreaterEqual(hits / 100, 0.9)
+
+        with self.assertRaises(ValueError):
+            idx.delete_vectors([doomed[0]])
+        with self.assertRaises(ValueError):
+            idx.delete_vectors([1000, 1000])
+        self.assertEqual(idx.delete_vectors([]), [])
+
+    def test_update_vectors(self):
+        random.seed(31)
+        idx = HNSWIndex(M=4, efConstruction=16, metric='l2')
+        data = self._random_vectors(50)
+        for i, v in enumerate(data):
+            idx.add_vector(v, id=i, attributes={'group': i % 3})
+        new = self._random_vectors(5)
+        old = idx.update_vectors([3, 10, 20, 30, 40], new, num_threads=2)
+        self.assertEqual([v.data for v in old], [data[i].data for i in (3, 10, 20, 30, 40)])
+        self.assertEqual(len(idx), 50)
+        self.assertEqual(idx.search(new[1], top_k=1)[0], (10, 0.0))
+        self.assertEqual(idx.get_attributes(20), {'group': 2})
+
+        with self.assertRaises(ValueError):
+            idx.update_vectors([3, 99], new[:2])
+        with self.assertRaises(ValueError):
+            idx.update_vectors([3, 4], [new[0], Vector(3)])
+        with self.assertRaises(ValueError):
+            idx.update_vectors([3], new[:2])
+        self.assertEqual(idx.get_vector(3).data, new[0].data)
+
+    def test_update_vectors_rejects_out_of_range_batch(self):
+        idx = HNSWIndex(M=4, efConstruction=16, dtype='float16')
+        data = self._random_vectors(5)
+        for i, v in enumerate(data):
+            idx.add_vector(v, id=i, attributes={'n': i})
+        big = Vector(8)
+        big.data = [70000.0] + [1.0] * 7
+        with self.assertRaises(ValueError):
+            idx.update_vectors([0, 1], [data[2], big])
+        self.assertEqual(len(idx), 5)
+        self.assertEqual(idx.get_attributes(1), {'n': 1})
+        self.assertEqual(idx.search(data[1], top_k=1)[0][0], 1)
+
+    def test_search_skips_concurrently_deleted_ids(self):
+        random.seed(19)
+        idx = HNSWIndex(M=4, efConstruction=16)
+        idx.add_vectors(self._random_vectors(30), num_threads=1)
+        # Simulate a reader that loaded a row before the delete removed the node.
+        victim = 7 if idx.entry_point.id != 7 else 8
+        stale = idx.id_to_node.pop(victim)
+        query = stale.vector
+        results = idx.search(query, top_k=5, ef=20)
+        self.assertNotIn(victim, [id for id, _ in results])
+        self.assertEqual(len(results), 5)
+
+    def test_concurrent_searches_during_writes(self):
+        import threading
+        random.seed(23)
+        idx = HNSWIndex(M=6, efConstruction=32)
+        idx.add_vectors(self._random_vectors(50), num_threads=1)
+        queries = self._random_vectors(20)
+        extra = self._random_vectors(150)
+        errors = []
+        done = threading.Event()
+
+        def reader():
+            try:
+                while not done.is_set():
+                    for query in queries:
+                        results = idx.search(query, top_k=5, ef=20)
+                        self.assertGreater(len(results), 0)
+            except Exception as e:
+                errors.append(e)
+
+        readers = [threading.Thread(target=reader) for _ in range(4)]
+        for thread in readers:
+            thread.start()
+        try:
+            for i, v in enumerate(extra):
+                idx.add_vector(v, id=100 + i)
+                if i % 3 == 0 and i < 50:
+                    idx.delete_vector(i)
+                    idx.set_attributes(100 + i, {'batch': i})
+        finally:
+            done.set()
+            for thread in readers:
+                thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(len(idx), len(idx.id_to_node))
+
+
+    def test_search_return_stats(self):
+        random.seed(47)
+        idx = HNSWIndex(M=6, efConstruction=32)
+        idx.add_vectors(self._random_vectors(100), num_threads=1)
+        query = self._random_vectors(1)[0]
+        results, stats = idx.search(query, top_k=5, ef=20, return_stats=True)
+        self.assertEqual(results, idx.search(query, top_k=5, ef=20))
+        self.assertGreaterEqual(stats.distance_evaluations, 20)
+        self.assertLessEqual(stats.distance_evaluations, 100 * len(stats.hops))
+        self.assertEqual(stats.visited_nodes, stats.distance_evaluations)
+        self.assertGreater(stats.hops[0], 0)
+        self.assertEqual(set(stats.hops), set(range(idx.entry_point.layer + 1)))
+        self.assertGreater(stats.heap_operations, stats.hops[0])
+        self.assertFalse(stats.brute_force)
+        self.assertEqual(idx.metrics.searches, 0)
+
+    def test_search_return_stats_empty_index(self):
+        idx = HNSWIndex()
+        query = Vector(2)
+        query.data = [1, 0]
+        results, stats = idx.search(query, return_stats=True)
+        self.assertEqual(results, [])
+        self.assertEqual(stats.distance_evaluations, 0)
+
+    def test_search_stats_brute_force(self):
+        exact, idx = self._filtered_index()
+        query = Vector(8)
+        query.data = [1] * 8
+        _, stats = idx.search(query, top_k=3, filter={'rare': True}, return_stats=True)
+        self.assertTrue(stats.brute_force)
+        self.assertEqual(stats.distance_evaluations, 4)
+
+    def test_collect_stats_records_metrics(self):
+        random.seed(53)
+        idx = HNSWIndex(M=6, efConstruction=32, collect_stats=True)
+        idx.add_vectors(self._random_vectors(50), num_threads=1)
+        total = 0
+        for query in self._random_vectors(3):
+            _, stats = idx.search(query, top_k=3, return_stats=True)
+            total += stats.distance_evaluations
+        self.assertEqual(idx.metrics.searches, 3)
+        self.assertEqual(idx.metrics.distance_evaluations, total)
+        self.assertIn('neuroseek_searches_total 3', idx.metrics.to_prometheus())
+
+    def test_search_patience_stops_early(self):
+        exact, idx = self._random_indexes('cosine', n=300)
+        random.seed(59)
+        evaluations = {'full': 0, 'patient': 0}
+        hits = 0
+        queries = self._random_vectors(10)
+        for query in queries:
+            full, full_stats = idx.search(query, top_k=5, ef=150, return_stats=True)
+            patient, stats = idx.search(query, top_k=5, ef=150, patience=3, return_stats=True)
+            self.assertEqual(len(patient), 5)
+            evaluations['full'] += full_stats.distance_evaluations
+            evaluations['patient'] += stats.distance_evaluations
+            truth = {id for id, _ in exact.search(query, top_k=5)}
+            hits += len(truth & {id for id, _ in patient})
+        self.assertLess(evaluations['patient'], evaluations['full'])
+        self.assertGreaterEqual(hits / (5 * len(queries)), 0.6)
+
+    def test_search_time_budget(self):
+        exact, idx = self._random_indexes('l2', n=200)
+        query = self._random_vectors(1)[0]
+        results, stats = idx.search(query, top_k=5, ef=200, time_budget=1e-9, return_stats=True)
+        self.assertTrue(stats.early_stopped)
+        self.assertGreater(len(results), 0)
+        self.assertEqual(idx.search(query, top_k=5, ef=50, time_budget=10),
+                         idx.search(query, top_k=5, ef=50))
+
+    def test_search_early_termination_arguments(self):
+        _, idx = self._random_indexes('cosine', n=20)
+        query = self._random_vectors(1)[0]
+        with self.assertRaises(ValueError):
+            idx.search(query, patience=0)
+        with self.assertRaises(TypeError):
+            idx.search(query, patience=1.5)
+        with self.assertRaises(ValueError):
+            idx.search(query, time_budget=0)
+        with self.assertRaises(TypeError):
+            idx.search(query, time_budget='1')
+
+    def test_collect_stats_counts_early_stops(self):
+        _, idx = self._random_indexes('cosine', n=100)
+        idx.collect_stats = True
+        idx.search(self._random_vectors(1)[0], top_k=3, ef=100, time_budget=1e-9)
+        self.assertEqual(idx.metrics.early_stopped_searches, 1)
+        self.assertIn('neuroseek_early_stopped_searches_total 1', idx.metrics.to_prometheus())
+
+    def test_dimension_checks(self):
+        idx = HNSWIndex(M=4, efConstruction=10)
+        v = Vector(3)
+        v.data = [1, 2, 3]
+        idx.add_vector(v, 0)
+        self.assertEqual(idx.dim, 3)
+        w = Vector(2)
+        w.data = [1, 2]
+        with self.assertRaises(ValueError):
+            idx.add_vector(w, 1)
+        with self.assertRaises(ValueError):
+            idx.search(w)
+        with self.assertRaises(ValueError):
+            idx.add_vectors([v, w], ids=[1, 2])
+        self.assertEqual(len(idx), 1)
+
+        fresh = HNSWIndex()
+        with self.assertRaises(ValueError):
+            fresh.add_vectors([w, v])
+        self.assertIsNone(fresh.dim)
+        with self.assertRaises(ValueError):
+            HNSWIndex(dim=-2)
+        with self.assertRaises(ValueError):
+            HNSWIndex(dim=2).add_vector(v)
+
+    def test_range_search(self):
+        exact, idx = self._random_indexes('cosine', n=300)
+        for query in self._random_vectors(5):
+            expected = {id for id, s in exact.search(query, top_k=300) if s >= 0.6}
+            results = list(idx.range_search(query, 0.6, ef=32))
+            found = {id for id, _ in results}
+            self.assertLessEqual(found, expected)
+            self.assertGreaterEqual(len(found), 0.9 * len(expected))
+            self.assertEqual(len(found), len(results))
+            self.assertTrue(all(s >= 0.6 for _, s in results))
+
+    def test_range_search_filter_and_errors(self):
+        exact, idx = self._filtered_index()
+        query = Vector(8)
+        query.data = [1] * 8
+        rare = list(idx.range_search(query, -1.0, filter={'rare': True}))
+        self.assertEqual(len(rare), 4)
+        self.assertEqual(list(HNSWIndex().range_search(query, 0.5)), [])
+        with self.assertRaises(TypeError):
+            idx.range_search([1] * 8, 0.5)
+        with self.assertRaises(TypeError):
+            idx.range_search(query, None)
+        with self.assertRaises(ValueError):
+            idx.range_search(Vector(3), 0.5)
+
+    def test_similarity_join(self):
+        exact, idx = self._random_indexes('cosine', n=300)
+        expected = {(a, b) for a, b, _ in exact.similarity_join(0.7)}
+        for num_threads in (1, 4):
+            pairs = list(idx.similarity_join(0.7, num_threads=num_threads))
+            found = {(a, b) for a, b, _ in pairs}
+            self.assertEqual(len(found), len(pairs))
+            self.assertLessEqual(found, expected)
+            self.assertGreaterEqual(len(found), 0.9 * len(expected))
+            self.assertTrue(all(a < b and s >= 0.7 for a, b, s in pairs))
+
+        exact, idx = self._filtered_index()
+        found = {(a, b) for a, b, _ in idx.similarity_join(-1.0, filter={'bucket': 1})}
+        self.assertEqual(len(found), 50 * 49 // 2)
+        self.assertTrue(all(a % 4 == 1 and b % 4 == 1 for a, b in found))
+        with self.assertRaises(TypeError):
+            idx.similarity_join('0.5')
+
+    def test_knn_graph(self):
+        exact, idx = self._random_indexes('l2', n=300)
+        expected = {(a, b) for a, b, _ in exact.knn_graph(5)}
+        edges = list(idx.knn_graph(5, num_threads=4))
+        self.assertEqual(len(edges), 300 * 5)
+        self.assertTrue(all(a != b for a, b, _ in edges))
+        self.assertGreaterEqual(len(expected & {(a, b) for a, b, _ in edges}), 0.85 * len(expected))
+        scores = [s for a, _, s in edges if a == 0]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+
+        # More neighbours than a base-layer row holds falls back to a search.
+        self.assertEqual(len(list(idx.knn_graph(20, num_threads=1))), 300 * 20)
+        self.assertEqual(list(HNSWIndex().knn_graph(3)), [])
+        with self.assertRaises(ValueError):
+            idx.knn_graph(0)
+
+
 if __name__ == "__main__":
     unittest.main()
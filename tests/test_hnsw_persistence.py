@@ -78,5 +78,50 @@ class TestHNSWPersistence(unittest.TestCase):
             load_hnsw_index('nonexistent.pkl', HNSWIndex)
 
 
+    def test_save_and_load_preserves_metric(self):
+        random.seed(42)
+        idx = HNSWIndex(metric='ip')
+        v = Vector(3)
+        v.data = [1, 2, 3]
+        idx.add_vector(v, id=1)
+        save_hnsw_index(idx, 'test_hnsw.pkl')
+
+        idx2 = load_hnsw_index('test_hnsw.pkl', HNSWIndex)
+        self.assertEqual(idx2.metric.name, 'ip')
+        query = Vector(3)
+        query.data = [1, 1, 1]
+        self.assertEqual(idx2.search(query, top_k=1), [(1, 6)])
+        os.remove('test_hnsw.pkl')
+
+
+    def test_save_and_load_preserves_attributes(self):
+        random.seed(42)
+        idx = HNSWIndex()
+        v = Vector(3)
+        v.data = [1, 2, 3]
+        idx.add_vector(v, id=1, attributes={'lang': 'en'})
+        save_hnsw_index(idx, 'test_hnsw.pkl')
+
+        idx2 = load_hnsw_index('test_hnsw.pkl', HNSWIndex)
+        self.assertEqual(idx2.get_attributes(1), {'lang': 'en'})
+        os.remove('test_hnsw.pkl')
+
+    def test_save_and_load_preserves_dimension(self):
+        random.seed(42)
+        idx = HNSWIndex()
+        v = Vector(3)
+        v.data = [1, 2, 3]
+        idx.add_vector(v, id=1)
+        save_hnsw_index(idx, 'test_hnsw.pkl')
+
+        idx2 = load_hnsw_index('test_hnsw.pkl', HNSWIndex)
+        self.assertEqual(idx2.dim, 3)
+        query = Vector(2)
+        query.data = [1, 2]
+        with self.assertRaises(ValueError):
+            idx2.search(query)
+        os.remove('test_hnsw.pkl')
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,154 @@
+import os
+import random
+import tempfile
+import unittest
+from neuroseek import Vector, Index
+from neuroseek.hybrid_index import HybridIndex
+from neuroseek.precision import HalfArray
+from neuroseek.benchmark import synthetic_dataset
+
+
+class TestHybridIndex(unittest.TestCase):
+    def setUp(self):
+        random.seed(11)
+        self.data = synthetic_dataset(300, 16)
+        self.exact = Index()
+        self.exact.add_vectors(self.data)
+        self.index = HybridIndex(M=8, efConstruction=64, graph_dtype='bfloat16', rerank_factor=4)
+        self.index.add_vectors(self.data, num_threads=1)
+
+    def test_invalid_rerank_factor(self):
+        with self.assertRaises(ValueError):
+            HybridIndex(rerank_factor=0)
+        with self.assertRaises(TypeError):
+            HybridIndex(rerank_factor=1.5)
+        with self.assertRaises(ValueError):
+            self.index.search(self.data[0], rerank_factor=0)
+
+    def test_storage_split(self):
+        self.assertEqual(len(self.index), 300)
+        self.assertIsInstance(self.index.graph.get_vector(0).data, HalfArray)
+        self.assertEqual(self.index.get_vector(0).data, self.data[0].data)
+        self.assertIsNot(self.index.get_vector(0), self.data[0])
+
+    def test_scores_are_exact(self):
+        query = synthetic_dataset(1, 16, seed=1)[0]
+        results = self.index.search(query, top_k=5)
+        self.assertEqual(len(results), 5)
+        for id, score in results:
+            self.assertAlmostEqual(score, query.cosine_similarity(self.data[id]), places=12)
+        self.assertEqual([s for _, s in results], sorted((s for _, s in results), reverse=True))
+
+    def test_recall_improves_with_rerank(self):
+        queries = synthetic_dataset(20, 16, seed=2)
+
+        def recall(**kwargs):
+            hits = 0
+            for query in queries:
+                truth = {id for id, _ in self.exact.search(query, top_k=10)}
+                hits += len(truth & {id for id, _ in self.index.search(query, top_k=10, **kwargs)})
+            return hits / (10 * len(queries))
+
+        self.assertGreaterEqual(recall(rerank_factor=4), recall(rerank_factor=1))
+        self.assertGreaterEqual(recall(rerank_factor=4), 0.9)
+
+    def test_filter_and_mutations(self):
+        index = HybridIndex(M=4, efConstruction=20, metric='l2')
+        for id, vector in enumerate(self.data[:40]):
+            index.add_vector(vector, id, {'even': id % 2 == 0})
+        query = self.data[3]
+        self.assertTrue(all(id % 2 == 0 for id, _ in index.search(query, 5, filter={'even': True})))
+        self.assertEqual(index.search(query, top_k=1)[0], (3, 0.0))
+
+        index.delete_vector(3)
+        self.assertNotIn(3, [id for id, _ in index.search(query, top_k=5)])
+        self.assertEqual(len(index), 39)
+
+        index.update_vector(5, query)
+        self.assertEqual(index.search(query, top_k=1)[0], (5, 0.0))
+        self.assertEqual(index.get_attributes(5), {'even': False})
+
+        index.delete_vectors([0, 2])
+        self.assertEqual(len(index.graph), 37)
+        index.update_vectors([6, 8], [self.data[100], self.data[101]])
+        self.assertEqual(index.search(self.data[101], top_k=1)[0], (8, 0.0))
+        self.assertEqual(index.get_attributes(8), {'even': True})
+
+    def test_failed_insert_rolls_back(self):
+        index = HybridIndex()
+        zero = Vector(16)
+        with self.assertRaises(ValueError):
+            index.add_vector(zero, 1)  # cosine rejects zero vectors in the graph
+        self.assertEqual(len(index), 0)
+        self.assertEqual(len(index.exact), 0)
+
+    def test_failed_update_changes_neither_store(self):
+        index = HybridIndex(M=4, efConstruction=20)
+        index.add_vectors(self.data[:10], num_threads=1)
+        for bad in (Vector(16), Vector(3)):
+            with self.assertRaises(ValueError):
+                index.update_vector(0, bad)
+            self.assertIn(0, index.exact.id_to_index)
+            self.assertIn(0, index.graph.id_to_node)
+            self.assertEqual(index.get_vector(0).data, self.data[0].data)
+        with self.assertRaises(TypeError):
+            index.update_vector(0, [1] * 16)
+        self.assertEqual(index.search(self.data[0], top_k=1)[0][0], 0)
+
+    def test_failed_batch_update_changes_neither_store(self):
+        index = HybridIndex(M=4, efConstruction=20)
+        index.add_vectors(self.data[:10], num_threads=1)
+        for vectors in ([self.data[20], Vector(16)], [self.data[20], Vector(3)]):
+            with self.assertRaises(ValueError):
+                index.update_vectors([1, 2], vectors)
+            for id in (1, 2):
+                self.assertEqual(index.exact.get_vector(id).data, self.data[id].data)
+                self.assertIn(id, index.graph.id_to_node)
+        with self.assertRaises(ValueError):
+            index.update_vectors([1, 42], self.data[20:22])
+        self.assertEqual(index.search(self.data[1], top_k=1)[0][0], 1)
+
+    def test_graph_dtype_rejections_change_neither_store(self):
+        index = HybridIndex(M=4, efConstruction=20)
+        index.add_vectors(self.data[:10], num_threads=1)
+        big = Vector(16)
+        big.data = [70000.0] + [1.0] * 15
+        tiny = Vector(16)
+        tiny.data = [1e-8] * 16
+        for bad in (big, tiny):
+            with self.assertRaises(ValueError):
+                index.update_vector(0, bad)
+            with self.assertRaises(ValueError):
+                index.update_vectors([1, 2], [self.data[20], bad])
+            self.assertEqual((len(index.exact), len(index.graph)), (10, 10))
+            for id in (0, 1, 2):
+                self.assertEqual(index.get_vector(id).data, self.data[id].data)
+        self.assertEqual(index.search(self.data[2], top_k=1)[0][0], 2)
+
+    def test_rerank_skips_unknown_ids(self):
+        query = self.data[0]
+        self.assertEqual(self.exact.rerank(query, [0, 10 ** 6], top_k=5)[0][0], 0)
+        self.assertEqual(len(self.exact.rerank(query, [1, 2, 3])), 3)
+        self.assertEqual(Index().rerank(query, [1]), [])
+
+    def test_memory_mapped_exact_store(self):
+        from neuroseek.datasets import map_npy
+        import struct
+        rows = [[random.gauss(0, 1) for _ in range(4)] for _ in range(50)]
+        header = repr({'descr': '<f8', 'fortran_order': False, 'shape': (50, 4)}).encode('latin1')
+        header += b' ' * (63 - (len(header) + 10) % 64) + b'\n'
+        body = b''.join(struct.pack('<4d', *row) for row in rows)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'base.npy')
+            with open(path, 'wb') as f:
+                f.write(b'\x93NUMPY\x01\x00' + struct.pack('<H', len(header)) + header + body)
+            vectors = map_npy(path)
+            index = HybridIndex(M=4, efConstruction=20, metric='ip', copy_vectors=False)
+            index.add_vectors(vectors, num_threads=1)
+            self.assertIsInstance(index.get_vector(7).data, memoryview)
+            results = index.search(vectors[7], top_k=3)
+            self.assertEqual(results[0][1], vectors[7].dot(vectors[results[0][0]]))
+
+
+if __name__ == "__main__":
+    unittest.main()
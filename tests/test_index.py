@@ -459,8 +459,9 @@ class TestIndex(unittest.TestCase):
         idx.add_vector(v1, 1)
         v2 = Vector(2)
         v2.data = [4, 5]
-        idx.update_vector(1, v2)
-        self.assertEqual(len(idx.vectors[0][1].data), 2)
+        with self.assertRaises(ValueError):
+            idx.update_vector(1, v2)
+        self.assertEqual(len(idx.vectors[0][1].data), 3)
 
     def test_update_vector_search_after_update(self):
         idx = Index()
@@ -476,6 +477,524 @@ class TestIndex(unittest.TestCase):
         self.assertEqual(old[0], 2)
         self.assertEqual(list(old[1].data), [0, 1, 0])
 
+    def test_stored_rows_are_copies(self):
+        # Mutating a Vector after adding it must not leave the cached norm stale.
+        index = Index()
+        a = Vector(2)
+        a.data = [1, 0]
+        index.add_vector(a, 0)
+        a *= 10
+        a[0] = 5
+        query = Vector(2)
+        query.data = [1, 0]
+        self.assertEqual(index.search(query, top_k=1), [(0, 1.0)])
+        self.assertEqual(list(index.get_vector(0).data), [1, 0])
+
+        shared = Index(copy_vectors=False)
+        shared.add_vector(a, 0)
+        self.assertIs(shared.get_vector(0), a)
+
+    def test_get_vector_returns_copy(self):
+        index = Index()
+        a = Vector(2)
+        a.data = [1, 0]
+        index.add_vector(a, 0)
+        got = index.get_vector(0)
+        got[0] = 5
+        got += got
+        query = Vector(2)
+        query.data = [1, 0]
+        self.assertEqual(index.search(query, top_k=1), [(0, 1.0)])
+        self.assertEqual(list(index.get_vector(0).data), [1, 0])
+
+    def test_update_vector_stores_copy(self):
+        idx = Index(metric='l2')
+        v = Vector(2)
+        v.data = [1, 2]
+        idx.add_vector(v, 0)
+        new = Vector(2)
+        new.data = [3, 4]
+        idx.update_vector(0, new)
+        idx.update_vectors([0], [new])
+        new[0] = 100
+        self.assertEqual(idx.search(idx.get_vector(0), top_k=1), [(0, 0)])
+        self.assertEqual(list(idx.get_vector(0).data), [3, 4])
+
+    def test_delete_vectors(self):
+        idx = Index()
+        for i in range(10):
+            v = Vector(2)
+            v.data = [1, i]
+            idx.add_vector(v, i, {'even': i % 2 == 0})
+        deleted = idx.delete_vectors([7, 2, 4])
+        self.assertEqual([id for id, _ in deleted], [7, 2, 4])
+        self.assertEqual([id for id, _ in idx.vectors], [0, 1, 3, 5, 6, 8, 9])
+        self.assertEqual(len(idx._aux), 7)
+        self.assertTrue(all(idx.vectors[i][0] == id for id, i in idx.id_to_index.items()))
+        self.assertEqual(idx.search(idx.get_vector(8), top_k=1)[0][0], 8)
+        self.assertEqual([id for id, _ in idx.search(idx.get_vector(0), top_k=10, filter={'even': True})],
+                         [0, 6, 8])
+        self.assertEqual(idx.delete_vectors([]), [])
+
+    def test_delete_vectors_validates_before_deleting(self):
+        idx = Index()
+        for i in range(3):
+            v = Vector(2)
+            v.data = [1, i]
+            idx.add_vector(v, i)
+        with self.assertRaises(ValueError):
+            idx.delete_vectors([0, 5])
+        with self.assertRaises(ValueError):
+            idx.delete_vectors([1, 1])
+        with self.assertRaises(TypeError):
+            idx.delete_vectors([0, '1'])
+        self.assertEqual(len(idx), 3)
+
+    def test_update_vectors(self):
+        idx = Index(metric='l2')
+        for i in range(5):
+            v = Vector(2)
+            v.data = [i, 0]
+            idx.add_vector(v, i)
+        new = []
+        for i in range(2):
+            v = Vector(2)
+            v.data = [0, 10 + i]
+            new.append(v)
+        old = idx.update_vectors([1, 3], new)
+        self.assertEqual([(id, list(v.data)) for id, v in old], [(1, [1, 0]), (3, [3, 0])])
+        self.assertEqual(idx.search(new[1], top_k=1), [(3, 0)])
+
+        bad = Vector(3)
+        bad.data = [1, 2, 3]
+        with self.assertRaises(ValueError):
+            idx.update_vectors([0, 2], [new[0], bad])
+        with self.assertRaises(ValueError):
+            idx.update_vectors([0], new)
+        with self.assertRaises(ValueError):
+            idx.update_vectors([0, 0], new)
+        self.assertEqual(list(idx.get_vector(0).data), [0, 0])
+
+
+    def test_index_default_metric_is_cosine(self):
+        idx = Index()
+        self.assertEqual(idx.metric.name, 'cosine')
+
+    def test_index_invalid_metric_raises(self):
+        with self.assertRaises(ValueError):
+            Index(metric='hamming')
+
+    def test_search_inner_product_metric(self):
+        idx = Index(metric='ip')
+        v1 = Vector(2)
+        v1.data = [1, 0]
+        idx.add_vector(v1, 1)
+        v2 = Vector(2)
+        v2.data = [3, 3]
+        idx.add_vector(v2, 2)
+        query = Vector(2)
+        query.data = [1, 0]
+        results = idx.search(query, 2)
+        self.assertEqual(results, [(2, 3), (1, 1)])
+
+    def test_search_l2_metric(self):
+        idx = Index(metric='l2')
+        v1 = Vector(2)
+        v1.data = [1, 0]
+        idx.add_vector(v1, 1)
+        v2 = Vector(2)
+        v2.data = [3, 3]
+        idx.add_vector(v2, 2)
+        query = Vector(2)
+        query.data = [2, 2]
+        results = idx.search(query, 2)
+        self.assertEqual(results, [(2, -2), (1, -5)])
+
+    def test_search_l2_after_update(self):
+        idx = Index(metric='l2')
+        v1 = Vector(2)
+        v1.data = [1, 0]
+        idx.add_vector(v1, 1)
+        v2 = Vector(2)
+        v2.data = [5, 5]
+        idx.add_vector(v2, 2)
+        v3 = Vector(2)
+        v3.data = [0, 1]
+        idx.update_vector(2, v3)
+        idx.delete_vector(1)
+        query = Vector(2)
+        query.data = [0, 1]
+        self.assertEqual(idx.search(query, 1), [(2, 0)])
+
+    def test_search_cosine_zero_vector_raises(self):
+        idx = Index()
+        v = Vector(2)
+        idx.add_vector(v, 1)
+        query = Vector(2)
+        query.data = [1, 0]
+        with self.assertRaises(ValueError):
+            idx.search(query, 1)
+
+
+    def _filtered_index(self):
+        idx = Index()
+        for i in range(6):
+            v = Vector(2)
+            v.data = [1, i]
+            idx.add_vector(v, i, attributes={'parity': i % 2})
+        return idx
+
+    def test_add_vector_with_attributes(self):
+        idx = self._filtered_index()
+        self.assertEqual(idx.get_attributes(3), {'parity': 1})
+
+    def test_add_vector_invalid_attributes_raises(self):
+        idx = Index()
+        v = Vector(2)
+        v.data = [1, 0]
+        with self.assertRaises(TypeError):
+            idx.add_vector(v, 1, attributes='even')
+
+    def test_set_attributes(self):
+        idx = self._filtered_index()
+        idx.set_attributes(0, {'parity': 1})
+        self.assertEqual(idx.get_attributes(0), {'parity': 1})
+
+    def test_set_attributes_nonexistent_raises(self):
+        idx = Index()
+        with self.assertRaises(ValueError):
+            idx.set_attributes(1, {'parity': 1})
+
+    def test_search_with_filter(self):
+        idx = self._filtered_index()
+        query = Vector(2)
+        query.data = [1, 0]
+        results = idx.search(query, 3, filter={'parity': 1})
+        self.assertEqual([id for id, _ in results], [1, 3, 5])
+
+    def test_search_with_callable_filter(self):
+        idx = self._filtered_index()
+        query = Vector(2)
+        query.data = [1, 0]
+        results = idx.search(query, 6, filter=lambda attributes: attributes['parity'] == 0)
+        self.assertEqual([id for id, _ in results], [0, 2, 4])
+
+    def test_search_with_filter_after_delete(self):
+        idx = self._filtered_index()
+        idx.delete_vector(1)
+        query = Vector(2)
+        query.data = [1, 0]
+        results = idx.search(query, 3, filter={'parity': 1})
+        self.assertEqual([id for id, _ in results], [3, 5])
+
+    def test_search_with_filter_no_match(self):
+        idx = self._filtered_index()
+        query = Vector(2)
+        query.data = [1, 0]
+        self.assertEqual(idx.search(query, 3, filter={'parity': 2}), [])
+
+
+    def test_num_threads_default(self):
+        # Threads only pay off when the GIL is disabled.
+        import os
+        import sys
+        idx = Index()
+        if getattr(sys, '_is_gil_enabled', lambda: True)():
+            self.assertEqual(idx.num_threads, 1)
+        else:
+            self.assertEqual(idx.num_threads, os.cpu_count() or 1)
+
+    def test_num_threads_invalid_raises(self):
+        with self.assertRaises(ValueError):
+            Index(num_threads=0)
+        with self.assertRaises(TypeError):
+            Index(num_threads=2.0)
+
+    def _parallel_and_serial(self):
+        import random
+        random.seed(5)
+        serial = Index(num_threads=1)
+        parallel = Index(num_threads=4)
+        parallel.min_block_size = 8
+        for i in range(100):
+            v = Vector(4)
+            v.data = [random.randint(-3, 3) or 1 for _ in range(4)]
+            serial.add_vector(v, i)
+            parallel.add_vector(v, i)
+        return serial, parallel
+
+    def test_parallel_search_matches_serial(self):
+        serial, parallel = self._parallel_and_serial()
+        query = Vector(4)
+        query.data = [1, -2, 0.5, 3]
+        for top_k in (1, 7, 100, 150):
+            self.assertEqual(parallel.search(query, top_k), serial.search(query, top_k))
+        self.assertIsNotNone(parallel._executor)
+
+    def test_parallel_search_with_filter(self):
+        serial, parallel = self._parallel_and_serial()
+        for idx in (serial, parallel):
+            for i in range(0, 100, 3):
+                idx.set_attributes(i, {'keep': True})
+        query = Vector(4)
+        query.data = [2, 1, -1, 0]
+        self.assertEqual(parallel.search(query, 10, filter={'keep': True}),
+                         serial.search(query, 10, filter={'keep': True}))
+
+    def test_parallel_search_propagates_errors(self):
+        serial, parallel = self._parallel_and_serial()
+        parallel.add_vector(Vector(4), 1000)
+        query = Vector(4)
+        query.data = [1, 0, 0, 0]
+        with self.assertRaises(ValueError):
+            parallel.search(query, 5)
+
+
+    def test_search_batch_matches_search(self):
+        serial, parallel = self._parallel_and_serial()
+        queries = []
+        for i in range(3):
+            q = Vector(4)
+            q.data = [i + 1, -1, 2, 0.5]
+            queries.append(q)
+        expected = [serial.search(q, 5) for q in queries]
+        self.assertEqual(serial.search_batch(queries, 5), expected)
+        self.assertEqual(parallel.search_batch(queries, 5), expected)
+
+    def test_search_batch_empty(self):
+        idx = Index()
+        q = Vector(2)
+        q.data = [1, 0]
+        self.assertEqual(idx.search_batch([q, q], 3), [[], []])
+        self.assertEqual(idx.search_batch([], 3), [])
+
+    def test_search_batch_invalid_query_raises(self):
+        idx = self._filtered_index()
+        with self.assertRaises(TypeError):
+            idx.search_batch([[1, 0]], 3)
+
+
+    def test_add_vectors(self):
+        idx = Index()
+        vectors = []
+        for i in range(3):
+            v = Vector(2)
+            v.data = [i, 1]
+            vectors.append(v)
+        ids = idx.add_vectors(vectors, ids=[5, 6, 7], attributes=[{'a': 1}, None, None])
+        self.assertEqual(ids, [5, 6, 7])
+        self.assertEqual(idx.get_attributes(5), {'a': 1})
+        self.assertEqual(idx.add_vectors(vectors[:1]), [0])
+
+    def test_add_vectors_validates_before_inserting(self):
+        idx = Index()
+        v = Vector(2)
+        v.data = [1, 1]
+        idx.add_vector(v, 1)
+        with self.assertRaises(ValueError):
+            idx.add_vectors([v, v], ids=[2, 1])
+        with self.assertRaises(ValueError):
+            idx.add_vectors([v, v], ids=[3, 3])
+        with self.assertRaises(ValueError):
+            idx.add_vectors([v, v], ids=[3])
+        with self.assertRaises(TypeError):
+            idx.add_vectors([v, [1, 2]])
+        self.assertEqual(len(idx), 1)
+
+    def test_callable_filter_sees_rows_without_attributes(self):
+        idx = Index()
+        for i in range(4):
+            v = Vector(2)
+            v.data = [1, i]
+            idx.add_vector(v, i, {'lang': 'en'} if i % 2 else None)
+        query = Vector(2)
+        query.data = [1, 0]
+        self.assertEqual(len(idx.search(query, 5, filter=lambda a: True)), 4)
+        self.assertEqual([id for id, _ in idx.search(query, 5, filter=lambda a: a.get('lang') != 'en')], [0, 2])
+
+    def test_add_vectors_auto_ids_skip_explicit_ids(self):
+        idx = Index()
+        a = Vector(2)
+        a.data = [1, 0]
+        b = Vector(2)
+        b.data = [0, 1]
+        self.assertEqual(idx.add_vectors([a, b], ids=[None, 0]), [1, 0])
+        self.assertEqual(idx.search(a, top_k=1)[0][0], 1)
+        self.assertEqual(idx.add_vectors([a, a], ids=[None, 3]), [2, 3])
+        self.assertEqual(idx.add_vector(b), 4)
+
+    def test_dimension_fixed_by_first_insert(self):
+        idx = Index()
+        self.assertIsNone(idx.dim)
+        v = Vector(3)
+        v.data = [1, 2, 3]
+        idx.add_vector(v, 1)
+        self.assertEqual(idx.dim, 3)
+        w = Vector(2)
+        w.data = [1, 2]
+        with self.assertRaises(ValueError):
+            idx.add_vector(w, 2)
+        self.assertEqual(len(idx), 1)
+        idx.delete_vector(1)
+        self.assertEqual(idx.dim, 3)
+
+    def test_dimension_given_at_creation(self):
+        idx = Index(dim=2)
+        v = Vector(3)
+        v.data = [1, 2, 3]
+        with self.assertRaises(ValueError):
+            idx.add_vector(v)
+        with self.assertRaises(ValueError):
+            Index(dim=-1)
+        with self.assertRaises(ValueError):
+            Index(dim='3')
+
+    def test_add_vectors_checks_batch_dimension_first(self):
+        idx = Index()
+        a = Vector(2)
+        a.data = [1, 2]
+        b = Vector(3)
+        b.data = [1, 2, 3]
+        with self.assertRaises(ValueError):
+            idx.add_vectors([a, b])
+        self.assertEqual(len(idx), 0)
+        self.assertIsNone(idx.dim)
+
+    def test_range_search(self):
+        idx = Index()
+        for id, data in enumerate([[1, 0], [0.9, 0.1], [0, 1], [-1, 0]]):
+            v = Vector(2)
+            v.data = data
+            idx.add_vector(v, id, {'group': id % 2})
+        query = Vector(2)
+        query.data = [1, 0]
+        results = idx.range_search(query, 0.9)
+        self.assertNotIsInstance(results, list)
+        self.assertEqual([id for id, _ in results], [0, 1])
+        self.assertEqual(list(idx.range_search(query, 2)), [])
+        self.assertEqual([id for id, _ in idx.range_search(query, -1)], [0, 1, 2, 3])
+        self.assertEqual([id for id, _ in idx.range_search(query, 0.5, filter={'group': 1})], [1])
+
+    def test_range_search_matches_full_scan_across_blocks(self):
+        import random
+        random.seed(21)
+        idx = Index(metric='l2')
+        idx.min_block_size = 16
+        for i in range(100):
+            v = Vector(4)
+            v.data = [random.uniform(-1, 1) for _ in range(4)]
+            idx.add_vector(v, i)
+        query = Vector(4)
+        query.data = [0, 0, 0, 0]
+        expected = [(id, s) for id, s in idx.search(query, top_k=100) if s >= -0.5]
+        self.assertEqual(sorted(idx.range_search(query, -0.5)), sorted(expected))
+
+    def test_range_search_validates_eagerly(self):
+        idx = Index()
+        v = Vector(2)
+        v.data = [1, 0]
+        idx.add_vector(v, 0)
+        with self.assertRaises(TypeError):
+            idx.range_search([1, 0], 0.5)
+        with self.assertRaises(TypeError):
+            idx.range_search(v, '0.5')
+        query = Vector(3)
+        query.data = [1, 0, 0]
+        with self.assertRaises(ValueError):
+            idx.range_search(query, 0.5)
+        self.assertEqual(list(Index().range_search(v, 0.5)), [])
+
+    def test_search_iter_matches_search(self):
+        import random
+        random.seed(22)
+        idx = Index(metric='l2')
+        idx.min_block_size = 16
+        for i in range(100):
+            v = Vector(3)
+            v.data = [random.choice([0, 1, 2]) for _ in range(3)]  # many ties
+            idx.add_vector(v, i, {'odd': i % 2 == 1})
+        query = Vector(3)
+        query.data = [1, 1, 1]
+        self.assertEqual(list(idx.search_iter(query, page_size=3)), idx.search(query, top_k=100))
+        self.assertEqual(list(idx.search_iter(query, filter={'odd': True}, page_size=7)),
+                         idx.search(query, top_k=100, filter={'odd': True}))
+
+    def test_search_iter_is_lazy(self):
+        from itertools import islice
+        idx = Index()
+        for i in range(50):
+            v = Vector(2)
+            v.data = [1, i]
+            idx.add_vector(v, i)
+        query = Vector(2)
+        query.data = [0, 1]
+        results = idx.search_iter(query, page_size=4)
+        self.assertNotIsInstance(results, list)
+        self.assertEqual(list(islice(results, 5)), idx.search(query, top_k=5))
+
+        # Rows added after the call are not seen by the iterator.
+        results = idx.search_iter(query)
+        v = Vector(2)
+        v.data = [0, 1]
+        idx.add_vector(v, 50)
+        self.assertEqual(len(list(results)), 50)
+
+    def test_search_iter_validates_eagerly(self):
+        idx = Index()
+        v = Vector(2)
+        v.data = [1, 0]
+        idx.add_vector(v, 0)
+        with self.assertRaises(TypeError):
+            idx.search_iter([1, 0])
+        with self.assertRaises(TypeError):
+            idx.search_iter(v, page_size=2.5)
+        with self.assertRaises(ValueError):
+            idx.search_iter(v, page_size=0)
+        query = Vector(3)
+        query.data = [1, 0, 0]
+        with self.assertRaises(ValueError):
+            idx.search_iter(query)
+        self.assertEqual(list(Index().search_iter(v)), [])
+
+    def test_similarity_join_matches_pairwise_search(self):
+        import random
+        random.seed(23)
+        for num_threads in (1, 4):
+            idx = Index(metric='l2', num_threads=num_threads)
+            idx.join_block_size = 7
+            idx.min_block_size = 16
+            for i in range(60):
+                v = Vector(3)
+                v.data = [random.uniform(-1, 1) for _ in range(3)]
+                idx.add_vector(v, i, {'even': i % 2 == 0})
+            expected = {(a, b) for a in range(60) for b, s in idx.search(idx.get_vector(a), top_k=60)
+                        if a < b and s >= -0.3}
+            pairs = list(idx.similarity_join(-0.3))
+            self.assertEqual({(a, b) for a, b, _ in pairs}, expected)
+            self.assertEqual(len(pairs), len(expected))
+            self.assertTrue(all(s >= -0.3 for _, _, s in pairs))
+            self.assertTrue(all(a % 2 == 0 and b % 2 == 0 for a, b, _ in idx.similarity_join(-0.3, {'even': True})))
+        with self.assertRaises(TypeError):
+            idx.similarity_join(None)
+        self.assertEqual(list(Index().similarity_join(0.5)), [])
+
+    def test_knn_graph(self):
+        idx = Index(metric='l2')
+        idx.join_block_size = 3
+        for i in range(10):
+            v = Vector(1)
+            v.data = [i * i]
+            idx.add_vector(v, i)
+        edges = list(idx.knn_graph(2))
+        self.assertEqual(len(edges), 20)
+        self.assertEqual(edges[:4], [(0, 1, -1), (0, 2, -16), (1, 0, -1), (1, 2, -9)])
+        self.assertEqual([b for a, b, _ in edges if a == 9], [8, 7])
+        self.assertEqual(len(list(idx.knn_graph(20))), 90)
+        with self.assertRaises(ValueError):
+            idx.knn_graph(0)
+        with self.assertRaises(TypeError):
+            idx.knn_graph(1.5)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -121,5 +121,48 @@ class TestPersistence(unittest.TestCase):
         os.remove('test_save.pkl')
 
 
+    def test_save_and_load_preserves_metric(self):
+        idx = Index(metric='l2')
+        v = Vector(2)
+        v.data = [1, 2]
+        idx.add_vector(v, 1)
+        save_index(idx, 'test_save.pkl')
+
+        idx2 = Index()
+        load_index(idx2, 'test_save.pkl')
+        self.assertEqual(idx2.metric.name, 'l2')
+        query = Vector(2)
+        query.data = [1, 0]
+        self.assertEqual(idx2.search(query, 1), [(1, -4)])
+        os.remove('test_save.pkl')
+
+
+    def test_save_and_load_preserves_attributes(self):
+        idx = Index()
+        v = Vector(2)
+        v.data = [1, 2]
+        idx.add_vector(v, 1, attributes={'lang': 'en'})
+        save_index(idx, 'test_save.pkl')
+
+        idx2 = Index()
+        load_index(idx2, 'test_save.pkl')
+        self.assertEqual(idx2.get_attributes(1), {'lang': 'en'})
+        query = Vector(2)
+        query.data = [1, 0]
+        self.assertEqual(len(idx2.search(query, 1, filter={'lang': 'en'})), 1)
+        os.remove('test_save.pkl')
+
+    def test_save_and_load_preserves_dimension(self):
+        idx = Index(dim=3)
+        save_index(idx, 'test_save.pkl')
+        idx2 = load_index(Index(), 'test_save.pkl')
+        self.assertEqual(idx2.dim, 3)
+        v = Vector(2)
+        v.data = [1, 2]
+        with self.assertRaises(ValueError):
+            idx2.add_vector(v)
+        os.remove('test_save.pkl')
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,197 @@
+import os
+import pickle
+import random
+import tempfile
+import unittest
+from array import array
+from neuroseek.vector import Vector
+from neuroseek.index import Index
+from neuroseek.hnsw_index import HNSWIndex
+from neuroseek.persistence import save_index, load_index
+from neuroseek.hnsw_persistence import save_hnsw_index, load_hnsw_index
+from neuroseek.precision import HalfArray, encode, decode, decode_rows, check_dtype
+from neuroseek.benchmark import synthetic_dataset
+
+
+class TestPrecision(unittest.TestCase):
+    def test_check_dtype(self):
+        check_dtype(None)
+        check_dtype('bfloat16')
+        with self.assertRaises(ValueError):
+            check_dtype('int8')
+        with self.assertRaises(ValueError):
+            Index(dtype='float8')
+        with self.assertRaises(ValueError):
+            HNSWIndex(dtype='float8')
+
+    def test_encode_decode(self):
+        values = [1.0, -2.5, 0.1, 65504.0]
+        self.assertEqual(len(encode(values, 'float16')), 8)
+        half = decode(encode(values, 'float16'), 'float16')
+        self.assertEqual(half[:2], (1.0, -2.5))
+        self.assertAlmostEqual(half[2], 0.1, places=3)
+        self.assertEqual(half[3], 65504.0)
+
+        brain = decode(encode(values, 'bfloat16'), 'bfloat16')
+        self.assertEqual(brain[:2], (1.0, -2.5))
+        self.assertAlmostEqual(brain[2], 0.1, places=2)
+        self.assertAlmostEqual(brain[3], 65504.0, delta=256)
+
+    def test_bfloat16_rounds_to_nearest(self):
+        # 1 + 2**-8 is exactly halfway between two bfloat16 values and rounds
+        # to the even one; slightly more rounds up.
+        self.assertEqual(decode(encode([1 + 2 ** -8], 'bfloat16'), 'bfloat16')[0], 1.0)
+        self.assertEqual(decode(encode([1 + 2 ** -8 + 2 ** -12], 'bfloat16'), 'bfloat16')[0], 1 + 2 ** -7)
+
+    def test_out_of_range_values_raise(self):
+        big = Vector(2)
+        big.data = [1.0, 70000.0]
+        with self.assertRaises(ValueError) as cm:
+            encode(big.data, 'float16')
+        self.assertIn('65504', str(cm.exception))
+        with self.assertRaises(ValueError):
+            big.astype('float16')
+        huge = Vector(2)
+        huge.data = [1e39, 0.0]
+        with self.assertRaises(ValueError):
+            huge.astype('bfloat16')
+        self.assertEqual(big.astype('bfloat16').data[1], 70144.0)
+        with self.assertRaises(ValueError):
+            HalfArray([3.4e38], 'bfloat16')
+        self.assertEqual(HalfArray([3.38e38, float('inf')], 'bfloat16')[1], float('inf'))
+
+        for index in (Index(metric='ip', dtype='float16'), HNSWIndex(metric='ip', dtype='float16')):
+            with self.assertRaises(ValueError):
+                index.add_vector(big, 0)
+            self.assertEqual(len(index), 0)
+
+    def test_batch_with_out_of_range_row_inserts_nothing(self):
+        ok = synthetic_dataset(2, 2)
+        big = Vector(2)
+        big.data = [70000.0, 1.0]
+        for index in (Index(metric='ip', dtype='float16'), HNSWIndex(metric='ip', dtype='float16')):
+            with self.assertRaises(ValueError):
+                index.add_vectors(ok + [big])
+            self.assertEqual(len(index), 0)
+
+    def test_rows_underflowing_to_zero_are_rejected(self):
+        tiny = Vector(2)
+        tiny.data = [1e-8, 1e-8]
+        for index in (Index(dtype='float16'), HNSWIndex(dtype='float16')):
+            index.add_vectors(synthetic_dataset(3, 2))
+            with self.assertRaises(ValueError):
+                index.add_vector(tiny, 10)
+            with self.assertRaises(ValueError):
+                index.update_vectors([0], [tiny])
+            self.assertEqual(len(index), 3)
+            self.assertEqual(len(index.search(synthetic_dataset(1, 2, seed=4)[0], top_k=3)), 3)
+        # Full precision keeps them, and the l2 metric has no zero-norm rule.
+        Index().add_vector(tiny)
+        Index(metric='l2', dtype='float16').add_vector(tiny)
+
+    def test_half_array_sequence(self):
+        a = HalfArray([1.0, 2.0, 3.0], 'float16')
+        self.assertEqual(len(a), 3)
+        self.assertEqual(list(a), [1.0, 2.0, 3.0])
+        self.assertEqual(a[-1], 3.0)
+        self.assertEqual(a[1:], [2.0, 3.0])
+        a[0] = 0.5
+        self.assertEqual(a.tolist(), [0.5, 2.0, 3.0])
+        self.assertEqual(HalfArray.frombytes(a.tobytes()), a)
+        self.assertEqual(pickle.loads(pickle.dumps(a)), a)
+        with self.assertRaises(IndexError):
+            a[3]
+        with self.assertRaises(ValueError):
+            HalfArray.frombytes(b'\x00')
+        with self.assertRaises(ValueError):
+            HalfArray([1.0], 'float32')
+
+    def test_decode_rows(self):
+        rows = [HalfArray([1, 2], 'bfloat16'), HalfArray([3, 4], 'bfloat16')]
+        self.assertEqual(decode_rows(rows, 'bfloat16', 2), [(1.0, 2.0), (3.0, 4.0)])
+
+    def test_vector_astype(self):
+        v = Vector(3)
+        v.data = [1, 2, 3]
+        self.assertEqual(v.astype('float64').data, [1.0, 2.0, 3.0])
+        self.assertIsInstance(v.astype('float32').data, array)
+        half = v.astype('float16')
+        self.assertIsInstance(half.data, HalfArray)
+        self.assertEqual(len(half), 3)
+        self.assertTrue(half == v)
+        self.assertEqual(half.dot(v), 14.0)
+        self.assertEqual(v.data, [1, 2, 3])
+
+    def _recall(self, index, exact, queries, k=10, **kwargs):
+        hits = 0
+        for query in queries:
+            truth = {id for id, _ in exact.search(query, top_k=k)}
+            hits += len(truth & {id for id, _ in index.search(query, top_k=k, **kwargs)})
+        return hits / (k * len(queries))
+
+    def test_index_half_precision_recall(self):
+        data = synthetic_dataset(300, 16)
+        queries = synthetic_dataset(10, 16, seed=1)
+        exact = Index()
+        exact.add_vectors(data)
+        for dtype in ('float32', 'float16', 'bfloat16'):
+            index = Index(dtype=dtype)
+            index.upcast_block_size = 64
+            index.add_vectors(data)
+            self.assertGreaterEqual(self._recall(index, exact, queries), 0.9, dtype)
+            for (id, similarity), (_, expected) in zip(index.search(queries[0], top_k=3),
+                                                      exact.search(queries[0], top_k=3)):
+                self.assertAlmostEqual(similarity, expected, places=1)
+
+    def test_index_half_precision_filter_and_update(self):
+        index = Index(metric='l2', dtype='float16')
+        for i, vector in enumerate(synthetic_dataset(20, 4)):
+            index.add_vector(vector, i, {'even': i % 2 == 0})
+        self.assertIsInstance(index.get_vector(0).data, HalfArray)
+        self.assertTrue(all(id % 2 == 0 for id, _ in index.search(synthetic_dataset(1, 4)[0], 5, filter={'even': True})))
+        target = Vector(4)
+        target.data = [9, 9, 9, 9]
+        index.update_vector(3, target)
+        self.assertEqual(index.search(target, top_k=1)[0][0], 3)
+
+    def test_hnsw_half_precision_recall(self):
+        random.seed(5)
+        data = synthetic_dataset(300, 16)
+        queries = synthetic_dataset(10, 16, seed=1)
+        exact = Index()
+        exact.add_vectors(data)
+        index = HNSWIndex(M=8, efConstruction=64, dtype='bfloat16')
+        for id, vector in enumerate(data):
+            index.add_vector(vector, id)
+        self.assertIsInstance(index.get_vector(0).data, HalfArray)
+        self.assertGreaterEqual(self._recall(index, exact, queries, ef=64), 0.8)
+
+    def test_snapshots_keep_dtype_and_shrink(self):
+        data = synthetic_dataset(100, 64)
+        with tempfile.TemporaryDirectory() as tmp:
+            sizes = {}
+            for dtype in (None, 'float16'):
+                index = Index(dtype=dtype)
+                index.add_vectors(data)
+                filename = os.path.join(tmp, f'{dtype}.pkl')
+                save_index(index, filename)
+                sizes[dtype] = os.path.getsize(filename)
+                loaded = load_index(Index(), filename)
+                self.assertEqual(loaded.dtype, dtype)
+                self.assertEqual(loaded.search(data[0], top_k=1)[0][0], 0)
+            self.assertLess(sizes['float16'], sizes[None] / 2)
+
+            random.seed(9)
+            hnsw = HNSWIndex(M=4, efConstruction=20, dtype='float16')
+            for id, vector in enumerate(data[:30]):
+                hnsw.add_vector(vector, id)
+            filename = os.path.join(tmp, 'hnsw.pkl')
+            save_hnsw_index(hnsw, filename)
+            loaded = load_hnsw_index(filename, HNSWIndex)
+            self.assertEqual(loaded.dtype, 'float16')
+            self.assertIsInstance(loaded.get_vector(0).data, HalfArray)
+            self.assertEqual(loaded.search(data[0], top_k=1)[0][0], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+import unittest
+import os
+import random
+import tempfile
+import threading
+from neuroseek import Vector, Index
+from neuroseek.hnsw_index import HNSWIndex
+from neuroseek.server import make_server, Client, OP_SEARCH, STATUS_VALUE_ERROR, _HEADER, _read_frame
+
+
+class TestServer(unittest.TestCase):
+    def _vector(self, data):
+        v = Vector(len(data))
+        v.data = list(data)
+        return v
+
+    def _serve(self, index, address=('127.0.0.1', 0), num_workers=4, **kwargs):
+        server = make_server(index, address, num_workers=num_workers, **kwargs)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+
+        def stop():
+            server.shutdown()
+            server.server_close()
+            thread.join()
+
+        self.addCleanup(stop)
+        return server.server_address
+
+    def _index(self):
+        idx = Index()
+        idx.add_vector(self._vector([1, 0, 0]), 1)
+        idx.add_vector(self._vector([0, 1, 0]), 2)
+        idx.add_vector(self._vector([1, 1, 0]), 3)
+        return idx
+
+    def test_search(self):
+        idx = self._index()
+        address = self._serve(idx)
+        with Client(address) as client:
+            query = self._vector([1, 0, 0])
+            results = client.search(query, 2)
+            self.assertEqual([id for id, _ in results], [id for id, _ in idx.search(query, 2)])
+            for (_, score), (_, expected) in zip(results, idx.search(query, 2)):
+                self.assertAlmostEqual(score, expected)
+
+    def test_keep_alive_multiple_requests(self):
+        address = self._serve(self._index())
+        with Client(address) as client:
+            for _ in range(20):
+                self.assertEqual(client.search(self._vector([0, 1, 0]), 1)[0][0], 2)
+
+    def test_search_batch(self):
+        idx = self._index()
+        address = self._serve(idx)
+        queries = [self._vector([1, 0, 0]), self._vector([0, 1, 0])]
+        with Client(address) as client:
+            batch = client.search_batch(queries, 1)
+        self.assertEqual([results[0][0] for results in batch], [1, 2])
+
+    def test_add_and_delete(self):
+        idx = self._index()
+        address = self._serve(idx)
+        with Client(address) as client:
+            self.assertEqual(client.add_vector(self._vector([0, 0, 1]), 10), 10)
+            self.assertEqual(client.search(self._vector([0, 0, 1]), 1)[0][0], 10)
+            auto_id = client.add_vector(self._vector([0, 0, 2]))
+            self.assertIn(auto_id, idx.id_to_index)
+            client.delete_vector(10)
+            self.assertNotIn(10, idx.id_to_index)
+
+    def test_errors_are_reported(self):
+        address = self._serve(self._index())
+        with Client(address) as client:
+            with self.assertRaises(ValueError):
+                client.delete_vector(999)
+            with self.assertRaises(ValueError):
+                client.search(self._vector([1, 0]), 1)
+            # The connection stays usable after an error.
+            self.assertEqual(client.search(self._vector([1, 0, 0]), 1)[0][0], 1)
+
+    def test_oversized_frame_is_rejected(self):
+        address = self._serve(self._index(), max_frame_size=64)
+        with Client(address) as client:
+            client._socket.settimeout(5)
+            # Only the header is sent; the server must answer without
+            # waiting for (or allocating) the announced payload.
+            client._wfile.write(_HEADER.pack(2 ** 32 - 1, OP_SEARCH))
+            client._wfile.flush()
+            status, response = _read_frame(client._rfile)
+            self.assertEqual(status, STATUS_VALUE_ERROR)
+            self.assertIn(b"exceeds the maximum of 64 bytes", response)
+            with self.assertRaises(EOFError):
+                _read_frame(client._rfile)
+        with Client(address) as client:
+            self.assertEqual(client.search(self._vector([1, 0, 0]), 1)[0][0], 1)
+
+    def test_concurrent_clients(self):
+        address = self._serve(self._index())
+        errors = []
+
+        def run():
+            try:
+                with Client(address) as client:
+                    for _ in range(10):
+                        self.assertEqual(client.search(self._vector([1, 0, 0]), 1)[0][0], 1)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=run) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+
+    def test_idle_clients_do_not_block_others(self):
+        # Connections are not tied to pool workers, so more open clients
+        # than workers are all served.
+        address = self._serve(self._index(), num_workers=1)
+        idle = [Client(address) for _ in range(3)]
+        try:
+            with Client(address) as client:
+                client._socket.settimeout(5)
+                self.assertEqual(client.search(self._vector([1, 0, 0]), 1)[0][0], 1)
+            for other in idle:
+                other._socket.settimeout(5)
+                self.assertEqual(other.search(self._vector([0, 1, 0]), 1)[0][0], 2)
+        finally:
+            for other in idle:
+                other.close()
+
+    def test_hnsw_index_over_unix_socket(self):
+        random.seed(41)
+        idx = HNSWIndex(M=8, efConstruction=32)
+        for i in range(20):
+            idx.add_vector(self._vector([random.gauss(0, 1) for _ in range(3)]), id=i)
+        path = os.path.join(tempfile.mkdtemp(), 'neuroseek.sock')
+        self._serve(idx, path)
+        with Client(path) as client:
+            query = idx.get_vector(5)
+            self.assertEqual(client.search(query, 1)[0][0], 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
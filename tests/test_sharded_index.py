@@ -0,0 +1,139 @@
+import unittest
+import random
+from neuroseek import Vector, Index
+from neuroseek.sharded_index import ShardedIndex
+
+
+class TestShardedIndex(unittest.TestCase):
+    def _vectors(self, n, dim=4):
+        random.seed(29)
+        vectors = []
+        for _ in range(n):
+            v = Vector(dim)
+            v.data = [random.gauss(0, 1) for _ in range(dim)]
+            vectors.append(v)
+        return vectors
+
+    def test_constructor_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            ShardedIndex(num_shards=0)
+        with self.assertRaises(TypeError):
+            ShardedIndex(num_shards='2')
+        with self.assertRaises(ValueError):
+            ShardedIndex(num_shards=2, kind='ivf')
+        with self.assertRaises(ValueError):
+            ShardedIndex(num_shards=2, partition='round-robin')
+        with self.assertRaises(ValueError):
+            ShardedIndex(num_shards=3, partition='range', boundaries=[10])
+        with self.assertRaises(ValueError):
+            ShardedIndex(num_shards=3, partition='range', boundaries=[20, 10])
+
+    def test_add_and_get_vector(self):
+        with ShardedIndex(num_shards=3) as idx:
+            v = Vector(3)
+            v.data = [1, 2, 3]
+            self.assertEqual(idx.add_vector(v, 7), 7)
+            self.assertEqual(list(idx.get_vector(7).data), [1, 2, 3])
+            self.assertEqual(len(idx), 1)
+
+    def test_auto_ids(self):
+        with ShardedIndex(num_shards=2) as idx:
+            vectors = self._vectors(3)
+            self.assertEqual([idx.add_vector(v) for v in vectors], [0, 1, 2])
+            self.assertEqual(idx.add_vectors(self._vectors(2)), [3, 4])
+            self.assertEqual(len(idx), 5)
+
+    def test_errors_propagate_from_shards(self):
+        with ShardedIndex(num_shards=2) as idx:
+            v = Vector(2)
+            v.data = [1, 0]
+            idx.add_vector(v, 1)
+            with self.assertRaises(ValueError):
+                idx.add_vector(v, 1)
+            with self.assertRaises(ValueError):
+                idx.get_vector(99)
+            with self.assertRaises(TypeError):
+                idx.add_vector([1, 0])
+
+    def test_add_vectors_duplicate_ids_adds_nothing(self):
+        with ShardedIndex(num_shards=2) as idx:
+            with self.assertRaises(ValueError):
+                idx.add_vectors(self._vectors(3), ids=[2, 4, 2])
+            self.assertEqual(len(idx), 0)
+            self.assertEqual(idx.add_vectors(self._vectors(2)), [0, 1])
+
+    def test_add_vectors_shard_error_rolls_back(self):
+        with ShardedIndex(num_shards=2) as idx:
+            v = Vector(4)
+            v.data = [1, 0, 0, 0]
+            idx.add_vector(v, 1)
+            with self.assertRaises(ValueError):
+                idx.add_vectors(self._vectors(4), ids=[0, 1, 2, 3])
+            self.assertEqual(len(idx), 1)
+            self.assertEqual(list(idx.get_vector(1).data), [1, 0, 0, 0])
+            with self.assertRaises(ValueError):
+                idx.add_vectors([v, Vector(3)])
+            self.assertEqual(len(idx), 1)
+            self.assertEqual(idx.add_vector(v), 0)
+
+    def test_search_matches_single_index(self):
+        vectors = self._vectors(60)
+        exact = Index()
+        for i, v in enumerate(vectors):
+            exact.add_vector(v, i)
+        with ShardedIndex(num_shards=4) as idx:
+            idx.add_vectors(vectors)
+            for query in self._vectors(5):
+                self.assertEqual(idx.search(query, 7), exact.search(query, 7))
+
+    def test_delete_vector(self):
+        vectors = self._vectors(10)
+        with ShardedIndex(num_shards=3) as idx:
+            idx.add_vectors(vectors)
+            deleted = idx.delete_vector(4)
+            self.assertEqual(deleted[0], 4)
+            self.assertEqual(len(idx), 9)
+            results = idx.search(vectors[4], 10)
+            self.assertNotIn(4, [id for id, _ in results])
+
+    def test_range_partition(self):
+        vectors = self._vectors(30)
+        with ShardedIndex(num_shards=3, partition='range', boundaries=[10, 20]) as idx:
+            idx.add_vectors(vectors)
+            self.assertEqual(idx._shard_for(5), 0)
+            self.assertEqual(idx._shard_for(10), 1)
+            self.assertEqual(idx._shard_for(25), 2)
+            self.assertEqual(len(idx), 30)
+
+    def test_hnsw_shards(self):
+        vectors = self._vectors(60)
+        exact = Index()
+        for i, v in enumerate(vectors):
+            exact.add_vector(v, i)
+        with ShardedIndex(num_shards=2, kind='hnsw', M=8, efConstruction=32) as idx:
+            idx.add_vectors(vectors)
+            query = self._vectors(1)[0]
+            expected = {id for id, _ in exact.search(query, 5)}
+            found = {id for id, _ in idx.search(query, 5, ef=40)}
+            self.assertGreaterEqual(len(expected & found), 4)
+
+    def test_search_with_metric(self):
+        with ShardedIndex(num_shards=2, metric='ip') as idx:
+            v1 = Vector(2)
+            v1.data = [1, 0]
+            v2 = Vector(2)
+            v2.data = [3, 3]
+            idx.add_vectors([v1, v2])
+            query = Vector(2)
+            query.data = [1, 0]
+            self.assertEqual(idx.search(query, 2), [(1, 3), (0, 1)])
+
+    def test_closed_index_raises(self):
+        idx = ShardedIndex(num_shards=2)
+        idx.close()
+        with self.assertRaises(ValueError):
+            idx.get_vector(1)
+
+
+if __name__ == "__main__":
+    unittest.main()
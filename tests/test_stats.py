@@ -0,0 +1,53 @@
+import unittest
+from neuroseek.stats import SearchStats, IndexMetrics
+
+
+class TestStats(unittest.TestCase):
+    def test_search_stats_add_layer(self):
+        stats = SearchStats()
+        stats.add_layer(1, 3, 4, 2, 6)
+        stats.add_layer(0, 10, 10, 5, 20)
+        stats.add_layer(0, 1, 1, 1, 2)
+        self.assertEqual(stats.distance_evaluations, 14)
+        self.assertEqual(stats.visited_nodes, 15)
+        self.assertEqual(stats.heap_operations, 28)
+        self.assertEqual(stats.hops, {1: 2, 0: 6})
+        self.assertIn('distance_evaluations=14', repr(stats))
+
+    def test_index_metrics_record_and_reset(self):
+        metrics = IndexMetrics()
+        stats = SearchStats()
+        stats.add_layer(0, 5, 5, 2, 8)
+        metrics.record(stats)
+        stats.brute_force = True
+        metrics.record(stats)
+        self.assertEqual(metrics.searches, 2)
+        self.assertEqual(metrics.brute_force_searches, 1)
+        self.assertEqual(metrics.distance_evaluations, 10)
+        self.assertEqual(metrics.hops, {0: 4})
+        metrics.reset()
+        self.assertEqual(metrics.searches, 0)
+        self.assertEqual(metrics.hops, {})
+
+    def test_to_prometheus(self):
+        metrics = IndexMetrics()
+        stats = SearchStats()
+        stats.add_layer(1, 2, 2, 1, 3)
+        stats.add_layer(0, 5, 6, 2, 8)
+        metrics.record(stats)
+        text = metrics.to_prometheus()
+        self.assertIn('# TYPE neuroseek_searches_total counter', text)
+        self.assertIn('neuroseek_searches_total 1\n', text)
+        self.assertIn('neuroseek_distance_evaluations_total 7\n', text)
+        self.assertIn('neuroseek_hops_total{layer="0"} 2\n', text)
+        self.assertIn('neuroseek_hops_total{layer="1"} 1\n', text)
+        self.assertTrue(text.endswith('\n'))
+
+    def test_to_prometheus_labels(self):
+        metrics = IndexMetrics()
+        text = metrics.to_prometheus(prefix='ns', labels={'index': 'main'})
+        self.assertIn('ns_searches_total{index="main"} 0', text)
+
+
+if __name__ == "__main__":
+    unittest.main()
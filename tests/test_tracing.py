@@ -0,0 +1,118 @@
+import os
+import random
+import tempfile
+import unittest
+from neuroseek.index import Index
+from neuroseek.hnsw_index import HNSWIndex
+from neuroseek.persistence import save_index, load_index
+from neuroseek.hnsw_persistence import save_hnsw_index, load_hnsw_index
+from neuroseek.tracing import span, Span, SpanRecorder, _NULL_SPAN
+from neuroseek.benchmark import synthetic_dataset
+
+
+class TestTracing(unittest.TestCase):
+    def test_span_without_hooks_is_shared_noop(self):
+        self.assertIs(span([], 'search'), _NULL_SPAN)
+        self.assertIs(span(None, 'search'), _NULL_SPAN)
+        with span([], 'search') as s:
+            self.assertIs(s, _NULL_SPAN)
+
+    def test_nested_spans_record_parent_and_duration(self):
+        recorder = SpanRecorder()
+        with span([recorder], 'outer', size=3):
+            with span([recorder], 'inner'):
+                pass
+        inner, outer = recorder.spans
+        self.assertIsInstance(outer, Span)
+        self.assertEqual(recorder.names(), ['inner', 'outer'])
+        self.assertIs(inner.parent, outer)
+        self.assertIsNone(outer.parent)
+        self.assertEqual(outer.attributes, {'size': 3})
+        self.assertGreaterEqual(outer.duration, inner.duration)
+        self.assertEqual(set(recorder.totals()), {'inner', 'outer'})
+
+    def test_span_reports_errors(self):
+        recorder = SpanRecorder()
+        with self.assertRaises(KeyError):
+            with span([recorder], 'fail'):
+                raise KeyError('x')
+        self.assertEqual(recorder.spans[0].attributes['error'], 'KeyError')
+
+    def test_add_hook_rejects_non_callable(self):
+        with self.assertRaises(TypeError):
+            Index().add_hook(42)
+        with self.assertRaises(TypeError):
+            HNSWIndex().add_hook(42)
+
+    def test_index_spans(self):
+        index = Index()
+        recorder = SpanRecorder()
+        index.add_hook(recorder)
+        for vector in synthetic_dataset(10, 4):
+            index.add_vector(vector)
+        index.search(synthetic_dataset(1, 4, seed=1)[0], top_k=3)
+        index.delete_vector(0)
+        names = recorder.names()
+        self.assertEqual(names.count('insert'), 10)
+        self.assertIn('delete', names)
+        search = next(s for s in recorder.spans if s.name == 'search')
+        phases = [s.name for s in recorder.spans if s.parent is search]
+        self.assertEqual(phases, ['filter', 'scan'])
+
+        index.remove_hook(recorder)
+        recorder.clear()
+        index.search(synthetic_dataset(1, 4, seed=1)[0], top_k=3)
+        self.assertEqual(recorder.spans, [])
+
+    def test_hnsw_spans(self):
+        random.seed(0)
+        index = HNSWIndex(M=4, efConstruction=20)
+        recorder = SpanRecorder()
+        index.add_hook(recorder)
+        for vector in synthetic_dataset(30, 4):
+            index.add_vector(vector)
+        index.search(synthetic_dataset(1, 4, seed=1)[0], top_k=3)
+        index.delete_vector(5)
+
+        search = next(s for s in recorder.spans if s.name == 'search')
+        phases = [s.name for s in recorder.spans if s.parent is search]
+        self.assertEqual(phases, ['descent', 'base_layer', 'select'])
+        insert = [s for s in recorder.spans if s.name == 'insert'][-1]
+        self.assertEqual([s.name for s in recorder.spans if s.parent is insert], ['descent', 'link'])
+        delete = next(s for s in recorder.spans if s.name == 'delete')
+        self.assertEqual([s.name for s in recorder.spans if s.parent is delete], ['unlink'])
+
+    def test_save_and_load_spans(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, 'index.pkl')
+            index = Index()
+            for vector in synthetic_dataset(5, 4):
+                index.add_vector(vector)
+            recorder = SpanRecorder()
+            index.add_hook(recorder)
+            save_index(index, filename)
+            save = recorder.spans[-1]
+            self.assertEqual(save.name, 'save')
+            self.assertEqual([s.name for s in recorder.spans if s.parent is save], ['serialize', 'write'])
+            self.assertIn('fsync', recorder.names())
+
+            recorder.clear()
+            load_index(index, filename)
+            load = recorder.spans[-1]
+            self.assertEqual(load.name, 'load')
+            self.assertEqual([s.name for s in recorder.spans if s.parent is load], ['read', 'deserialize', 'rebuild'])
+
+            hnsw = HNSWIndex(M=4, efConstruction=20)
+            for vector in synthetic_dataset(5, 4):
+                hnsw.add_vector(vector)
+            hnsw_filename = os.path.join(tmp, 'hnsw.pkl')
+            save_hnsw_index(hnsw, hnsw_filename)
+            recorder.clear()
+            loaded = load_hnsw_index(hnsw_filename, HNSWIndex, hooks=[recorder])
+            self.assertEqual(recorder.spans[-1].name, 'load')
+            self.assertEqual(loaded.hooks, [recorder])
+            self.assertEqual(len(loaded), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
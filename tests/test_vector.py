@@ -1,5 +1,14 @@
+import array
+import pickle
+import struct
 import unittest
-from neuroseek import Vector
+from neuroseek import Vector, Index
+from neuroseek.vector import VectorBatch
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 
 class TestVector(unittest.TestCase):
@@ -14,6 +23,21 @@ class TestVector(unittest.TestCase):
             self.assertEqual(v.size, size)
             self.assertEqual(len(v.data), size)
 
+    def test_copy(self):
+        from array import array
+        from neuroseek.precision import HalfArray
+        v = Vector(2)
+        v.data = [1.0, 2.0]
+        for vector in (v, v.astype('float32'), v.astype('float16'), Vector.from_bytes(array('d', [1, 2]).tobytes(), 'd')):
+            copy = vector.copy()
+            self.assertIsNot(copy.data, vector.data)
+            self.assertEqual(list(copy.data), [1.0, 2.0])
+            self.assertEqual(len(copy), 2)
+        self.assertIsInstance(v.astype('float16').copy().data, HalfArray)
+        copy = v.copy()
+        copy[0] = 5
+        self.assertEqual(v.data, [1.0, 2.0])
+
     def test_constructor_empty_vector(self):
         v = Vector(0)
         self.assertEqual(v.size, 0)
@@ -775,6 +799,259 @@ class TestVector(unittest.TestCase):
         expected = dot / norms
         self.assertEqual(v1.cosine_similarity(v2), expected)
 
+    def test_from_buffer_shares_memory(self):
+        buffer = array.array('f', [1.0, 2.0, 3.0])
+        v = Vector.from_buffer(buffer)
+        self.assertEqual(len(v), 3)
+        self.assertEqual(list(v), [1.0, 2.0, 3.0])
+        buffer[0] = 5.0
+        self.assertEqual(v[0], 5.0)
+        v[1] = 7.0
+        self.assertEqual(buffer[1], 7.0)
+        self.assertEqual(repr(v), "[5.0, 7.0, 3.0]")
+
+    def test_from_buffer_works_with_operations_and_indexes(self):
+        v = Vector.from_buffer(array.array('d', [3.0, 4.0]))
+        w = Vector(2)
+        w.data = [1, 0]
+        self.assertEqual(v.norm(), 5.0)
+        self.assertEqual(v.dot(w), 3.0)
+        self.assertEqual((v + w).data, [4.0, 4.0])
+        self.assertTrue(v == Vector.from_bytes(struct.pack('2d', 3.0, 4.0), 'd'))
+
+        index = Index()
+        index.add_vector(v, 0)
+        index.add_vector(w, 1)
+        self.assertEqual(index.search(Vector.from_buffer(array.array('f', [3, 4])), top_k=1)[0][0], 0)
+
+    def test_from_bytes(self):
+        v = Vector.from_bytes(struct.pack('3f', 1.5, -2.0, 0.25))
+        self.assertEqual(list(v), [1.5, -2.0, 0.25])
+        with self.assertRaises(TypeError):
+            v[0] = 1.0  # bytes are read-only
+
+        writable = Vector.from_bytes(bytearray(struct.pack('2d', 1.0, 2.0)), 'd')
+        writable[0] = 3.0
+        self.assertEqual(list(writable), [3.0, 2.0])
+
+        half = Vector.from_bytes(struct.pack('2e', 0.5, 2.0), 'e')
+        self.assertEqual(list(half), [0.5, 2.0])
+
+    def test_from_bytes_invalid(self):
+        with self.assertRaises(TypeError):
+            Vector.from_bytes([1.0, 2.0])
+        with self.assertRaises(ValueError):
+            Vector.from_bytes(b'\x00' * 6, 'f')
+        with self.assertRaises(ValueError):
+            Vector.from_bytes(b'\x00' * 8, 'i')
+        with self.assertRaises(ValueError):
+            Vector.from_buffer(array.array('i', [1, 2]))
+
+    def test_buffer_vector_pickles_as_list(self):
+        v = Vector.from_buffer(array.array('f', [1.0, 2.0]))
+        restored = pickle.loads(pickle.dumps(v))
+        self.assertEqual(restored.data, [1.0, 2.0])
+        self.assertEqual(len(restored), 2)
+
+    def test_from_numpy_rejects_non_arrays(self):
+        with self.assertRaises(TypeError):
+            Vector.from_numpy([1.0, 2.0])
+
+    @unittest.skipIf(numpy is None, "NumPy is not installed")
+    def test_numpy_round_trip_is_zero_copy(self):
+        array_ = numpy.arange(4, dtype=numpy.float32)
+        v = Vector.from_numpy(array_)
+        array_[0] = 9
+        self.assertEqual(v[0], 9.0)
+        view = v.to_numpy()
+        view[1] = 8
+        self.assertEqual(array_[1], 8)
+        self.assertEqual(Vector.from_numpy(array_[::2]).data.tolist(), [9.0, 2.0])
+        with self.assertRaises(ValueError):
+            Vector.from_numpy(numpy.zeros((2, 2)))
+        with self.assertRaises(TypeError):
+            Vector.from_numpy(numpy.arange(3))
+
+    @unittest.skipIf(numpy is None, "NumPy is not installed")
+    def test_from_numpy_float16(self):
+        v = Vector.from_numpy(numpy.array([0.5, -2.0, 3.0], dtype=numpy.float16))
+        self.assertEqual(list(v), [0.5, -2.0, 3.0])
+        self.assertEqual(v.norm(), 13.25 ** 0.5)
+        strided = Vector.from_numpy(numpy.arange(4, dtype=numpy.float16)[::2])
+        self.assertEqual(list(strided), [0.0, 2.0])
+
+    @unittest.skipIf(numpy is None, "NumPy is not installed")
+    def test_to_numpy_copies_list_vectors(self):
+        v = Vector(2)
+        v.data = [1, 2]
+        self.assertEqual(v.to_numpy().tolist(), [1.0, 2.0])
+
+    @unittest.skipIf(numpy is not None, "NumPy is installed")
+    def test_to_numpy_without_numpy(self):
+        with self.assertRaises(ImportError):
+            Vector(2).to_numpy()
+
+
+    def test_inplace_operators_reuse_storage(self):
+        v = Vector(3)
+        v.data = [1, 2, 3]
+        w = Vector(3)
+        w.data = [10, 20, 30]
+        data = v.data
+        alias = v
+        v += w
+        v -= Vector(3)
+        v *= 2
+        v *= w
+        self.assertIs(v, alias)
+        self.assertIs(v.data, data)
+        self.assertEqual(v.data, [220, 880, 1980])
+        with self.assertRaises(ValueError):
+            v += Vector(2)
+        with self.assertRaises(TypeError):
+            v -= 1
+
+    def test_inplace_operators_write_through_buffers(self):
+        buffer = array.array('d', [1.0, 2.0])
+        v = Vector.from_buffer(buffer)
+        w = Vector(2)
+        w.data = [0.5, 0.5]
+        v += w
+        self.assertEqual(list(buffer), [1.5, 2.5])
+
+    def test_out_parameter(self):
+        v = Vector(2)
+        v.data = [1, 2]
+        w = Vector(2)
+        w.data = [3, 5]
+        out = Vector(2)
+        storage = out.data
+        self.assertIs(v.add(w, out=out), out)
+        self.assertEqual(out.data, [4, 7])
+        v.sub(w, out=out)
+        self.assertEqual(out.data, [-2, -3])
+        v.mul(3, out=out)
+        self.assertEqual(out.data, [3, 6])
+        v.mul(w, out=out)
+        self.assertEqual(out.data, [3, 10])
+        v.neg(out=out)
+        self.assertEqual(out.data, [-1, -2])
+        self.assertIs(out.data, storage)
+        self.assertEqual(v.data, [1, 2])
+        self.assertEqual(v.add(w).data, [4, 7])
+        with self.assertRaises(ValueError):
+            v.add(w, out=Vector(3))
+        with self.assertRaises(TypeError):
+            v.add(w, out=[0, 0])
+
+    def test_axpy(self):
+        total = Vector(2)
+        data = total.data
+        for values in ([1, 2], [3, 4], [5, 6]):
+            v = Vector(2)
+            v.data = values
+            total.axpy(1 / 3, v)
+        self.assertIs(total.data, data)
+        self.assertAlmostEqual(total[0], 3.0)
+        self.assertAlmostEqual(total[1], 4.0)
+        with self.assertRaises(TypeError):
+            total.axpy('a', v)
+        with self.assertRaises(ValueError):
+            total.axpy(1, Vector(3))
+
+
+class TestVectorBatch(unittest.TestCase):
+    def _vector(self, *values):
+        v = Vector(len(values))
+        v.data = list(values)
+        return v
+
+    def test_construction(self):
+        batch = VectorBatch([self._vector(1, 2), [3, 4], (5, 6)])
+        self.assertEqual(batch.shape, (3, 2))
+        self.assertEqual(len(batch), 3)
+        self.assertEqual(batch.rows, [[1, 2], [3, 4], [5, 6]])
+        self.assertEqual(VectorBatch.zeros(2, 3).rows, [[0.0] * 3] * 2)
+        self.assertEqual(VectorBatch([], dim=4).shape, (0, 4))
+        with self.assertRaises(ValueError):
+            VectorBatch([[1, 2], [3]])
+        with self.assertRaises(ValueError):
+            VectorBatch([])
+
+    def test_rows_are_shared_vectors(self):
+        batch = VectorBatch([[1, 2], [3, 4]])
+        row = batch[1]
+        self.assertIsInstance(row, Vector)
+        row[0] = 9
+        self.assertEqual(batch.rows[1], [9, 4])
+        self.assertEqual([list(v) for v in batch], [[1, 2], [9, 4]])
+        with self.assertRaises(TypeError):
+            batch['0']
+
+    def test_elementwise_operations(self):
+        batch = VectorBatch([[1, 2], [3, 4]])
+        other = VectorBatch([[10, 20], [30, 40]])
+        self.assertEqual((batch + other).rows, [[11, 22], [33, 44]])
+        self.assertEqual((other - batch).rows, [[9, 18], [27, 36]])
+        self.assertEqual((batch * 2).rows, [[2, 4], [6, 8]])
+        self.assertEqual((batch * self._vector(1, -1)).rows, [[1, -2], [3, -4]])
+        self.assertEqual((other / 10).rows, [[1.0, 2.0], [3.0, 4.0]])
+        self.assertEqual((-batch).rows, [[-1, -2], [-3, -4]])
+        self.assertEqual(batch.rows, [[1, 2], [3, 4]])
+
+    def test_operation_errors(self):
+        batch = VectorBatch([[1, 2], [3, 4]])
+        with self.assertRaises(ValueError):
+            batch + VectorBatch([[1, 2]])
+        with self.assertRaises(ValueError):
+            batch + self._vector(1, 2, 3)
+        with self.assertRaises(TypeError):
+            batch + "a"
+        with self.assertRaises(TypeError):
+            batch.dot([[1, 2]])
+        with self.assertRaises(ValueError):
+            batch.dot(VectorBatch([[1, 2, 3]]))
+
+    def test_inplace_operations_keep_rows(self):
+        batch = VectorBatch([[1, 2], [3, 4]])
+        first_row = batch.rows[0]
+        batch += 1
+        batch *= self._vector(2, 1)
+        batch -= VectorBatch([[1, 1], [1, 1]])
+        batch /= 2
+        self.assertEqual(batch.rows, [[1.5, 1.0], [3.5, 2.0]])
+        self.assertIs(batch.rows[0], first_row)
+
+    def test_norms_dot_and_cosine(self):
+        batch = VectorBatch([[3, 4], [1, 0]])
+        other = VectorBatch([[0, 1], [2, 0], [1, 1]])
+        self.assertEqual(batch.norms(), [5.0, 1.0])
+        self.assertEqual(batch.dot(other), [[4, 6, 7], [0, 2, 1]])
+        self.assertEqual(batch @ other, batch.dot(other))
+        cosine = batch.cosine(other)
+        for i, row in enumerate(batch):
+            for j, other_row in enumerate(other):
+                self.assertAlmostEqual(cosine[i][j], row.cosine_similarity(other_row))
+        with self.assertRaises(ValueError):
+            batch.cosine(VectorBatch([[0, 0]]))
+
+    def test_reductions(self):
+        batch = VectorBatch([[1, 2], [3, 6]])
+        self.assertEqual(batch.sum().data, [4, 8])
+        self.assertEqual(batch.mean().data, [2.0, 4.0])
+        self.assertEqual(batch.centroid().data, [2.0, 4.0])
+        self.assertEqual(VectorBatch([], dim=2).sum().data, [0, 0])
+        with self.assertRaises(ValueError):
+            VectorBatch([], dim=2).mean()
+
+    def test_center_and_normalize(self):
+        batch = VectorBatch([[1, 2], [3, 6]])
+        self.assertIs(batch.center(), batch)
+        self.assertEqual(batch.rows, [[-1.0, -2.0], [1.0, 2.0]])
+        self.assertEqual(batch.mean().data, [0.0, 0.0])
+        batch = VectorBatch([[3, 4], [0, 0]]).normalize()
+        self.assertEqual(batch.rows, [[0.6, 0.8], [0, 0]])
+
 
 if __name__ == "__main__":
     unittest.main()